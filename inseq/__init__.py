@@ -8,7 +8,13 @@ from .data import (
     merge_attributions,
     show_attributions,
 )
-from .models import AttributionModel, list_supported_frameworks, load_model, register_model_config
+from .models import (
+    AttributionModel,
+    attribute_data_parallel,
+    list_supported_frameworks,
+    load_model,
+    register_model_config,
+)
 from .utils.id_utils import explain
 
 
@@ -36,4 +42,5 @@ __all__ = [
     "register_step_function",
     "register_model_config",
     "merge_attributions",
+    "attribute_data_parallel",
 ]
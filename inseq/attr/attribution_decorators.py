@@ -51,11 +51,55 @@ def unset_hook(f: Callable[[Any], Any]) -> Callable[[Any], Any]:
     return unset_hook_wrapper
 
 
+def get_length_bucketed_batches(
+    lengths: Sequence[int],
+    batch_size: Optional[int] = None,
+    max_tokens_per_batch: Optional[int] = None,
+) -> list[list[int]]:
+    """Groups sequence indices into batches of sequences with similar lengths to minimize padding.
+
+    Sequences are sorted by decreasing length and greedily added to the current batch as long as the batch contains
+    less than ``batch_size`` sequences and its padded size (number of sequences times the longest length) does not
+    exceed ``max_tokens_per_batch``. Sequences longer than ``max_tokens_per_batch`` are placed in their own batch.
+
+    Args:
+        lengths (:obj:`list` of :obj:`int`): The length of every sequence.
+        batch_size (:obj:`int`, `optional`): The maximum number of sequences in a batch.
+        max_tokens_per_batch (:obj:`int`, `optional`): The maximum number of padded tokens in a batch.
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`int`: The indices of the sequences in each batch. Longest sequences are
+            placed in the first batch, so that out-of-memory errors are raised as early as possible.
+    """
+    sorted_idxs = sorted(range(len(lengths)), key=lambda idx: lengths[idx], reverse=True)
+    batches, curr_batch = [], []
+    for idx in sorted_idxs:
+        # Sorting by decreasing length makes the first element of a batch its longest sequence
+        batch_len = lengths[curr_batch[0]] if curr_batch else lengths[idx]
+        exceeds_size = batch_size is not None and len(curr_batch) >= batch_size
+        exceeds_tokens = max_tokens_per_batch is not None and (len(curr_batch) + 1) * batch_len > max_tokens_per_batch
+        if curr_batch and (exceeds_size or exceeds_tokens):
+            batches.append(curr_batch)
+            curr_batch = []
+        curr_batch.append(idx)
+    if curr_batch:
+        batches.append(curr_batch)
+    return batches
+
+
 def batched(f: Callable[..., Any]) -> Callable[..., Any]:
-    """Decorator that enables batching of the args."""
+    """Decorator that enables batching of the args. Batches are either contiguous slices of size ``batch_size``, or
+    groups of indices specified by ``batch_indices`` (e.g. produced by :func:`get_length_bucketed_batches`).
+    """
 
     @wraps(f)
-    def batched_wrapper(self, *args, batch_size: Optional[int] = None, **kwargs):
+    def batched_wrapper(
+        self,
+        *args,
+        batch_size: Optional[int] = None,
+        batch_indices: Optional[list[list[int]]] = None,
+        **kwargs,
+    ):
         def get_batched(bs: Optional[int], seq: Sequence[Any]) -> list[list[Any]]:
             if isinstance(seq, str):
                 seq = [seq]
@@ -68,10 +112,23 @@ def batched(f: Callable[..., Any]) -> Callable[..., Any]:
             else:
                 raise TypeError(f"Unsupported type {type(seq)} for batched attribution computation.")
 
-        if batch_size is None:
+        def get_indexed(idxs: list[list[int]], seq: Sequence[Any]) -> list[list[Any]]:
+            if isinstance(seq, str):
+                seq = [seq]
+            if isinstance(seq, list):
+                return [[seq[i] for i in batch_idxs] for batch_idxs in idxs]
+            if isinstance(seq, tuple):
+                return list(zip(*[get_indexed(idxs, s) for s in seq]))
+            else:
+                raise TypeError(f"Unsupported type {type(seq)} for indexed batched attribution computation.")
+
+        if batch_size is None and batch_indices is None:
             out = f(self, *args, **kwargs)
             return out if isinstance(out, list) else [out]
-        batched_args = [get_batched(batch_size, arg) for arg in args]
+        if batch_indices is not None:
+            batched_args = [get_indexed(batch_indices, arg) for arg in args]
+        else:
+            batched_args = [get_batched(batch_size, arg) for arg in args]
         len_batches = len(batched_args[0])
         assert all(len(batch) == len_batches for batch in batched_args)
         output = []
@@ -2,7 +2,9 @@ import logging
 import math
 from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
-from ...utils import extract_signature_args, get_aligned_idx
+import torch
+
+from ...utils import extract_signature_args, get_aligned_idx, get_available_memory
 from ...utils.typing import (
     OneOrMoreAttributionSequences,
     OneOrMoreIdSequences,
@@ -156,3 +158,68 @@ def get_source_target_attributions(
             return (None, None, attr[0]) if has_sequence_scores else (None, attr[0])
     else:
         return (attr, None) if is_encoder_decoder else (None, attr)
+
+
+def estimate_sequence_memory(config: Any, seq_len: int, dtype: torch.dtype = torch.float32) -> Optional[int]:
+    """Estimates the memory in bytes needed to store the activations of a single sequence of length ``seq_len`` for a
+    forward and backward pass through a Transformer model, following the per-layer estimate of `Korthikanti et al.
+    (2022) <https://arxiv.org/abs/2205.05198>`__ plus the output logits. Returns ``None`` if the model configuration
+    does not specify its hidden size or number of layers.
+    """
+    hidden_size = getattr(config, "hidden_size", None)
+    num_layers = getattr(config, "encoder_layers", getattr(config, "num_hidden_layers", None))
+    if getattr(config, "is_encoder_decoder", False) and num_layers is not None:
+        num_layers += getattr(config, "decoder_layers", getattr(config, "num_decoder_layers", num_layers))
+    if hidden_size is None or num_layers is None:
+        return None
+    num_heads = getattr(config, "num_attention_heads", 1)
+    vocab_size = getattr(config, "vocab_size", 0)
+    dtype_bytes = torch.finfo(dtype).bits // 8 if dtype.is_floating_point else 4
+    layer_memory = seq_len * (17 * hidden_size + 2.5 * num_heads * seq_len) * dtype_bytes
+    # Logits, their softmax and gradients are kept for all positions
+    logits_memory = 3 * seq_len * vocab_size * dtype_bytes
+    return int(num_layers * layer_memory + logits_memory)
+
+
+def get_auto_internal_batch_size(
+    attribution_model: "AttributionModel",
+    num_examples: int,
+    seq_len: int,
+    n_steps: int,
+    memory_fraction: float = 0.5,
+    batch_all_if_fits: bool = False,
+) -> Optional[int]:
+    """Chooses the ``internal_batch_size`` of integrated gradients-style methods, i.e. the number of interpolation
+    steps that are forwarded together across all examples, from the memory available on the model device and an
+    estimate of the memory needed by every expanded sequence.
+
+    Args:
+        attribution_model (:class:`~inseq.models.AttributionModel`): The model used for attribution.
+        num_examples (:obj:`int`): Number of examples in the attributed batch.
+        seq_len (:obj:`int`): Length of the attributed sequences, including the source for encoder-decoder models.
+        n_steps (:obj:`int`): Number of interpolation steps for every example.
+        memory_fraction (:obj:`float`, `optional`): Fraction of the available memory that can be used for the
+            expanded batch. Defaults to 0.5.
+        batch_all_if_fits (:obj:`bool`, `optional`): If True, ``num_examples * n_steps`` is returned instead of
+            ``None`` when all steps fit in memory at once. Defaults to False.
+
+    Returns:
+        :obj:`int`: A multiple of ``num_examples`` to be used as ``internal_batch_size``, or ``None`` if all steps fit
+            in memory at once (unless ``batch_all_if_fits=True``) or the available memory cannot be estimated.
+    """
+    available_memory = get_available_memory(attribution_model.device)
+    sequence_memory = estimate_sequence_memory(
+        attribution_model.model.config, seq_len, getattr(attribution_model.model, "dtype", torch.float32)
+    )
+    if available_memory is None or not sequence_memory:
+        return None
+    max_sequences = int(available_memory * memory_fraction // sequence_memory)
+    if max_sequences >= num_examples * n_steps:
+        return num_examples * n_steps if batch_all_if_fits else None
+    # Every chunk must contain at least one step for all examples
+    internal_batch_size = max(num_examples, max_sequences - max_sequences % num_examples)
+    logger.info(
+        f"Using internal_batch_size={internal_batch_size} to fit {num_examples * n_steps} interpolated sequences"
+        f" in {available_memory / 2**30:.1f}GB of available memory."
+    )
+    return internal_batch_size
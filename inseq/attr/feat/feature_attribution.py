@@ -24,12 +24,15 @@ import torch
 from jaxtyping import Int
 
 from ...data import (
+    Batch,
+    BatchEmbedding,
     DecoderOnlyBatch,
     EncoderDecoderBatch,
     FeatureAttributionInput,
     FeatureAttributionOutput,
     FeatureAttributionSequenceOutput,
     FeatureAttributionStepOutput,
+    ForwardCache,
     get_batch_from_inputs,
 )
 from ...data.viz import close_progress_bar, get_progress_bar, update_progress_bar
@@ -44,7 +47,13 @@ from ...utils import (
 )
 from ...utils.typing import ModelIdentifier, OneOrMoreTokenSequences, SingleScorePerStepTensor, TextSequences
 from ..attribution_decorators import batched, set_hook, unset_hook
-from ..step_functions import get_step_function, get_step_scores, get_step_scores_args
+from ..step_functions import (
+    StepFunction,
+    get_step_function,
+    get_step_scores,
+    get_step_scores_args,
+    is_position_wise_step_function,
+)
 from .attribution_utils import (
     check_attribute_positions,
     get_source_target_attributions,
@@ -53,6 +62,7 @@ from .attribution_utils import (
 
 if TYPE_CHECKING:
     from ...models import AttributionModel
+    from ...models.attribution_model import ModelOutput
 
 
 logger = logging.getLogger(__name__)
@@ -103,6 +113,13 @@ class FeatureAttribution(Registry):
             use_model_config (:obj:`bool`, default `False`): Whether the attribution method uses the model config. If
                 True, the method will try to load the config matching the model when hooking to the model. Missing
                 configurations can be registered using :meth:`~inseq.models.register_model_config`.
+            is_final_step_method (:obj:`bool`, default `False`): Whether the attribution method produces scores for
+                all generation steps from the last step only.
+            supports_parallel_steps (:obj:`bool`, default `False`): Whether the attribution method can attribute all
+                generation steps from a single forward pass using
+                :meth:`~inseq.attr.feat.FeatureAttribution.get_parallel_step_outputs`.
+            init_kwargs (:obj:`dict`, default `{}`): The keyword arguments used to initialize and hook the method when
+                loaded with :meth:`~inseq.attr.feat.FeatureAttribution.load`.
         """
         super().__init__()
         self.attribution_model = attribution_model
@@ -115,6 +132,8 @@ class FeatureAttribution(Registry):
         self.use_predicted_target: bool = True
         self.use_model_config: bool = False
         self.is_final_step_method: bool = False
+        self.supports_parallel_steps: bool = False
+        self.init_kwargs: dict[str, Any] = {}
         if hook_to_model:
             self.hook(**kwargs)
 
@@ -161,7 +180,9 @@ class FeatureAttribution(Registry):
                 "Only one among an initialized model and a model identifier "
                 "must be defined when loading the attribution method."
             )
-        return methods[method_name](model, **kwargs)
+        method = methods[method_name](model, **kwargs)
+        method.init_kwargs = kwargs
+        return method
 
     @batched
     def prepare_and_attribute(
@@ -180,6 +201,9 @@ class FeatureAttribution(Registry):
         attribution_args: dict[str, Any] = {},
         attributed_fn_args: dict[str, Any] = {},
         step_scores_args: dict[str, Any] = {},
+        use_forward_cache: bool = False,
+        teacher_forced_step_scores: bool = False,
+        parallel_steps: bool = False,
     ) -> FeatureAttributionOutput:
         r"""Prepares inputs and performs attribution.
 
@@ -215,6 +239,17 @@ class FeatureAttribution(Registry):
             attribution_args (:obj:`dict`, `optional`): Additional arguments to pass to the attribution method.
             attributed_fn_args (:obj:`dict`, `optional`): Additional arguments to pass to the attributed function.
             step_scores_args (:obj:`dict`, `optional`): Additional arguments to pass to the step scores functions.
+            use_forward_cache (:obj:`bool`, `optional`): Whether to reuse the model key-value cache across generation
+                steps for the forward passes used to compute step scores, including the forward passes over
+                contrastive inputs of contrastive step scores, and to compute encoder outputs only once per batch for
+                encoder-decoder models. Defaults to False.
+            teacher_forced_step_scores (:obj:`bool`, `optional`): Whether to compute position-wise step scores for all
+                generation steps from a single forward pass over the full target. Only supported for the ``dummy``
+                attribution method. Defaults to False.
+            parallel_steps (:obj:`bool`, `optional`): Whether to attribute all generation steps from a single forward
+                pass over the full target, backpropagating the attributed scores of all steps at once. Only supported
+                for methods with ``supports_parallel_steps = True`` and position-wise attributed functions. Defaults
+                to False.
 
         Returns:
             :class:`~inseq.data.FeatureAttributionOutput`: An object containing a list of sequence attributions, with
@@ -225,8 +260,22 @@ class FeatureAttribution(Registry):
         if not self.attribution_model.is_encoder_decoder:
             inputs = targets
             encoded_sources = self.attribution_model.encode(sources, return_baseline=True)
+            # Final step methods require all sequences to end at the same position, hence only left padding is used
+            if isinstance(targets, (str, list)) and not self.is_final_step_method:
+                # Every sequence is attributed starting from the end of its own prompt (or from attr_pos_start, if
+                # later). Sequences are re-padded so that attribution starts at the same position for the whole batch.
+                prompt_lengths = encoded_sources.attention_mask.sum(dim=-1).tolist()
+                start_positions = [max(prompt_len, attr_pos_start or 0) for prompt_len in prompt_lengths]
+                inputs = self.attribution_model.encode(
+                    targets, return_baseline=True, include_eos_baseline=include_eos_baseline
+                ).align_positions(
+                    start_positions,
+                    pad_token_id=self.attribution_model.convert_tokens_to_ids(self.attribution_model.pad_token),
+                    pad_token=self.attribution_model.pad_token,
+                )
+                attr_pos_start = max(start_positions)
             # We do this here to support separate attr_pos_start for different sentences when batching
-            if attr_pos_start is None or attr_pos_start < encoded_sources.input_ids.shape[1]:
+            elif attr_pos_start is None or attr_pos_start < encoded_sources.input_ids.shape[1]:
                 attr_pos_start = encoded_sources.input_ids.shape[1]
         batch = self.attribution_model.formatter.prepare_inputs_for_attribution(
             self.attribution_model, inputs, include_eos_baseline
@@ -248,6 +297,9 @@ class FeatureAttribution(Registry):
             attribution_args=attribution_args,
             attributed_fn_args=attributed_fn_args,
             step_scores_args=step_scores_args,
+            use_forward_cache=use_forward_cache,
+            teacher_forced_step_scores=teacher_forced_step_scores,
+            parallel_steps=parallel_steps,
         )
         # Same here, repeated from AttributionModel.attribute
         # to allow independent usage
@@ -279,6 +331,10 @@ class FeatureAttribution(Registry):
         attr_pos_start: int,
         attr_pos_end: int,
     ) -> list[FeatureAttributionStepOutput]:
+        """Splits the output of the final generation step into per-step outputs. For batches of sequences with
+        different lengths, steps past the end of a sequence have padding targets and are removed when building
+        sequence attributions.
+        """
         if single_step_output.step_scores:
             raise ValueError("step_scores are not supported for final step attribution methods.")
         num_seq = len(single_step_output.prefix)
@@ -345,8 +401,76 @@ class FeatureAttribution(Registry):
                 step_scores_args["contrast_targets_alignments"] = contrast_targets_alignments
             if "contrast_targets" in attributed_fn_args:
                 attributed_fn_args["contrast_targets_alignments"] = contrast_targets_alignments
+            # Contrastive targets are tokenized and embedded once here, and sliced by step functions at every step
+            contrast_batch = contrast_batch.to(self.attribution_model.device)
+            attributed_fn_args, step_scores_args = (
+                {**args, "contrast_targets": contrast_batch}
+                if self._matches_input(args.get("contrast_targets"), contrast_targets)
+                else args
+                for args in (attributed_fn_args, step_scores_args)
+            )
         return contrast_batch, contrast_targets_alignments, attributed_fn_args, step_scores_args
 
+    def format_contrastive_sources(
+        self,
+        attributed_fn_args: dict[str, Any],
+        step_scores_args: dict[str, Any],
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Encodes and embeds the contrastive sources of encoder-decoder models once per attributed batch, replacing
+        them in the arguments of step functions to avoid re-encoding them at every generation step.
+        """
+        if not self.attribution_model.is_encoder_decoder:
+            return attributed_fn_args, step_scores_args
+        contrast_sources = attributed_fn_args.get("contrast_sources", None)
+        if contrast_sources is None:
+            contrast_sources = step_scores_args.get("contrast_sources", None)
+        if not isinstance(contrast_sources, (str, list)):
+            return attributed_fn_args, step_scores_args
+        contrast_sources = [contrast_sources] if isinstance(contrast_sources, str) else contrast_sources
+        encoding = self.attribution_model.encode(contrast_sources)
+        contrast_sources_batch = Batch(
+            encoding=encoding,
+            embedding=BatchEmbedding(input_embeds=self.attribution_model.embed(encoding.input_ids, as_targets=False)),
+        ).to(self.attribution_model.device)
+        return [
+            {**args, "contrast_sources": contrast_sources_batch}
+            if self._matches_input(args.get("contrast_sources"), contrast_sources)
+            else args
+            for args in (attributed_fn_args, step_scores_args)
+        ]
+
+    def _can_attribute_parallel_steps(
+        self,
+        attributed_fn: Callable[..., SingleScorePerStepTensor],
+        step_scores: list[str],
+        contrast_batch: Optional[DecoderOnlyBatch],
+    ) -> bool:
+        """Checks whether all generation steps can be attributed from a single forward pass, warning about the
+        fallback to step-by-step attribution otherwise.
+        """
+        if not self.supports_parallel_steps:
+            logger.warning(f"Parallel steps are not supported by the {self.method_name} method. Disabling them.")
+            return False
+        if contrast_batch is not None or not is_position_wise_step_function(attributed_fn):
+            logger.warning(
+                "Parallel steps require a position-wise attributed function without contrastive targets, falling"
+                " back to step-by-step attribution."
+            )
+            return False
+        if not all(is_position_wise_step_function(score) for score in step_scores):
+            logger.warning(
+                "Parallel steps require all step functions to be position-wise, falling back to step-by-step "
+                "attribution."
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _matches_input(arg: Any, inputs: list[str]) -> bool:
+        if not isinstance(arg, (str, list)):
+            return False
+        return ([arg] if isinstance(arg, str) else arg) == inputs
+
     def attribute(
         self,
         batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
@@ -361,6 +485,9 @@ class FeatureAttribution(Registry):
         attribution_args: dict[str, Any] = {},
         attributed_fn_args: dict[str, Any] = {},
         step_scores_args: dict[str, Any] = {},
+        use_forward_cache: bool = False,
+        teacher_forced_step_scores: bool = False,
+        parallel_steps: bool = False,
     ) -> FeatureAttributionOutput:
         r"""Performs the feature attribution procedure using the specified attribution method.
 
@@ -388,6 +515,17 @@ class FeatureAttribution(Registry):
             attribution_args (:obj:`dict`, `optional`): Additional arguments to pass to the attribution method.
             attributed_fn_args (:obj:`dict`, `optional`): Additional arguments to pass to the attributed function.
             step_scores_args (:obj:`dict`, `optional`): Additional arguments to pass to the step scores function.
+            use_forward_cache (:obj:`bool`, `optional`): Whether to reuse the model key-value cache across generation
+                steps for the forward passes used to compute step scores, including the forward passes over
+                contrastive inputs of contrastive step scores, and to compute encoder outputs only once per batch for
+                encoder-decoder models. Defaults to False.
+            teacher_forced_step_scores (:obj:`bool`, `optional`): Whether to compute position-wise step scores for all
+                generation steps from a single forward pass over the full target. Only supported for the ``dummy``
+                attribution method. Defaults to False.
+            parallel_steps (:obj:`bool`, `optional`): Whether to attribute all generation steps from a single forward
+                pass over the full target, backpropagating the attributed scores of all steps at once. Only supported
+                for methods with ``supports_parallel_steps = True`` and position-wise attributed functions. Defaults
+                to False.
 
         Returns:
             :class:`~inseq.data.FeatureAttributionOutput`: An object containing a list of sequence attributions, with
@@ -420,6 +558,7 @@ class FeatureAttribution(Registry):
             attr_pos_start,
             attr_pos_end,
         )
+        attributed_fn_args, step_scores_args = self.format_contrastive_sources(attributed_fn_args, step_scores_args)
         target_tokens_with_ids = self.attribution_model.get_token_with_ids(
             batch,
             contrast_target_tokens=contrast_batch.target_tokens if contrast_batch is not None else None,
@@ -452,25 +591,77 @@ class FeatureAttribution(Registry):
         )
         whitespace_indexes = find_char_indexes(sequences.targets, " ")
         attribution_outputs = []
+        if teacher_forced_step_scores:
+            if self.method_name != "dummy":
+                logger.warning(
+                    "Teacher-forced step scores are only supported for the dummy attribution method. Disabling them."
+                )
+                teacher_forced_step_scores = False
+            elif not all(is_position_wise_step_function(score) for score in step_scores):
+                logger.warning(
+                    "Teacher-forced step scores require all step functions to be position-wise, falling back to "
+                    "step-by-step computation."
+                )
+                teacher_forced_step_scores = False
+        if parallel_steps:
+            parallel_steps = self._can_attribute_parallel_steps(attributed_fn, step_scores, contrast_batch)
+        forward_cache = None
+        if use_forward_cache and not self.is_final_step_method and not parallel_steps:
+            forward_cache = ForwardCache()
+            if self.attribution_model.is_encoder_decoder:
+                # The source is the same at every generation step, so the encoder is run once for the whole batch
+                with torch.no_grad():
+                    forward_cache.encoder_outputs = self.attribution_model.get_encoder_output(
+                        batch,
+                        use_embeddings=self.forward_batch_embeds,
+                        output_attentions=self.use_attention_weights,
+                        output_hidden_states=self.use_hidden_states,
+                    )
 
         start = datetime.now()
-
-        # Attribution loop for generation
-        for step in range(attr_pos_start, iter_pos_end):
-            if self.is_final_step_method and step != iter_pos_end - 1:
-                continue
-            tgt_ids, tgt_mask = batch.get_step_target(step, with_attention=True)
-            step_output = self.filtered_attribute_step(
-                batch[:step],
-                target_ids=tgt_ids.unsqueeze(1),
-                attributed_fn=attributed_fn,
-                target_attention_mask=tgt_mask.unsqueeze(1),
+        if teacher_forced_step_scores:
+            teacher_forced_outputs = self.get_teacher_forced_step_outputs(
+                batch, attr_pos_start, iter_pos_end, step_scores, step_scores_args
+            )
+        if parallel_steps:
+            parallel_outputs = self.get_parallel_step_outputs(
+                batch,
+                attributed_fn,
+                attr_pos_start,
+                iter_pos_end,
                 attribute_target=attribute_target,
                 step_scores=step_scores,
                 attribution_args=attribution_args,
                 attributed_fn_args=attributed_fn_args,
                 step_scores_args=step_scores_args,
             )
+
+        # Attribution loop for generation
+        for step in range(attr_pos_start, iter_pos_end):
+            if self.is_final_step_method and step != iter_pos_end - 1:
+                continue
+            tgt_ids, tgt_mask = batch.get_step_target(step, with_attention=True)
+            if self.is_final_step_method:
+                # Sequences ending before the last step are kept, since the attribution of their earlier steps is
+                # extracted from the final step output.
+                tgt_mask = torch.ones_like(tgt_mask)
+            if teacher_forced_step_scores:
+                step_output = teacher_forced_outputs[step - attr_pos_start]
+            elif parallel_steps:
+                step_output = parallel_outputs[step - attr_pos_start]
+            else:
+                step_output = self.filtered_attribute_step(
+                    batch[:step],
+                    target_ids=tgt_ids.unsqueeze(1),
+                    attributed_fn=attributed_fn,
+                    target_attention_mask=tgt_mask.unsqueeze(1),
+                    attribute_target=attribute_target,
+                    step_scores=step_scores,
+                    attribution_args=attribution_args,
+                    attributed_fn_args=attributed_fn_args,
+                    step_scores_args=step_scores_args,
+                    forward_cache=forward_cache,
+                )
             # Add batch information to output
             step_output = self.attribution_model.formatter.enrich_step_output(
                 self.attribution_model,
@@ -501,6 +692,8 @@ class FeatureAttribution(Registry):
             else:
                 update_progress_bar(pbar, show=show_progress, pretty=False)
         end = datetime.now()
+        if forward_cache is not None:
+            forward_cache.clear()
         close_progress_bar(pbar, show=show_progress, pretty=False if self.is_final_step_method else pretty_progress)
         batch.detach().to("cpu")
         if self.is_final_step_method:
@@ -542,6 +735,7 @@ class FeatureAttribution(Registry):
         attribution_args: dict[str, Any] = {},
         attributed_fn_args: dict[str, Any] = {},
         step_scores_args: dict[str, Any] = {},
+        forward_cache: Optional[ForwardCache] = None,
     ) -> FeatureAttributionStepOutput:
         r"""Performs a single attribution step for all the sequences in the batch that
         still have valid target_ids, as identified by the target_attention_mask.
@@ -568,6 +762,11 @@ class FeatureAttribution(Registry):
             attribution_args (:obj:`dict`, `optional`): Additional arguments to pass to the attribution method.
             attributed_fn_args (:obj:`dict`, `optional`): Additional arguments to pass to the attributed function.
             step_scores_args (:obj:`dict`, `optional`): Additional arguments to pass to the step scores functions.
+            forward_cache (:class:`~inseq.data.ForwardCache`, `optional`): Cache of model states from previous
+                generation steps. If provided, step scores are computed with an incremental forward pass over the full
+                batch, and the cache is updated in place. Cached encoder outputs are reused by all forward-only
+                computations of the step. Contrastive step scores use the cache to compute forward passes over
+                contrastive inputs incrementally.
 
         Returns:
             :class:`~inseq.data.FeatureAttributionStepOutput`: A dataclass containing attribution tensors for source
@@ -575,6 +774,7 @@ class FeatureAttribution(Registry):
                 (target optional if attribute_target=True), plus batch information and any step score present.
         """
         orig_batch = batch.clone().detach().to("cpu")
+        full_batch = batch
         is_filtered = False
         # Filter out finished sentences
         if target_attention_mask is not None and int(target_attention_mask.sum()) < target_ids.shape[0]:
@@ -598,13 +798,32 @@ class FeatureAttribution(Registry):
             forward_batch_embeds=self.forward_batch_embeds,
             use_baselines=self.use_baselines,
         )
-        if len(step_scores) > 0 or self.use_attention_weights or self.use_hidden_states:
+        if (
+            forward_cache is not None
+            and len(step_scores) > 0
+            and not (self.use_attention_weights or self.use_hidden_states)
+        ):
+            # The cache covers all sequences in the batch, so the forward is performed before filtering and only
+            # the logits of active sequences are kept.
+            with torch.no_grad():
+                output = self.attribution_model.get_incremental_forward_output(
+                    full_batch, forward_cache, use_embeddings=self.forward_batch_embeds
+                )
+            if is_filtered:
+                output = output.__class__(logits=output.logits[target_attention_mask.squeeze(-1).bool()])
+        elif len(step_scores) > 0 or self.use_attention_weights or self.use_hidden_states:
+            forward_kwargs = {}
+            if forward_cache is not None and forward_cache.encoder_outputs is not None:
+                forward_kwargs["encoder_outputs"] = forward_cache.get_encoder_outputs(
+                    target_attention_mask if is_filtered else None
+                )
             with torch.no_grad():
                 output = self.attribution_model.get_forward_output(
                     batch,
                     use_embeddings=self.forward_batch_embeds,
                     output_attentions=self.use_attention_weights,
                     output_hidden_states=self.use_hidden_states,
+                    **forward_kwargs,
                 )
             if self.use_attention_weights:
                 attentions_dict = self.attribution_model.get_attentions_dict(output)
@@ -626,6 +845,8 @@ class FeatureAttribution(Registry):
                 is_attributed_fn=False,
                 batch=batch,
             )
+            # Contrastive step scores keep their own states in the cache to run contrastive forwards incrementally
+            step_fn_args.forward_cache = forward_cache
             step_fn_extra_args = get_step_scores_args([score], step_scores_args)
             step_output.step_scores[score] = get_step_scores(score, step_fn_args, step_fn_extra_args).to("cpu")
         # Reinsert finished sentences
@@ -634,6 +855,124 @@ class FeatureAttribution(Registry):
         step_output = step_output.detach().to("cpu")
         return step_output
 
+    def get_teacher_forced_step_outputs(
+        self,
+        batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        attr_pos_start: int,
+        attr_pos_end: int,
+        step_scores: list[str] = [],
+        step_scores_args: dict[str, Any] = {},
+    ) -> list[FeatureAttributionStepOutput]:
+        r"""Computes position-wise step scores for all generation steps in ``[attr_pos_start, attr_pos_end)`` using a
+        single forward pass over the full target. Since the logits predicting the token at position ``t`` depend only
+        on the prefix ``[:t]``, the logits of every step are gathered at once and each step function is called once
+        on the flattened ``(batch_size * num_steps)`` positions.
+
+        Args:
+            batch (:class:`~inseq.data.EncoderDecoderBatch` or :class:`~inseq.data.DecoderOnlyBatch`): The batch of
+                sequences to score.
+            attr_pos_start (:obj:`int`): The first generation step to score.
+            attr_pos_end (:obj:`int`): The generation step at which scoring stops (excluded).
+            step_scores (:obj:`list` of `str`): List of identifiers of position-wise step scores to compute.
+            step_scores_args (:obj:`dict`, `optional`): Additional arguments to pass to the step scores functions.
+
+        Returns:
+            :obj:`list` of :class:`~inseq.data.FeatureAttributionStepOutput`: One output per generation step,
+                containing empty attributions and step scores of size `(batch_size,)`. Scores for padding positions
+                are set to NaN, matching the output of the step-by-step computation.
+        """
+        with torch.no_grad():
+            output = self.attribution_model.get_forward_output(
+                batch[: attr_pos_end - 1], use_embeddings=self.forward_batch_embeds
+            )
+        scores = self.get_teacher_forced_step_scores(
+            output, batch, attr_pos_start, attr_pos_end, step_scores, step_scores_args
+        )
+        return [
+            FeatureAttributionStepOutput(
+                source_attributions=None,
+                target_attributions=None,
+                step_scores={score: score_tensor[:, step_idx] for score, score_tensor in scores.items()},
+            )
+            for step_idx in range(attr_pos_end - attr_pos_start)
+        ]
+
+    def get_position_wise_scores(
+        self,
+        output: "ModelOutput",
+        batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        attr_pos_start: int,
+        attr_pos_end: int,
+        step_fn: StepFunction,
+        step_fn_extra_args: dict[str, Any] = {},
+        is_attributed_fn: bool = False,
+    ) -> torch.Tensor:
+        r"""Computes the scores of a position-wise step function for all generation steps in
+        ``[attr_pos_start, attr_pos_end)`` from the output of a forward pass over ``batch[:attr_pos_end - 1]``.
+
+        Returns:
+            :obj:`torch.Tensor`: A tensor of size `(batch_size, num_steps)` containing the scores of every step.
+        """
+        # Logits at position t - 1 are used to predict the target token at position t
+        logits = output.logits[:, attr_pos_start - 1 : attr_pos_end - 1, :]
+        batch_size, num_steps, vocab_size = logits.shape
+        target_ids = batch.target_ids[:, attr_pos_start:attr_pos_end].to(logits.device)
+        # Each position is treated as a separate batch element predicting a single token
+        step_fn_args = self.attribution_model.formatter.format_step_function_args(
+            attribution_model=self.attribution_model,
+            forward_output=output.__class__(logits=logits.reshape(-1, 1, vocab_size)),
+            target_ids=target_ids.reshape(-1),
+            is_attributed_fn=is_attributed_fn,
+            batch=batch,
+        )
+        return step_fn(step_fn_args, **step_fn_extra_args).reshape(batch_size, num_steps)
+
+    def get_teacher_forced_step_scores(
+        self,
+        output: "ModelOutput",
+        batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        attr_pos_start: int,
+        attr_pos_end: int,
+        step_scores: list[str] = [],
+        step_scores_args: dict[str, Any] = {},
+    ) -> dict[str, torch.Tensor]:
+        r"""Computes position-wise step scores from the output of a forward pass over ``batch[:attr_pos_end - 1]``.
+        Scores of size `(batch_size, num_steps)` are returned on CPU, with NaN values for padding positions.
+        """
+        target_mask = batch.target_mask[:, attr_pos_start:attr_pos_end].bool().to("cpu")
+        scores = {}
+        for score in step_scores:
+            step_fn_extra_args = get_step_scores_args([score], step_scores_args)
+            with torch.no_grad():
+                score_tensor = self.get_position_wise_scores(
+                    output, batch, attr_pos_start, attr_pos_end, get_step_function(score), step_fn_extra_args
+                )
+            score_tensor = score_tensor.detach().to("cpu")
+            if not target_mask.all():
+                score_tensor = score_tensor.float().masked_fill(~target_mask, float("nan"))
+            scores[score] = score_tensor
+        return scores
+
+    def get_parallel_step_outputs(
+        self,
+        batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        attributed_fn: Callable[..., SingleScorePerStepTensor],
+        attr_pos_start: int,
+        attr_pos_end: int,
+        attribute_target: bool = False,
+        step_scores: list[str] = [],
+        attribution_args: dict[str, Any] = {},
+        attributed_fn_args: dict[str, Any] = {},
+        step_scores_args: dict[str, Any] = {},
+    ) -> list[FeatureAttributionStepOutput]:
+        r"""Performs attribution for all generation steps in ``[attr_pos_start, attr_pos_end)`` using a single forward
+        pass over the full target. Only available for methods with ``supports_parallel_steps = True``.
+
+        Returns:
+            :obj:`list` of :class:`~inseq.data.FeatureAttributionStepOutput`: One output per generation step.
+        """
+        raise NotImplementedError(f"Parallel steps are not supported by the {self.method_name} method.")
+
     def get_attribution_args(self, **kwargs) -> tuple[dict[str, Any], dict[str, Any]]:
         if hasattr(self, "method") and hasattr(self.method, "attribute"):
             return extract_signature_args(kwargs, self.method.attribute, self.ignore_extra_args, return_remaining=True)
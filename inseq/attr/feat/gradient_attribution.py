@@ -14,8 +14,11 @@
 """Gradient-based feature attribution methods."""
 
 import logging
-from typing import Any
+from dataclasses import replace
+from inspect import signature
+from typing import Any, Callable, Union
 
+import torch
 from captum.attr import (
     DeepLift,
     GradientShap,
@@ -27,19 +30,33 @@ from captum.attr import (
     Saliency,
 )
 
-from ...data import GranularFeatureAttributionStepOutput
+from ...data import (
+    BatchEmbedding,
+    DecoderOnlyBatch,
+    EncoderDecoderBatch,
+    FeatureAttributionStepOutput,
+    GranularFeatureAttributionStepOutput,
+)
 from ...utils import Registry, extract_signature_args, rgetattr
+from ...utils.typing import SingleScorePerStepTensor
 from ..attribution_decorators import set_hook, unset_hook
-from .attribution_utils import get_source_target_attributions
+from .attribution_utils import get_auto_internal_batch_size, get_source_target_attributions
 from .feature_attribution import FeatureAttribution
 from .ops import DiscretetizedIntegratedGradients, SequentialIntegratedGradients
 
 logger = logging.getLogger(__name__)
 
+# Messages of errors raised by torch.autograd.grad when operations of the model cannot be vectorized with vmap
+BATCHED_GRADS_UNSUPPORTED_ERRORS = ("vmap", "Batching rule not implemented", "Batched grads are not supported")
+
 
 class GradientAttributionRegistry(FeatureAttribution, Registry):
     r"""Gradient-based attribution method registry."""
 
+    # Whether gradients of all steps are computed in a single batched backward pass when using parallel steps. Set to
+    # False after the first failure of a batched backward pass.
+    use_batched_grads: bool = True
+
     @set_hook
     def hook(self, **kwargs):
         r"""Hooks the attribution method to the model by replacing normal :obj:`nn.Embedding` with Captum's
@@ -83,6 +100,7 @@ class GradientAttributionRegistry(FeatureAttribution, Registry):
                 `(batch_size)` if the attribution step supports deltas and they are requested. At this point the batch
                 information is empty, and will later be filled by the enrich_step_output function.
         """
+        attribution_args = self.format_internal_batch_size(attribute_fn_main_args, attribution_args)
         attr = self.method.attribute(**attribute_fn_main_args, **attribution_args)
         deltas = None
         if (
@@ -100,6 +118,155 @@ class GradientAttributionRegistry(FeatureAttribution, Registry):
             step_scores={"deltas": deltas} if deltas is not None else None,
         )
 
+    def format_internal_batch_size(
+        self,
+        attribute_fn_main_args: dict[str, Any],
+        attribution_args: dict[str, Any] = {},
+    ) -> dict[str, Any]:
+        r"""Sets the ``internal_batch_size`` of methods expanding inputs over interpolation steps (e.g. integrated
+        gradients) from the available memory, if not specified by the user or if set to ``"auto"``. Inputs are then
+        attributed in chunks of steps, with gradients accumulated across chunks. Explicit values, including
+        ``None`` to forward all steps at once, are left untouched.
+        """
+        method_params = signature(self.method.attribute).parameters
+        if "internal_batch_size" not in method_params or attribution_args.get("internal_batch_size", "auto") != "auto":
+            return attribution_args
+        inputs = attribute_fn_main_args["inputs"]
+        inputs = inputs if isinstance(inputs, tuple) else (inputs,)
+        n_steps = attribution_args.get("n_steps", method_params["n_steps"].default)
+        is_sequential = isinstance(self.method, SequentialIntegratedGradients)
+        if is_sequential:
+            # Interpolation paths of as many positions as fit in memory are batched together. With None, positions
+            # are attributed one at a time.
+            n_steps *= inputs[0].shape[1]
+        internal_batch_size = get_auto_internal_batch_size(
+            self.attribution_model,
+            num_examples=inputs[0].shape[0],
+            seq_len=sum(inp.shape[1] for inp in inputs),
+            n_steps=n_steps,
+            batch_all_if_fits=is_sequential,
+        )
+        return {**attribution_args, "internal_batch_size": internal_batch_size}
+
+    def get_parallel_step_outputs(
+        self,
+        batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        attributed_fn: Callable[..., SingleScorePerStepTensor],
+        attr_pos_start: int,
+        attr_pos_end: int,
+        attribute_target: bool = False,
+        step_scores: list[str] = [],
+        attribution_args: dict[str, Any] = {},
+        attributed_fn_args: dict[str, Any] = {},
+        step_scores_args: dict[str, Any] = {},
+    ) -> list[FeatureAttributionStepOutput]:
+        r"""Performs attribution for all generation steps in ``[attr_pos_start, attr_pos_end)`` from a single forward
+        pass over the full target. Since the attributed score of step ``t`` depends only on the prefix ``[:t]``, the
+        scores of all steps are computed at once with a position-wise attributed function, and their gradients with
+        respect to input embeddings are obtained in a single batched backward pass using one-hot selectors over steps.
+
+        Args:
+            batch (:class:`~inseq.data.EncoderDecoderBatch` or :class:`~inseq.data.DecoderOnlyBatch`): The batch of
+                sequences to attribute.
+            attributed_fn (:obj:`Callable[..., SingleScorePerStepTensor]`): The position-wise function of model outputs
+                representing what should be attributed.
+            attr_pos_start (:obj:`int`): The first generation step to attribute.
+            attr_pos_end (:obj:`int`): The generation step at which attribution stops (excluded).
+            attribute_target (:obj:`bool`, `optional`): Whether to include target prefix for feature attribution.
+                Defaults to False.
+            step_scores (:obj:`list` of `str`): List of identifiers of position-wise step scores to compute from the
+                same forward pass.
+            attribution_args (:obj:`dict`, `optional`): Additional arguments to pass to the attribution method.
+            attributed_fn_args (:obj:`dict`, `optional`): Additional arguments to pass to the attributed function.
+            step_scores_args (:obj:`dict`, `optional`): Additional arguments to pass to the step scores functions.
+
+        Returns:
+            :obj:`list` of :class:`~inseq.data.GranularFeatureAttributionStepOutput`: One output per generation step,
+                matching the outputs of step-by-step attribution. Attributions for sequences that are already finished
+                at a given step are set to NaN.
+        """
+        forward_batch = batch[: attr_pos_end - 1]
+        if self.attribution_model.is_encoder_decoder:
+            source_embeds = forward_batch.source_embeds.detach().requires_grad_()
+            target_embeds = forward_batch.target_embeds.detach().requires_grad_()
+            forward_batch = replace(
+                forward_batch,
+                sources=replace(forward_batch.sources, embedding=BatchEmbedding(source_embeds)),
+                targets=replace(forward_batch.targets, embedding=BatchEmbedding(target_embeds)),
+            )
+            inputs = (source_embeds, target_embeds) if attribute_target else (source_embeds,)
+        else:
+            input_embeds = forward_batch.input_embeds.detach().requires_grad_()
+            forward_batch = replace(forward_batch, embedding=BatchEmbedding(input_embeds))
+            inputs = (input_embeds,)
+        with torch.enable_grad():
+            output = self.attribution_model.get_forward_output(forward_batch, use_embeddings=True)
+            scores = self.get_position_wise_scores(
+                output, batch, attr_pos_start, attr_pos_end, attributed_fn, attributed_fn_args, is_attributed_fn=True
+            )
+            batch_size, num_steps = scores.shape
+            # Row i of the selectors backpropagates only the attributed scores of step i
+            selectors = torch.eye(num_steps, dtype=scores.dtype, device=scores.device)
+            selectors = selectors.unsqueeze(1).expand(num_steps, batch_size, num_steps)
+            if self.use_batched_grads:
+                try:
+                    gradients = torch.autograd.grad(
+                        scores, inputs, grad_outputs=selectors, retain_graph=True, is_grads_batched=True
+                    )
+                except RuntimeError as e:
+                    if isinstance(e, torch.cuda.OutOfMemoryError) or not any(
+                        msg in str(e) for msg in BATCHED_GRADS_UNSUPPORTED_ERRORS
+                    ):
+                        raise
+                    logger.warning(
+                        f"Batched backward pass not supported by the model ({e}). Backpropagating the scores of"
+                        " every generation step separately."
+                    )
+                    self.use_batched_grads = False
+            if not self.use_batched_grads:
+                step_gradients = [
+                    torch.autograd.grad(scores, inputs, grad_outputs=selectors[step_idx], retain_graph=True)
+                    for step_idx in range(num_steps)
+                ]
+                gradients = tuple(torch.stack(grads) for grads in zip(*step_gradients))
+        attributions = self.format_parallel_step_gradients(gradients, inputs, **attribution_args)
+        step_scores_tensors = self.get_teacher_forced_step_scores(
+            output, batch, attr_pos_start, attr_pos_end, step_scores, step_scores_args
+        )
+        target_mask = batch.target_mask[:, attr_pos_start:attr_pos_end].bool().to("cpu")
+        step_outputs = []
+        for step_idx in range(num_steps):
+            step = attr_pos_start + step_idx
+            step_attributions = [attr[step_idx].detach().to("cpu") for attr in attributions]
+            if self.attribution_model.is_encoder_decoder:
+                source_attributions = step_attributions[0]
+                target_attributions = step_attributions[1][:, :step] if attribute_target else None
+            else:
+                source_attributions = None
+                target_attributions = step_attributions[0][:, :step]
+            # Finished sequences are not attributed in step-by-step attribution
+            finished = ~target_mask[:, step_idx]
+            for attr in (source_attributions, target_attributions):
+                if attr is not None and finished.any():
+                    attr[finished] = float("nan")
+            step_outputs.append(
+                GranularFeatureAttributionStepOutput(
+                    source_attributions=source_attributions,
+                    target_attributions=target_attributions,
+                    step_scores={score: scores[:, step_idx] for score, scores in step_scores_tensors.items()},
+                )
+            )
+        return step_outputs
+
+    def format_parallel_step_gradients(
+        self, gradients: tuple[torch.Tensor, ...], inputs: tuple[torch.Tensor, ...], **kwargs
+    ) -> tuple[torch.Tensor, ...]:
+        r"""Converts gradients of size `(num_steps, batch_size, seq_len, hidden_size)` produced by
+        :meth:`~inseq.attr.feat.GradientAttributionRegistry.get_parallel_step_outputs` into attribution scores.
+        Must be implemented by methods with ``supports_parallel_steps = True``.
+        """
+        raise NotImplementedError(f"Parallel steps are not supported by the {self.method_name} method.")
+
 
 class DeepLiftAttribution(GradientAttributionRegistry):
     """DeepLIFT attribution method.
@@ -196,6 +363,12 @@ class InputXGradientAttribution(GradientAttributionRegistry):
     def __init__(self, attribution_model):
         super().__init__(attribution_model)
         self.method = InputXGradient(self.attribution_model)
+        self.supports_parallel_steps = True
+
+    def format_parallel_step_gradients(
+        self, gradients: tuple[torch.Tensor, ...], inputs: tuple[torch.Tensor, ...], **kwargs
+    ) -> tuple[torch.Tensor, ...]:
+        return tuple(grad * inp.detach() for grad, inp in zip(gradients, inputs))
 
 
 class SaliencyAttribution(GradientAttributionRegistry):
@@ -210,6 +383,12 @@ class SaliencyAttribution(GradientAttributionRegistry):
     def __init__(self, attribution_model):
         super().__init__(attribution_model)
         self.method = Saliency(self.attribution_model)
+        self.supports_parallel_steps = True
+
+    def format_parallel_step_gradients(
+        self, gradients: tuple[torch.Tensor, ...], inputs: tuple[torch.Tensor, ...], abs: bool = True, **kwargs
+    ) -> tuple[torch.Tensor, ...]:
+        return tuple(grad.abs() for grad in gradients) if abs else gradients
 
 
 class SequentialIntegratedGradientsAttribution(GradientAttributionRegistry):
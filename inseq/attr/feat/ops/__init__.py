@@ -1,13 +1,17 @@
 from .discretized_integrated_gradients import DiscretetizedIntegratedGradients
+from .embeddings_knn_index import EmbeddingsKNNIndex
 from .lime import Lime
+from .linear_surrogate import BatchedLinearSurrogate
 from .monotonic_path_builder import MonotonicPathBuilder
 from .sequential_integrated_gradients import SequentialIntegratedGradients
 from .value_zeroing import ValueZeroing
 
 __all__ = [
     "DiscretetizedIntegratedGradients",
+    "EmbeddingsKNNIndex",
     "MonotonicPathBuilder",
     "ValueZeroing",
     "Lime",
+    "BatchedLinearSurrogate",
     "SequentialIntegratedGradients",
 ]
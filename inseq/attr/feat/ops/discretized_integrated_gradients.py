@@ -29,7 +29,6 @@ from captum._utils.common import (
 )
 from captum._utils.typing import BaselineType, TargetType, TensorOrTupleOfTensorsGeneric
 from captum.attr._core.integrated_gradients import IntegratedGradients
-from captum.attr._utils.batching import _batch_attribution
 from captum.attr._utils.common import _format_input_baseline, _reshape_and_sum, _validate_input
 from torch import Tensor
 
@@ -38,6 +37,15 @@ from ....utils.typing import MultiStepEmbeddingsTensor, VocabularyEmbeddingsTens
 from .monotonic_path_builder import MonotonicPathBuilder
 
 
+def _slice_rows(arg: Any, start: int, end: int, num_rows: int) -> Any:
+    """Selects rows ``[start:end]`` of arguments expanded to ``num_rows`` interpolated inputs."""
+    if isinstance(arg, tuple):
+        return tuple(_slice_rows(val, start, end, num_rows) for val in arg)
+    if isinstance(arg, Tensor) and arg.ndim > 0 and arg.shape[0] == num_rows:
+        return arg[start:end]
+    return arg
+
+
 class DiscretetizedIntegratedGradients(IntegratedGradients):
     def __init__(
         self,
@@ -97,7 +105,6 @@ class DiscretetizedIntegratedGradients(IntegratedGradients):
         internal_batch_size: Union[None, int] = None,
         return_convergence_delta: bool = False,
     ) -> Union[TensorOrTupleOfTensorsGeneric, tuple[TensorOrTupleOfTensorsGeneric, Tensor]]:
-        n_examples = inputs[0].shape[0]
         # Keeps track whether original input is a tuple or not before
         # converting it into a tuple.
         is_inputs_tuple = _is_tuple(inputs)
@@ -114,23 +121,13 @@ class DiscretetizedIntegratedGradients(IntegratedGradients):
             )
             for input_tensor, baseline_tensor in zip(inputs, baselines)
         )
-        if internal_batch_size is not None:
-            attributions = _batch_attribution(
-                self,
-                n_examples,
-                internal_batch_size,
-                n_steps,
-                scaled_features_tpl=scaled_features_tpl,
-                target=target,
-                additional_forward_args=additional_forward_args,
-            )
-        else:
-            attributions = self._attribute(
-                scaled_features_tpl=scaled_features_tpl,
-                target=target,
-                additional_forward_args=additional_forward_args,
-                n_steps=n_steps,
-            )
+        attributions = self._attribute(
+            scaled_features_tpl=scaled_features_tpl,
+            target=target,
+            additional_forward_args=additional_forward_args,
+            n_steps=n_steps,
+            internal_batch_size=internal_batch_size,
+        )
         if return_convergence_delta:
             start_point, end_point = self.get_inputs_baselines(scaled_features_tpl, n_steps)
             # computes approximation error based on the completeness axiom
@@ -144,12 +141,42 @@ class DiscretetizedIntegratedGradients(IntegratedGradients):
             return _format_output(is_inputs_tuple, attributions), delta
         return _format_output(is_inputs_tuple, attributions)
 
+    def _compute_gradients(
+        self,
+        scaled_features_tpl: tuple[Tensor, ...],
+        target: TargetType = None,
+        additional_forward_args: Any = None,
+        internal_batch_size: Union[None, int] = None,
+    ) -> tuple[Tensor, ...]:
+        num_rows = scaled_features_tpl[0].shape[0]
+        if internal_batch_size is None or internal_batch_size >= num_rows:
+            return self.gradient_func(
+                forward_fn=self.forward_func,
+                inputs=scaled_features_tpl,
+                target_ind=target,
+                additional_forward_args=additional_forward_args,
+            )
+        # Gradients are computed separately for chunks of interpolated inputs to bound memory usage
+        chunk_grads = []
+        for start in range(0, num_rows, internal_batch_size):
+            end = min(start + internal_batch_size, num_rows)
+            chunk_grads.append(
+                self.gradient_func(
+                    forward_fn=self.forward_func,
+                    inputs=tuple(features[start:end].detach().requires_grad_() for features in scaled_features_tpl),
+                    target_ind=_slice_rows(target, start, end, num_rows),
+                    additional_forward_args=_slice_rows(additional_forward_args, start, end, num_rows),
+                )
+            )
+        return tuple(torch.cat(grads) for grads in zip(*chunk_grads))
+
     def _attribute(
         self,
         scaled_features_tpl: tuple[Tensor, ...],
         target: TargetType = None,
         additional_forward_args: Any = None,
         n_steps: int = 50,
+        internal_batch_size: Union[None, int] = None,
     ) -> tuple[Tensor, ...]:
         additional_forward_args = _format_additional_forward_args(additional_forward_args)
         input_additional_args = (
@@ -159,11 +186,8 @@ class DiscretetizedIntegratedGradients(IntegratedGradients):
         )
         expanded_target = _expand_target(target, n_steps)
         # grads: dim -> (bsz * #steps x inputs[0].shape[1:], ...)
-        grads = self.gradient_func(
-            forward_fn=self.forward_func,
-            inputs=scaled_features_tpl,
-            target_ind=expanded_target,
-            additional_forward_args=input_additional_args,
+        grads = self._compute_gradients(
+            scaled_features_tpl, expanded_target, input_additional_args, internal_batch_size
         )
         # calculate (x - x') for each interpolated point
         shifted_inputs_tpl = tuple(
@@ -0,0 +1,185 @@
+"""Nearest neighbors index over vocabulary embeddings, used to build monotonic paths for DIG."""
+
+import hashlib
+import logging
+import os
+import shutil
+from os import PathLike
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+import numpy as np
+import torch
+from jaxtyping import Int
+
+from ....utils.typing import VocabularyEmbeddingsTensor
+
+if TYPE_CHECKING:
+    from scipy.sparse import csr_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingsKNNIndex:
+    """Index of the ``n_neighbors`` nearest neighbors (by Euclidean distance) of every vocabulary embedding, excluding
+    the embedding itself. Neighbor ids and distances are stored as dense ``vocab_size x n_neighbors`` arrays sorted by
+    increasing distance, and are memory-mapped when loaded from disk, so that processes using the same index share
+    its pages and only read the rows they need.
+
+    Args:
+        neighbor_ids (:obj:`np.ndarray`): Ids of the neighbors of every token, padded with -1 for tokens with fewer
+            neighbors.
+        distances (:obj:`np.ndarray`): Distances of the neighbors of every token, padded with ``inf``.
+    """
+
+    ids_filename = "neighbor_ids.npy"
+    distances_filename = "distances.npy"
+
+    def __init__(self, neighbor_ids: np.ndarray, distances: np.ndarray):
+        self.neighbor_ids = neighbor_ids
+        self.distances = distances
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(vocab_size={len(self)}, n_neighbors={self.n_neighbors})"
+
+    def __len__(self) -> int:
+        return self.neighbor_ids.shape[0]
+
+    @property
+    def n_neighbors(self) -> int:
+        return self.neighbor_ids.shape[1]
+
+    def get_neighbors(self, ids: Int[torch.Tensor, "..."]) -> Int[torch.Tensor, "... n_neighbors"]:
+        """Returns the neighbor ids of the given token ids, reading only the corresponding rows of the index."""
+        neighbors = self.neighbor_ids[ids.cpu().numpy().reshape(-1)]
+        return torch.from_numpy(np.asarray(neighbors, dtype=np.int64)).view(*ids.shape, self.n_neighbors)
+
+    @classmethod
+    def from_knn_graph(cls, knn_graph: "csr_matrix") -> "EmbeddingsKNNIndex":
+        """Creates an index from a sparse kNN graph (e.g. produced by ``sklearn.neighbors.kneighbors_graph``),
+        preserving the order of neighbors in every row.
+        """
+        counts = np.diff(knn_graph.indptr)
+        rows = np.repeat(np.arange(knn_graph.shape[0]), counts)
+        cols = np.arange(knn_graph.nnz) - np.repeat(knn_graph.indptr[:-1], counts)
+        shape = (knn_graph.shape[0], max(counts.max(initial=0), 1))
+        neighbor_ids = np.full(shape, -1, dtype=np.int64)
+        distances = np.full(shape, np.inf, dtype=np.float32)
+        neighbor_ids[rows, cols] = knn_graph.indices
+        distances[rows, cols] = knn_graph.data
+        return cls(neighbor_ids, distances)
+
+    @staticmethod
+    def get_key(vocabulary_embeddings: VocabularyEmbeddingsTensor, n_neighbors: int) -> str:
+        """Computes the key of an index as the SHA-256 hash of the embedding matrix and the number of neighbors."""
+        embeddings = vocabulary_embeddings.detach().float().cpu().contiguous()
+        digest = hashlib.sha256(f"{tuple(embeddings.shape)}_{n_neighbors}".encode())
+        digest.update(embeddings.view(-1).view(torch.uint8).numpy())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(
+        cls,
+        vocabulary_embeddings: VocabularyEmbeddingsTensor,
+        n_neighbors: int = 50,
+        batch_size: int = 256,
+        path: Union[str, PathLike, None] = None,
+    ) -> "EmbeddingsKNNIndex":
+        """Computes the exact nearest neighbors of all embeddings, comparing ``batch_size`` embeddings at a time to the
+        full vocabulary with a matrix multiplication on the device of ``vocabulary_embeddings``.
+
+        Args:
+            vocabulary_embeddings (:obj:`torch.Tensor`): The embedding matrix of the vocabulary.
+            n_neighbors (:obj:`int`, `optional`): The number of neighbors of every embedding. Default: 50.
+            batch_size (:obj:`int`, `optional`): The number of embeddings compared to the vocabulary at once.
+                Default: 256.
+            path (:obj:`str` or :obj:`os.PathLike`, `optional`): If specified, the index is written to memory-mapped
+                arrays in this directory while it is built, instead of being kept in memory.
+
+        Returns:
+            :class:`~inseq.attr.feat.ops.EmbeddingsKNNIndex`: The computed index.
+        """
+        embeddings = vocabulary_embeddings.detach().float()
+        vocab_size = embeddings.shape[0]
+        n_neighbors = min(n_neighbors, vocab_size - 1)
+        shape = (vocab_size, n_neighbors)
+        if path is not None:
+            neighbor_ids = np.lib.format.open_memmap(Path(path) / cls.ids_filename, "w+", np.int64, shape)
+            distances = np.lib.format.open_memmap(Path(path) / cls.distances_filename, "w+", np.float32, shape)
+        else:
+            neighbor_ids = np.empty(shape, dtype=np.int64)
+            distances = np.empty(shape, dtype=np.float32)
+        squared_norms = embeddings.pow(2).sum(-1)
+        for start in range(0, vocab_size, batch_size):
+            end = min(start + batch_size, vocab_size)
+            # ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b
+            squared_dists = squared_norms[start:end, None] + squared_norms[None, :]
+            squared_dists = (squared_dists - 2 * embeddings[start:end] @ embeddings.T).clamp_min(0)
+            squared_dists[torch.arange(end - start), torch.arange(start, end)] = float("inf")
+            block_dists, block_ids = squared_dists.topk(n_neighbors, dim=-1, largest=False)
+            neighbor_ids[start:end] = block_ids.cpu().numpy()
+            distances[start:end] = block_dists.sqrt().cpu().numpy()
+        if path is not None:
+            neighbor_ids.flush()
+            distances.flush()
+        return cls(neighbor_ids, distances)
+
+    def save(self, path: Union[str, PathLike]) -> None:
+        """Saves the index arrays to the ``path`` directory."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / self.ids_filename, self.neighbor_ids)
+        np.save(path / self.distances_filename, self.distances)
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike], mmap: bool = True) -> "EmbeddingsKNNIndex":
+        """Loads the index saved in the ``path`` directory, memory-mapping its arrays if ``mmap=True``."""
+        mmap_mode = "r" if mmap else None
+        return cls(
+            np.load(Path(path) / cls.ids_filename, mmap_mode=mmap_mode),
+            np.load(Path(path) / cls.distances_filename, mmap_mode=mmap_mode),
+        )
+
+    @classmethod
+    def load_or_build(
+        cls,
+        cache_dir: Union[str, PathLike],
+        vocabulary_embeddings: VocabularyEmbeddingsTensor,
+        n_neighbors: int = 50,
+        prefix: Optional[str] = None,
+        save_cache: bool = True,
+        overwrite_cache: bool = False,
+        batch_size: int = 256,
+    ) -> "EmbeddingsKNNIndex":
+        """Loads the index of ``vocabulary_embeddings`` from ``cache_dir``, or builds it if it does not exist.
+
+        Indices are stored in a sub-directory named after ``prefix`` (e.g. the model name) and the key computed by
+        :meth:`~inseq.attr.feat.ops.EmbeddingsKNNIndex.get_key`, so that any change to the embeddings (e.g. their
+        scaling) or to the number of neighbors produces a new index.
+        """
+        key = cls.get_key(vocabulary_embeddings, n_neighbors)
+        index_dir = Path(os.path.expanduser(cache_dir)) / (f"{prefix}_{key[:16]}" if prefix else key[:16])
+        if index_dir.exists() and not overwrite_cache:
+            logger.info(f"Loading kNN index from {index_dir}")
+            return cls.load(index_dir)
+        logger.info(f"kNN index not found in {index_dir}. Computing...")
+        if not save_cache:
+            return cls.build(vocabulary_embeddings, n_neighbors, batch_size)
+        # The index is built in a temporary directory first, so that concurrent readers never see partial arrays
+        tmp_dir = index_dir.with_name(f"{index_dir.name}.{os.getpid()}.tmp")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        cls.build(vocabulary_embeddings, n_neighbors, batch_size, path=tmp_dir)
+        if overwrite_cache:
+            shutil.rmtree(index_dir, ignore_errors=True)
+        elif index_dir.exists():
+            # The same index was built by another process in the meantime
+            shutil.rmtree(tmp_dir)
+            return cls.load(index_dir)
+        try:
+            os.replace(tmp_dir, index_dir)
+        except OSError:
+            # Another process moved its index in place after the check
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not index_dir.exists():
+                raise
+        return cls.load(index_dir)
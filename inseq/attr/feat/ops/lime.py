@@ -5,7 +5,7 @@ from functools import partial
 from typing import Any, Callable, Optional, cast
 
 import torch
-from captum._utils.common import _expand_additional_forward_args, _expand_target
+from captum._utils.common import _expand_additional_forward_args, _expand_target, _run_forward
 from captum._utils.models.linear_model import SkLearnLinearModel
 from captum._utils.models.model import Model
 from captum._utils.progress import progress
@@ -14,6 +14,9 @@ from captum.attr import LimeBase
 from torch import Tensor
 from torch.utils.data import DataLoader, TensorDataset
 
+from ..attribution_utils import get_auto_internal_batch_size
+from .linear_surrogate import BatchedLinearSurrogate, LinearSurrogateMethod
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,10 +31,27 @@ class Lime(LimeBase):
         from_interp_rep_transform: Optional[Callable] = None,
         to_interp_rep_transform: Optional[Callable] = None,
         mask_prob: float = 0.3,
+        surrogate: Optional[str] = LinearSurrogateMethod.RIDGE.value,
+        alpha: float = 1.0,
     ) -> None:
+        # If no interpretable model is provided, surrogates of all sequences are fitted at once in the token-level
+        # interpretable space, using token masks as features
+        self.surrogate = None
         if interpretable_model is None:
+            if surrogate is not None:
+                self.surrogate = BatchedLinearSurrogate(surrogate, alpha=alpha)
             interpretable_model = SkLearnLinearModel("linear_model.Ridge")
 
+        # Masks, perturbed inputs and similarities of the default sampling functions are computed for all samples and
+        # sequences at once
+        self.use_vectorized_sampling = (
+            perturb_func is None
+            and similarity_func is None
+            and to_interp_rep_transform is None
+            and not perturb_interpretable_space
+        )
+        self.mask_prob = mask_prob
+
         if similarity_func is None:
             similarity_func = self.token_similarity_kernel
 
@@ -59,6 +79,119 @@ class Lime(LimeBase):
         self.attribution_model = attribution_model
 
     def attribute(
+        self,
+        inputs: TensorOrTupleOfTensorsGeneric,
+        target: TargetType = None,
+        additional_forward_args: Any = None,
+        n_samples: int = 50,
+        perturbations_per_eval: Optional[int] = None,
+        show_progress: bool = False,
+        **kwargs,
+    ) -> Tensor:
+        r"""Computes LIME attributions for a batch of sequences.
+
+        With the default sampling functions, the token masks of all ``n_samples`` samples are drawn at once for all
+        sequences of the batch, and perturbed inputs are evaluated in chunks of ``perturbations_per_eval`` samples for
+        all sequences at once. Unless a custom ``interpretable_model`` was provided, the surrogate models of all
+        sequences are then fitted at once by a :class:`~inseq.attr.feat.ops.BatchedLinearSurrogate`, using token masks
+        as interpretable inputs and the number of unmasked tokens as sample weights. Otherwise, a separate
+        ``interpretable_model`` is fitted for every sequence on flattened perturbed inputs. Custom sampling functions
+        are applied one sample at a time, and support only a single sequence.
+
+        Args:
+            inputs (tensor or tuple of tensors): Input for which LIME is computed, with shape
+                ``(batch_size, seq_len, ...)``.
+            target (int, tuple, tensor or list, optional): Output indices for which surrogate model is trained.
+            additional_forward_args (any, optional): If the forward function requires additional arguments other than
+                the inputs for which attributions should not be computed, this argument can be provided.
+            n_samples (int, optional): The number of samples of the original model used to train the surrogate
+                interpretable model of every sequence. Default: `50`.
+            perturbations_per_eval (int, optional): The number of samples of all sequences evaluated in a single
+                forward pass. If not provided, it is chosen from the memory available on the model device.
+            show_progress (bool, optional): Displays the progress of computation.
+            **kwargs (Any, optional): Any additional arguments necessary for sampling and transformation functions,
+                e.g. ``mask_token`` (``"unk"`` or ``"pad"``) for the default sampling function.
+
+        Returns:
+            :obj:`torch.Tensor`: The coefficients of the surrogate models. One coefficient per token, with shape
+            ``(batch_size, seq_len)`` (or a tuple of them for multiple inputs), when fitted in the token-level
+            interpretable space, otherwise with the same shape as the first input.
+        """
+        if not self.use_vectorized_sampling:
+            return self._attribute_sequential(
+                inputs,
+                target,
+                additional_forward_args,
+                n_samples=n_samples,
+                perturbations_per_eval=perturbations_per_eval if perturbations_per_eval is not None else 1,
+                show_progress=show_progress,
+                **kwargs,
+            )
+        with torch.no_grad():
+            inputs = inputs if isinstance(inputs, tuple) else (inputs,)
+            batch_size = inputs[0].shape[0]
+            keep_masks = self.sample_token_masks(inputs, n_samples, self.mask_prob)
+            mask_token_id = self.get_mask_token_id(kwargs.get("mask_token", "unk"))
+            if perturbations_per_eval is None:
+                internal_batch_size = get_auto_internal_batch_size(
+                    self.attribution_model,
+                    num_examples=batch_size,
+                    seq_len=sum(inp.shape[1] for inp in inputs),
+                    n_steps=n_samples,
+                )
+                perturbations_per_eval = n_samples
+                if internal_batch_size is not None:
+                    perturbations_per_eval = internal_batch_size // batch_size
+            if show_progress:
+                attr_progress = progress(
+                    total=math.ceil(n_samples / perturbations_per_eval),
+                    desc=f"{self.get_name()} attribution",
+                )
+                attr_progress.update(0)
+            outputs, similarities = [], []
+            for start in range(0, n_samples, perturbations_per_eval):
+                chunk_masks = [mask[start : start + perturbations_per_eval] for mask in keep_masks]
+                num_chunk_samples = chunk_masks[0].shape[0]
+                # Perturbed inputs are ordered by sample first, i.e. (sample_0, seq_0), (sample_0, seq_1), ...
+                perturbed_inputs = self.apply_token_masks(inputs, chunk_masks, mask_token_id)
+                if self.surrogate is None:
+                    similarities.append(self.get_token_similarities(inputs, perturbed_inputs))
+                model_out = _run_forward(
+                    self.forward_func,
+                    tuple(inp.flatten(0, 1) for inp in perturbed_inputs),
+                    _expand_target(target, num_chunk_samples),
+                    _expand_additional_forward_args(additional_forward_args, num_chunk_samples),
+                )
+                outputs.append(model_out.view(num_chunk_samples, batch_size))
+                if show_progress:
+                    attr_progress.update()
+            if show_progress:
+                attr_progress.close()
+            outputs = torch.cat(outputs)
+            if self.surrogate is not None:
+                # features: (batch_size, n_samples, num_tokens), with 1 for tokens kept in the sample
+                features = torch.cat(keep_masks, dim=-1).transpose(0, 1).float()
+                coef = self.surrogate.fit(features, outputs.T.float(), features.sum(-1))
+                if len(inputs) == 1:
+                    return coef
+                return coef.split([inp.shape[1] for inp in inputs], dim=-1)
+            similarities = torch.cat(similarities)
+            # One surrogate model is fitted for every sequence, using its perturbed inputs as interpretable inputs
+            representations = []
+            for seq_idx in range(batch_size):
+                seq_inputs = tuple(inp[seq_idx : seq_idx + 1] for inp in inputs)
+                seq_masks = [mask[:, seq_idx : seq_idx + 1] for mask in keep_masks]
+                interpretable_inps = self.apply_token_masks(seq_inputs, seq_masks, mask_token_id)[0]
+                dataset = TensorDataset(
+                    interpretable_inps.reshape(n_samples, -1).double(),
+                    outputs[:, seq_idx].double(),
+                    similarities[:, seq_idx].double(),
+                )
+                self.interpretable_model.fit(DataLoader(dataset, batch_size=n_samples))
+                representations.append(self.interpretable_model.representation().reshape(inputs[0].shape[1:]))
+            return torch.stack(representations).to(inputs[0].device)
+
+    def _attribute_sequential(
         self,
         inputs: TensorOrTupleOfTensorsGeneric,
         target: TargetType = None,
@@ -211,6 +344,59 @@ class Lime(LimeBase):
             """
             return self.interpretable_model.representation().reshape(inp_tensor.shape)
 
+    def sample_token_masks(
+        self,
+        inputs: tuple[Tensor, ...],
+        n_samples: int,
+        mask_prob: float = 0.3,
+    ) -> list[Tensor]:
+        r"""Draws the token masks of all samples for all sequences at once.
+
+        Args:
+            inputs (tuple of tensors): Inputs of shape ``(batch_size, seq_len, ...)``.
+            n_samples (int): The number of masks drawn for every sequence.
+            mask_prob (float): The probability of masking every token.
+
+        Returns:
+            A list containing a boolean tensor of shape ``(n_samples, batch_size, seq_len)`` for every input, marking
+            tokens that are kept. Special tokens are never masked when inputs are token ids.
+        """
+        masks = []
+        for inp in inputs:
+            keep_mask = torch.rand(n_samples, *inp.shape[:2], device=inp.device) >= mask_prob
+            if inp.ndim == 2 and not inp.is_floating_point():
+                special_ids = torch.tensor(self.attribution_model.special_tokens_ids, device=inp.device)
+                keep_mask |= torch.isin(inp, special_ids)
+            masks.append(keep_mask)
+        return masks
+
+    def get_mask_token_id(self, mask_token: str = "unk") -> int:
+        """Returns the id of the special token used for masking the input. Options: "unk" and "pad"."""
+        if mask_token == "unk":
+            return self.attribution_model.tokenizer.unk_token_id
+        elif mask_token == "pad":
+            return self.attribution_model.tokenizer.pad_token_id
+        raise ValueError(f"Invalid mask token {mask_token} for tokenizer: {self.attribution_model.tokenizer}")
+
+    @staticmethod
+    def apply_token_masks(inputs: tuple[Tensor, ...], masks: list[Tensor], mask_token_id: int) -> tuple[Tensor, ...]:
+        r"""Replaces masked tokens with ``mask_token_id``, producing perturbed inputs of shape
+        ``(n_samples, batch_size, seq_len, ...)``.
+        """
+        return tuple(
+            torch.where(mask.view(*mask.shape, *([1] * (inp.ndim - 2))), inp.unsqueeze(0), mask_token_id).to(inp.dtype)
+            for inp, mask in zip(inputs, masks)
+        )
+
+    @staticmethod
+    def get_token_similarities(inputs: tuple[Tensor, ...], perturbed_inputs: tuple[Tensor, ...]) -> Tensor:
+        r"""Vectorized version of :meth:`~inseq.attr.feat.ops.Lime.token_similarity_kernel`, counting the unchanged
+        elements of every perturbed sequence. Returns a tensor of shape ``(n_samples, batch_size)``.
+        """
+        return sum(
+            (perturbed == inp.unsqueeze(0)).flatten(2).sum(-1) for inp, perturbed in zip(inputs, perturbed_inputs)
+        )
+
     @staticmethod
     def token_similarity_kernel(
         original_input: tuple,
@@ -277,12 +463,7 @@ class Lime(LimeBase):
             )
 
             # Set special token for masking
-            if mask_token == "unk":
-                tokenizer_mask_token = self.attribution_model.tokenizer.unk_token_id
-            elif mask_token == "pad":
-                tokenizer_mask_token = self.attribution_model.tokenizer.pad_token_id
-            else:
-                raise ValueError(f"Invalid mask token {mask_token} for tokenizer: {self.attribution_model.tokenizer}")
+            tokenizer_mask_token = self.get_mask_token_id(mask_token)
 
             # Apply mask to original input
             perturbed_inputs.append(original_input_tensor * mask + (1 - mask) * tokenizer_mask_token)
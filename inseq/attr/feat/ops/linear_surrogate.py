@@ -0,0 +1,136 @@
+import logging
+from enum import Enum
+
+import torch
+from jaxtyping import Float
+from torch import Tensor
+
+logger = logging.getLogger(__name__)
+
+
+class LinearSurrogateMethod(Enum):
+    RIDGE = "ridge"
+    LASSO = "lasso"
+
+
+class BatchedLinearSurrogate:
+    """Weighted linear regressions fitted for a batch of independent problems at once, used as surrogate models for
+    LIME. All problems share the same number of samples and features, and are solved in the dtype and on the device of
+    their inputs.
+
+    Ridge regressions minimize ``sum_i w_i (y_i - x_i b - b_0)^2 + alpha ||b||_2^2`` and are solved in closed form
+    from their normal equations with a Cholesky decomposition. Lasso regressions minimize
+    ``1 / (2 sum_i w_i) sum_i w_i (y_i - x_i b - b_0)^2 + alpha ||b||_1`` with FISTA. Both objectives match those of
+    the corresponding scikit-learn estimators with sample weights.
+
+    Args:
+        method (:obj:`str`, `optional`): The regression method, either ``"ridge"`` or ``"lasso"``. Default: "ridge".
+        alpha (:obj:`float`, `optional`): The regularization strength. Default: 1.0.
+        fit_intercept (:obj:`bool`, `optional`): Whether an unregularized intercept is fitted. Default: True.
+        max_iter (:obj:`int`, `optional`): The maximum number of FISTA iterations for lasso regressions. Default: 1000.
+        tol (:obj:`float`, `optional`): Lasso iterations stop when no coefficient changes by more than ``tol``.
+            Default: 1e-6.
+    """
+
+    def __init__(
+        self,
+        method: str = LinearSurrogateMethod.RIDGE.value,
+        alpha: float = 1.0,
+        fit_intercept: bool = True,
+        max_iter: int = 1000,
+        tol: float = 1e-6,
+    ):
+        if method not in [m.value for m in LinearSurrogateMethod]:
+            raise ValueError(
+                f"Surrogate method {method} not available. "
+                f"Available methods: {','.join(m.value for m in LinearSurrogateMethod)}"
+            )
+        self.method = method
+        self.alpha = alpha
+        self.fit_intercept = fit_intercept
+        self.max_iter = max_iter
+        self.tol = tol
+        self.coef_ = None
+        self.intercept_ = None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(method={self.method}, alpha={self.alpha})"
+
+    def fit(
+        self,
+        inputs: Float[Tensor, "batch_size n_samples n_features"],
+        targets: Float[Tensor, "batch_size n_samples"],
+        weights: Float[Tensor, "batch_size n_samples"],
+    ) -> Float[Tensor, "batch_size n_features"]:
+        """Fits one weighted regression per batch element.
+
+        Args:
+            inputs (:obj:`torch.Tensor`): Features of the samples of every problem.
+            targets (:obj:`torch.Tensor`): Regression targets of the samples of every problem.
+            weights (:obj:`torch.Tensor`): Non-negative weights of the samples of every problem.
+
+        Returns:
+            :obj:`torch.Tensor`: The coefficients of every problem, also stored in ``coef_`` alongside intercepts in
+            ``intercept_``.
+        """
+        weights = weights.to(inputs.dtype)
+        targets = targets.to(inputs.dtype)
+        weights_sum = weights.sum(-1, keepdim=True).clamp_min(torch.finfo(inputs.dtype).tiny)
+        if self.fit_intercept:
+            inputs_mean = (weights.unsqueeze(-1) * inputs).sum(1, keepdim=True) / weights_sum.unsqueeze(-1)
+            targets_mean = (weights * targets).sum(-1, keepdim=True) / weights_sum
+            inputs = inputs - inputs_mean
+            targets = targets - targets_mean
+        weighted_inputs = weights.unsqueeze(-1) * inputs
+        # Weighted Gram matrices X^T W X and moments X^T W y, shared by both methods
+        gram = weighted_inputs.transpose(1, 2) @ inputs
+        moments = (weighted_inputs.transpose(1, 2) @ targets.unsqueeze(-1)).squeeze(-1)
+        if self.method == LinearSurrogateMethod.RIDGE.value:
+            coef = self._solve_ridge(gram, moments)
+        else:
+            coef = self._solve_lasso(gram / weights_sum.unsqueeze(-1), moments / weights_sum)
+        self.coef_ = coef
+        if self.fit_intercept:
+            self.intercept_ = targets_mean.squeeze(-1) - (inputs_mean.squeeze(1) * coef).sum(-1)
+        else:
+            self.intercept_ = torch.zeros_like(coef[:, 0])
+        return coef
+
+    def _solve_ridge(
+        self,
+        gram: Float[Tensor, "batch_size n_features n_features"],
+        moments: Float[Tensor, "batch_size n_features"],
+    ) -> Float[Tensor, "batch_size n_features"]:
+        system = gram + self.alpha * torch.eye(gram.shape[-1], dtype=gram.dtype, device=gram.device)
+        factors, info = torch.linalg.cholesky_ex(system)
+        coef = torch.cholesky_solve(moments.unsqueeze(-1), factors).squeeze(-1)
+        failed = info > 0
+        if failed.any():
+            # Singular systems (e.g. alpha=0 with constant features) are solved with a pseudo-inverse
+            logger.debug(f"Cholesky decomposition failed for {int(failed.sum())} problems, using pseudo-inverse.")
+            coef[failed] = (torch.linalg.pinv(system[failed]) @ moments[failed].unsqueeze(-1)).squeeze(-1)
+        return coef
+
+    def _solve_lasso(
+        self,
+        gram: Float[Tensor, "batch_size n_features n_features"],
+        moments: Float[Tensor, "batch_size n_features"],
+    ) -> Float[Tensor, "batch_size n_features"]:
+        # The gradient of the smooth part of the objective is gram @ b - moments, with Lipschitz constant equal to the
+        # largest eigenvalue of gram
+        lipschitz = torch.linalg.eigvalsh(gram)[:, -1:].clamp_min(torch.finfo(gram.dtype).tiny)
+        threshold = self.alpha / lipschitz
+        coef = torch.zeros_like(moments)
+        momentum_coef = coef
+        step = 1.0
+        for _ in range(self.max_iter):
+            gradient = (gram @ momentum_coef.unsqueeze(-1)).squeeze(-1) - moments
+            update = momentum_coef - gradient / lipschitz
+            new_coef = update.sign() * (update.abs() - threshold).clamp_min(0)
+            new_step = (1 + (1 + 4 * step**2) ** 0.5) / 2
+            momentum_coef = new_coef + ((step - 1) / new_step) * (new_coef - coef)
+            converged = (new_coef - coef).abs().max() <= self.tol
+            coef, step = new_coef, new_step
+            if converged:
+                break
+        return coef
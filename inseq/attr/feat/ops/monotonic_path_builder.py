@@ -19,26 +19,19 @@
 """Monotonic path builder for Discretized Integrated Gradients (DIG)."""
 
 import logging
-import os
 from enum import Enum
-from itertools import islice
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 import torch
 from jaxtyping import Float, Int
 
-from ....utils import is_joblib_available, is_scikitlearn_available
-
-if is_joblib_available():
-    from joblib import Parallel, delayed
+from ....utils import INSEQ_ARTIFACTS_CACHE, euclidean_distance
+from ....utils.typing import MultiStepEmbeddingsTensor, VocabularyEmbeddingsTensor
+from .embeddings_knn_index import EmbeddingsKNNIndex
 
-if is_scikitlearn_available():
+if TYPE_CHECKING:
     from scipy.sparse import csr_matrix
-    from sklearn.neighbors import kneighbors_graph
-
-from ....utils import INSEQ_ARTIFACTS_CACHE, cache_results, euclidean_distance
-from ....utils.typing import MultiStepEmbeddingsTensor, VocabularyEmbeddingsTensor
 
 logger = logging.getLogger(__name__)
 
@@ -74,67 +67,50 @@ class MonotonicPathBuilder:
     def __init__(
         self,
         vocabulary_embeddings: VocabularyEmbeddingsTensor,
-        knn_graph: "csr_matrix",
+        knn_index: Union[EmbeddingsKNNIndex, "csr_matrix"],
         special_tokens: list[int] = [],
     ) -> None:
         """Initialize the monotonic path builder."""
         self.vocabulary_embeddings = vocabulary_embeddings
-        self.knn_graph = knn_graph
+        if not isinstance(knn_index, EmbeddingsKNNIndex):
+            knn_index = EmbeddingsKNNIndex.from_knn_graph(knn_index)
+        self.knn_index = knn_index
         self.special_tokens = special_tokens
-
-    @staticmethod
-    @cache_results
-    def compute_embeddings_knn(
-        vocabulary_embeddings: Optional[VocabularyEmbeddingsTensor],
-        n_neighbors: int = 50,
-        mode: str = "distance",
-        n_jobs: int = -1,
-    ) -> "csr_matrix":
-        """Either loads or computes the knn graph for token embeddings."""
-        if not is_scikitlearn_available():
-            raise ImportError("scikit-learn is not available. Please install it to use MonotonicPathBuilder.")
-        knn_graph = kneighbors_graph(
-            vocabulary_embeddings,
-            n_neighbors=n_neighbors,
-            mode=mode,
-            n_jobs=n_jobs,
-        )
-        return knn_graph
+        # Word paths of n_steps - 1 anchor ids computed by find_paths, keyed by (word_idx, baseline_idx, n_steps,
+        # strategy)
+        self.path_cache: dict[tuple[int, int, int, str], torch.Tensor] = {}
 
     @classmethod
     def load(
         cls,
         model_name: str,
         n_neighbors: int = 50,
-        mode: str = "distance",
-        n_jobs: int = -1,
         save_cache: bool = True,
         overwrite_cache: bool = False,
         cache_dir: Path = INSEQ_ARTIFACTS_CACHE / "path_knn",
         vocabulary_embeddings: Optional[VocabularyEmbeddingsTensor] = None,
         special_tokens: list[int] = [],
         embedding_scaling: int = 1,
+        batch_size: int = 256,
     ) -> "MonotonicPathBuilder":
-        """Load a cached monotonic path builder from a model name, or compute it if it does not exist."""
-        cache_filename = os.path.join(cache_dir, f"{model_name.replace('/', '__')}_{n_neighbors}.pkl")
+        """Load a cached monotonic path builder from a model name, or compute it if it does not exist.
+
+        The kNN index of the scaled vocabulary embeddings is stored in ``cache_dir`` under a key computed from the
+        embeddings and ``n_neighbors`` (see :class:`~inseq.attr.feat.ops.EmbeddingsKNNIndex`).
+        """
         if vocabulary_embeddings is None:
-            logger.warning(
-                "Since no token embeddings are passed, a cached file is expected. "
-                "If the file is not found, an exception will be raised."
-            )
+            raise ValueError("Vocabulary embeddings are required to load the kNN index of a monotonic path builder.")
         vocabulary_embeddings = vocabulary_embeddings * embedding_scaling
-        # Cache parameters are passed to the cache_results decorator
-        knn_graph = cls.compute_embeddings_knn(
+        knn_index = EmbeddingsKNNIndex.load_or_build(
             cache_dir,
-            cache_filename,
-            save_cache,
-            overwrite_cache,
-            vocabulary_embeddings=vocabulary_embeddings,
+            vocabulary_embeddings,
             n_neighbors=n_neighbors,
-            mode=mode,
-            n_jobs=n_jobs,
+            prefix=model_name.replace("/", "__"),
+            save_cache=save_cache,
+            overwrite_cache=overwrite_cache,
+            batch_size=batch_size,
         )
-        return cls(vocabulary_embeddings, knn_graph, special_tokens)
+        return cls(vocabulary_embeddings, knn_index, special_tokens)
 
     def scale_inputs(
         self,
@@ -148,39 +124,83 @@ class MonotonicPathBuilder:
             n_steps = 30
         if scale_strategy is None:
             scale_strategy = "greedy"
-        if not is_joblib_available():
-            raise ImportError("joblib is not available. Please install it to use MonotonicPathBuilder.")
-        word_paths_flat = Parallel(n_jobs=3, prefer="threads")(
-            delayed(self.find_path)(
-                int(input_ids[seq_idx, tok_idx]),
-                int(baseline_ids[seq_idx, tok_idx]),
+        batch_size, seq_len = input_ids.shape
+        word_paths = self.find_paths(input_ids.flatten().cpu(), baseline_ids.flatten().cpu(), n_steps, scale_strategy)
+        # out shape: batch_size * seq_len x n_steps x hidden_size
+        path_embeds = self.build_monotonic_path_embeddings(word_paths, baseline_ids.flatten().cpu(), n_steps)
+        # out shape: batch_size * n_steps x seq_len x hidden_size
+        path_embeds = path_embeds.view(batch_size, seq_len, n_steps, -1).transpose(1, 2)
+        path_embeds = path_embeds.reshape(batch_size * n_steps, seq_len, -1)
+        return path_embeds.float().to(input_ids.device).requires_grad_()
+
+    def find_paths(
+        self,
+        word_ids: Int[torch.Tensor, "num_words"],
+        baseline_ids: Int[torch.Tensor, "num_words"],
+        n_steps: int = 30,
+        strategy: str = "greedy",
+        batch_size: int = 256,
+    ) -> Int[torch.Tensor, "num_words n_steps_minus_one"]:
+        """Find monotonic paths from multiple words to their baselines, equivalent to calling
+        :meth:`~inseq.attr.feat.ops.MonotonicPathBuilder.find_path` on every word.
+
+        Paths are looked up in ``path_cache``, and missing ones are computed ``batch_size`` words at a time by scoring
+        all kNN candidates of all words at once at every step.
+        """
+        if strategy not in [s.value for s in PathBuildingStrategies]:
+            raise UnknownPathBuildingStrategy(strategy)
+        keys = [
+            (word_idx, baseline_idx, n_steps, strategy)
+            for word_idx, baseline_idx in zip(word_ids.tolist(), baseline_ids.tolist())
+        ]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.path_cache))
+        for start in range(0, len(missing), batch_size):
+            batch_keys = missing[start : start + batch_size]
+            batch_paths = self._find_paths_batch(
+                torch.tensor([key[0] for key in batch_keys]),
+                torch.tensor([key[1] for key in batch_keys]),
                 n_steps=n_steps,
-                strategy=scale_strategy,
+                strategy=strategy,
             )
-            for seq_idx in range(input_ids.shape[0])
-            for tok_idx in range(input_ids.shape[1])
-        )
-        # Unflatten word paths
-        word_paths_iter = iter(word_paths_flat)
-        word_paths = [list(islice(word_paths_iter, input_ids.shape[1])) for _ in range(input_ids.shape[0])]
-        # Fill embeddings list
-        lst_all_seq_embeds = []
-        for seq_idx in range(input_ids.shape[0]):
-            lst_curr_seq_embeds = []
-            for tok_idx in range(input_ids.shape[1]):
-                lst_curr_seq_embeds.append(
-                    self.build_monotonic_path_embedding(
-                        word_path=word_paths[seq_idx][tok_idx],
-                        baseline_idx=int(baseline_ids[seq_idx, tok_idx]),
-                        n_steps=n_steps,
-                    )
-                )
-            # out shape: n_steps x seq_len x hidden_size
-            t_curr_seq_embeds = torch.stack(lst_curr_seq_embeds, axis=1).float()
-            lst_all_seq_embeds.append(t_curr_seq_embeds)
-        # concat sequences on batch dimension
-        t_all_seq_embeds = torch.cat(lst_all_seq_embeds).to(input_ids.device).requires_grad_()
-        return t_all_seq_embeds
+            self.path_cache.update(zip(batch_keys, batch_paths))
+        return torch.stack([self.path_cache[key] for key in keys])
+
+    def _find_paths_batch(
+        self,
+        word_ids: Int[torch.Tensor, "num_words"],
+        baseline_ids: Int[torch.Tensor, "num_words"],
+        n_steps: int = 30,
+        strategy: str = "greedy",
+    ) -> Int[torch.Tensor, "num_words n_steps_minus_one"]:
+        word_paths = word_ids.unsqueeze(1).repeat(1, n_steps - 1)
+        baseline_vecs = self.vocabulary_embeddings[baseline_ids].unsqueeze(1)
+        curr_ids = word_ids
+        for step in range(1, n_steps - 1):
+            # num_words x n_neighbors
+            candidates = self.knn_index.get_neighbors(curr_ids)
+            # ignore anchor words equal to the baseline (padding, special tokens) or already selected in the path
+            is_valid = (
+                (candidates >= 0)
+                & (candidates != baseline_ids.unsqueeze(1))
+                & ~(candidates.unsqueeze(-1) == word_paths[:, None, :step]).any(-1)
+            )
+            distances = self.get_anchors_distance(
+                strategy,
+                anchors=self.vocabulary_embeddings[candidates.clamp(min=0)],
+                baseline=baseline_vecs,
+                input=self.vocabulary_embeddings[curr_ids].unsqueeze(1),
+                n_steps=n_steps,
+            )
+            distances = distances.float().masked_fill(~is_valid, float("inf"))
+            # argmin returns the first minimum, matching the order of neighbors in the kNN graph for ties
+            closest_ids = candidates.gather(1, distances.argmin(dim=-1, keepdim=True)).squeeze(1)
+            # If the baseline is reached or no valid anchor word is left, all further anchor words are the baseline
+            curr_ids = torch.where(is_valid.any(-1) & (curr_ids != baseline_ids), closest_ids, baseline_ids)
+            word_paths[:, step] = curr_ids
+        # special tokens are copied along the whole path
+        is_special = torch.isin(word_ids, torch.tensor(self.special_tokens, dtype=word_ids.dtype))
+        word_paths[is_special] = word_ids[is_special].unsqueeze(1)
+        return word_paths
 
     def find_path(
         self,
@@ -227,6 +247,33 @@ class MonotonicPathBuilder:
         assert self.check_monotonic(monotonic_embs), "The embeddings are not monotonic"
         return torch.stack(monotonic_embs)
 
+    def build_monotonic_path_embeddings(
+        self,
+        word_paths: Int[torch.Tensor, "num_words n_steps_minus_one"],
+        baseline_ids: Int[torch.Tensor, "num_words"],
+        n_steps: int = 30,
+    ) -> Float[torch.Tensor, "num_words n_steps embed_size"]:
+        """Build monotonic path embeddings from multiple word paths, equivalent to calling
+        :meth:`~inseq.attr.feat.ops.MonotonicPathBuilder.build_monotonic_path_embedding` on every path.
+        """
+        baseline_vecs = self.vocabulary_embeddings[baseline_ids]
+        monotonic_embs = [self.vocabulary_embeddings[word_paths[:, 0]]]
+        for idx in range(1, word_paths.shape[1]):
+            monotonic_embs.append(
+                self.make_monotonic_vec(
+                    anchor=self.vocabulary_embeddings[word_paths[:, idx]],
+                    baseline=baseline_vecs,
+                    input=monotonic_embs[-1],
+                    n_steps=n_steps,
+                )
+            )
+        monotonic_embs += [baseline_vecs]
+        # reverse the list so that baseline is the first and input word is the last
+        monotonic_embs.reverse()
+        monotonic_embs = torch.stack(monotonic_embs, dim=1)
+        assert self.check_monotonic(monotonic_embs), "The embeddings are not monotonic"
+        return monotonic_embs
+
     def get_closest_word(
         self,
         word_idx: int,
@@ -240,13 +287,13 @@ class MonotonicPathBuilder:
         # then all further anchor words should be ref_idx
         if word_idx == baseline_idx:
             return baseline_idx
-        cx = self.knn_graph[word_idx].tocoo()
+        candidates = self.knn_index.get_neighbors(torch.tensor(word_idx)).tolist()
         # ignore anchor word if equals the baseline (padding, special tokens)
         # remove words that are already selected in the path
         anchor_map = {
             anchor_idx: self.get_word_distance(strategy, anchor_idx, baseline_idx, word_idx, n_steps)
-            for anchor_idx in cx.col
-            if anchor_idx not in word_path + [baseline_idx]
+            for anchor_idx in candidates
+            if anchor_idx >= 0 and anchor_idx not in word_path + [baseline_idx]
         }
         if len(anchor_map) == 0:
             return baseline_idx
@@ -262,36 +309,45 @@ class MonotonicPathBuilder:
         n_steps: int,
     ) -> Union[float, int]:
         """Get the distance between the anchor word and the baseline word."""
+        return self.get_anchors_distance(
+            strategy,
+            anchors=self.vocabulary_embeddings[anchor_idx],
+            baseline=self.vocabulary_embeddings[baseline_idx],
+            input=self.vocabulary_embeddings[original_idx],
+            n_steps=n_steps,
+        )
+
+    @classmethod
+    def get_anchors_distance(
+        cls,
+        strategy: str,
+        anchors: torch.Tensor,
+        baseline: torch.Tensor,
+        input: torch.Tensor,
+        n_steps: int,
+    ) -> torch.Tensor:
+        """Get the distance of anchor embeddings along the last dimension, broadcasting baseline and input
+        embeddings to the shape of anchors.
+        """
         if strategy == PathBuildingStrategies.GREEDY.value:
             # calculate the distance of the monotonized vec from the interpolated point
-            monotonic_vec = self.make_monotonic_vec(
-                self.vocabulary_embeddings[anchor_idx],
-                self.vocabulary_embeddings[baseline_idx],
-                self.vocabulary_embeddings[original_idx],
-                n_steps,
-            )
-            return euclidean_distance(self.vocabulary_embeddings[anchor_idx], monotonic_vec)
+            monotonic_vec = cls.make_monotonic_vec(anchors, baseline, input, n_steps)
+            return euclidean_distance(anchors, monotonic_vec)
         elif strategy == PathBuildingStrategies.MAXCOUNT.value:
             # count the number of non-monotonic dimensions
-            monotonic_dims = self.get_monotonic_dims(
-                self.vocabulary_embeddings[anchor_idx],
-                self.vocabulary_embeddings[baseline_idx],
-                self.vocabulary_embeddings[original_idx],
-            )
+            monotonic_dims = cls.get_monotonic_dims(anchors, baseline, input)
             # 10000 is an arbitrarily high to be agnostic of embeddings dimensionality
-            return 10000 - monotonic_dims.sum()
+            return 10000 - monotonic_dims.sum(-1)
         else:
             raise UnknownPathBuildingStrategy(strategy)
 
     @classmethod
-    def check_monotonic(cls, input: torch.Tensor) -> bool:
-        """Return true if input dimensions are monotonic, false otherwise."""
-        check = True
-        for i in range(len(input) - 1):
-            monotonic_dims = cls.get_monotonic_dims(input[i + 1], input[-1], input[i])
-            is_fully_monotonic = monotonic_dims.sum() == input[-1].shape[0]
-            check *= is_fully_monotonic
-        return check
+    def check_monotonic(cls, input: Union[torch.Tensor, list[torch.Tensor]]) -> bool:
+        """Return true if input dimensions are monotonic along the path dimension (second to last), false otherwise."""
+        if isinstance(input, list):
+            input = torch.stack(input)
+        monotonic_dims = cls.get_monotonic_dims(input[..., 1:, :], input[..., -1:, :], input[..., :-1, :])
+        return bool(monotonic_dims.all())
 
     @classmethod
     def make_monotonic_vec(
@@ -301,16 +357,12 @@ class MonotonicPathBuilder:
         input: torch.Tensor,
         n_steps: Optional[int] = 30,
     ) -> torch.Tensor:
-        """Create a new monotonic vector w.r.t. input and baseline from an existing anchor."""
+        """Create a new monotonic vector w.r.t. input and baseline from an existing anchor. Input and baseline are
+        broadcasted to the shape of the anchor.
+        """
         non_monotonic_dims = ~cls.get_monotonic_dims(anchor, baseline, input)
-        if non_monotonic_dims.sum() == 0:
-            return anchor
         # make the anchor monotonic
-        monotonic_vec = anchor.clone()
-        monotonic_vec[non_monotonic_dims] = input[non_monotonic_dims] - (1.0 / n_steps) * (
-            input[non_monotonic_dims] - baseline[non_monotonic_dims]
-        )
-        return monotonic_vec
+        return torch.where(non_monotonic_dims, input - (1.0 / n_steps) * (input - baseline), anchor)
 
     @staticmethod
     def get_monotonic_dims(
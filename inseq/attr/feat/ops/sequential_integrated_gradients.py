@@ -26,6 +26,7 @@ from captum._utils.common import (
     _format_additional_forward_args,
     _format_output,
     _is_tuple,
+    _run_forward,
 )
 from captum._utils.typing import (
     BaselineType,
@@ -251,16 +252,20 @@ class SequentialIntegratedGradients(GradientAttribution):
                 one of `riemann_right`, `riemann_left`, `riemann_middle`,
                 `riemann_trapezoid` or `gausslegendre`.
                 Default: `gausslegendre` if no method is provided.
-            internal_batch_size (int, optional): Divides total #steps * #examples
+            internal_batch_size (int, optional): Divides total #positions * #steps * #examples
                 data points into chunks of size at most internal_batch_size,
                 which are computed (forward / backward passes)
-                sequentially. internal_batch_size must be at least equal to
-                #examples.
+                sequentially. If internal_batch_size is at least equal to
+                #steps * #examples, the interpolation paths of as many
+                positions as possible are batched together. Otherwise, the
+                steps of every position are split in chunks. internal_batch_size
+                must be at least equal to #examples.
                 For DataParallel models, each batch is split among the
                 available devices, so evaluations on each available
                 device contain internal_batch_size / num_devices examples.
-                If internal_batch_size is None, then all evaluations are
-                processed in one batch.
+                If internal_batch_size is None, positions are attributed one
+                at a time, processing all the steps of every position in one
+                batch.
                 Default: None
             return_convergence_delta (bool, optional): Indicates whether to return
                 convergence delta or not. If `return_convergence_delta`
@@ -311,46 +316,53 @@ class SequentialIntegratedGradients(GradientAttribution):
         ), "All inputs must have the same sequential dimension. (dimension 1)"
 
         indexes = range(inputs[0].shape[1])
+        num_examples = inputs[0].shape[0]
 
-        # Loop over the sequence
-        attributions_partial_list = []
-        for idx in indexes:
-            if internal_batch_size is not None:
-                num_examples = inputs[0].shape[0]
-                attributions_partial = _batch_attribution(
-                    self,
-                    num_examples,
-                    internal_batch_size,
-                    n_steps,
+        # Number of positions whose interpolation paths fit in a single forward / backward pass
+        positions_per_batch = 1 if internal_batch_size is None else internal_batch_size // (num_examples * n_steps)
+
+        if positions_per_batch >= 1:
+            # Stack the paths of several positions in the same batch
+            attributions_partial_list = [
+                self._attribute_positions(
                     inputs=inputs,
                     baselines=baselines,
                     target=target,
                     additional_forward_args=additional_forward_args,
+                    n_steps=n_steps,
                     method=method,
-                    idx=idx,
+                    idxs=list(indexes[start : start + positions_per_batch]),
                 )
-            else:
-                attributions_partial = self._attribute(
+                for start in range(0, len(indexes), positions_per_batch)
+            ]
+            attributions = tuple(torch.cat(partials, dim=1) for partials in zip(*attributions_partial_list))
+        else:
+            # Loop over the sequence, splitting the steps of every position in chunks
+            attributions_partial_list = []
+            for idx in indexes:
+                attributions_partial = _batch_attribution(
+                    self,
+                    num_examples,
+                    internal_batch_size,
+                    n_steps,
                     inputs=inputs,
                     baselines=baselines,
                     target=target,
                     additional_forward_args=additional_forward_args,
-                    n_steps=n_steps,
                     method=method,
                     idx=idx,
                 )
-
-            attributions_partial_list.append(attributions_partial)
-
-        # Merge collected attributions
-        attributions = ()
-        for i in range(len(attributions_partial_list[0])):
-            attributions += (
-                torch.stack(
-                    [x[i][:, idx, ...] for idx, x in enumerate(attributions_partial_list)],
-                    dim=1,
-                ),
-            )
+                attributions_partial_list.append(attributions_partial)
+
+            # Merge collected attributions
+            attributions = ()
+            for i in range(len(attributions_partial_list[0])):
+                attributions += (
+                    torch.stack(
+                        [x[i][:, idx, ...] for idx, x in enumerate(attributions_partial_list)],
+                        dim=1,
+                    ),
+                )
 
         if return_convergence_delta:
             start_point, end_point = baselines, inputs
@@ -365,6 +377,82 @@ class SequentialIntegratedGradients(GradientAttribution):
             return _format_output(is_inputs_tuple, attributions), delta
         return _format_output(is_inputs_tuple, attributions)
 
+    def _attribute_positions(
+        self,
+        inputs: tuple[Tensor, ...],
+        baselines: tuple[Union[Tensor, int, float], ...],
+        target: TargetType = None,
+        additional_forward_args: Any = None,
+        n_steps: int = 50,
+        method: str = "gausslegendre",
+        idxs: list[int] = None,
+    ) -> tuple[Tensor, ...]:
+        """Computes the attributions of all positions in ``idxs`` with a single forward / backward pass.
+
+        The interpolation paths of all positions are stacked along the batch dimension, with rows ordered by
+        (position, step, example). Every row is a copy of the unscaled inputs in which only the interpolated position
+        is replaced, and gradients are taken with respect to interpolated positions only.
+
+        Returns:
+            :obj:`tuple` of :obj:`torch.Tensor`: The attributions of every input, with shape
+            ``(bsz, len(idxs), *inputs[i].shape[2:])``.
+        """
+        step_sizes_func, alphas_func = approximation_parameters(method)
+        step_sizes, alphas = step_sizes_func(n_steps), alphas_func(n_steps)
+        num_positions = len(idxs)
+        positions = torch.tensor(idxs, device=inputs[0].device)
+
+        interpolated_tpl, scaled_features_tpl, deltas_tpl = (), (), ()
+        for input, baseline in zip(inputs, baselines):
+            extra_dims = (1,) * (input.ndim - 2)
+            # dim -> (#positions x bsz x inputs[0].shape[2:])
+            input_positions = input[:, positions, ...].transpose(0, 1)
+            baseline_positions = baseline
+            if isinstance(baseline, Tensor):
+                baseline_positions = baseline[:, positions, ...].transpose(0, 1).unsqueeze(1)
+            delta = input_positions.unsqueeze(1) - baseline_positions
+            # dim -> (#positions x #steps x bsz x inputs[0].shape[2:])
+            alphas_tensor = torch.tensor(alphas, dtype=input.dtype, device=input.device)
+            interpolated = baseline_positions + alphas_tensor.view(1, n_steps, 1, *extra_dims) * delta
+            interpolated = interpolated.detach().requires_grad_()
+            # Every row copies the unscaled inputs, replacing the interpolated position
+            position_mask = (torch.arange(input.shape[1], device=input.device) == positions.unsqueeze(1)).view(
+                num_positions, 1, 1, input.shape[1], *extra_dims
+            )
+            # scaled_features' dim -> (#positions * #steps * bsz x inputs[0].shape[1:])
+            scaled_features = torch.where(position_mask, interpolated.unsqueeze(3), input.detach())
+            interpolated_tpl += (interpolated,)
+            scaled_features_tpl += (scaled_features.reshape(-1, *input.shape[1:]),)
+            deltas_tpl += (delta.squeeze(1),)
+
+        additional_forward_args = _format_additional_forward_args(additional_forward_args)
+        input_additional_args = (
+            _expand_additional_forward_args(additional_forward_args, num_positions * n_steps)
+            if additional_forward_args is not None
+            else None
+        )
+        expanded_target = _expand_target(target, num_positions * n_steps)
+
+        with torch.autograd.set_grad_enabled(True):
+            outputs = _run_forward(self.forward_func, scaled_features_tpl, expanded_target, input_additional_args)
+            assert (
+                outputs[0].numel() == 1
+            ), "Target not provided when necessary, cannot take gradient with respect to multiple outputs."
+            # grads: dim -> (#positions x #steps x bsz x inputs[0].shape[2:], ...)
+            grads = torch.autograd.grad(torch.unbind(outputs), interpolated_tpl)
+
+        # aggregates across all steps for each position
+        # total_grads: dim -> (bsz x #positions x inputs[0].shape[2:], ...)
+        total_grads = tuple(
+            torch.tensordot(
+                torch.tensor(step_sizes, dtype=grad.dtype, device=grad.device), grad, dims=([0], [1])
+            ).transpose(0, 1)
+            for grad in grads
+        )
+        if not self.multiplies_by_inputs:
+            return total_grads
+        return tuple(total_grad * delta.transpose(0, 1) for total_grad, delta in zip(total_grads, deltas_tpl))
+
     def _attribute(
         self,
         inputs: tuple[Tensor, ...],
@@ -14,9 +14,10 @@
 
 import logging
 from enum import Enum
-from typing import TYPE_CHECKING, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import torch
+from captum._utils.common import _expand_additional_forward_args
 from captum._utils.typing import TensorOrTupleOfTensorsGeneric
 from torch import nn
 from torch.utils.hooks import RemovableHandle
@@ -24,6 +25,7 @@ from torch.utils.hooks import RemovableHandle
 from ....utils import (
     StackFrame,
     find_block_stack,
+    get_output_chunk_hook,
     get_post_variable_assignment_hook,
     recursive_get_submodule,
     validate_indices,
@@ -36,6 +38,7 @@ from ....utils.typing import (
     OneOrMoreIndices,
     OneOrMoreIndicesDict,
 )
+from ..attribution_utils import get_auto_internal_batch_size
 
 if TYPE_CHECKING:
     from ....models import HuggingfaceModel
@@ -53,6 +56,11 @@ class ValueZeroingModule(Enum):
     ENCODER = "encoder"
 
 
+class ValueZeroingExecutionMode(Enum):
+    FORWARD = "forward"
+    BLOCK = "block"
+
+
 class ValueZeroing(InseqAttribution):
     """Value Zeroing method for feature attribution.
 
@@ -101,7 +109,7 @@ class ValueZeroing(InseqAttribution):
 
         def value_zeroing_forward_mid_hook(
             frame: StackFrame,
-            zeroed_token_index: Optional[int] = None,
+            zeroed_token_index: Union[int, list[int], None] = None,
             zeroed_units_indices: Optional[OneOrMoreIndices] = None,
             batch_size: int = 1,
         ) -> None:
@@ -110,11 +118,15 @@ class ValueZeroing(InseqAttribution):
                     f"Variable {varname} not found in the local frame."
                     f"Other variable names: {', '.join(frame.f_locals.keys())}"
                 )
-            # Zeroing value vectors corresponding to the given token index
+            # Zeroing value vectors corresponding to the given token index. If multiple indices are given, the batch
+            # is expected to be replicated once per index, and every replica zeroes a different index.
             if zeroed_token_index is not None:
+                zeroed_token_indices = zeroed_token_index
+                if isinstance(zeroed_token_index, int):
+                    zeroed_token_indices = [zeroed_token_index]
                 values_size = frame.f_locals[varname].size()
                 if len(values_size) == 3:  # Assume merged shape (bsz * num_heads, seq_len, hidden_size) e.g. Whisper
-                    values = frame.f_locals[varname].view(batch_size, -1, *values_size[1:])
+                    values = frame.f_locals[varname]
                 elif len(values_size) == 4:  # Assume per-head shape (bsz, num_heads, seq_len, hidden_size) e.g. GPT-2
                     values = frame.f_locals[varname].clone()
                 else:
@@ -123,17 +135,119 @@ class ValueZeroing(InseqAttribution):
                         "Supported shapes: (batch_size, num_heads, seq_len, hidden_size) or "
                         "(batch_size * num_heads, seq_len, hidden_size)"
                     )
-                zeroed_units_indices = validate_indices(values, 1, zeroed_units_indices).to(values.device)
-                zeroed_token_index = torch.tensor(zeroed_token_index, device=values.device)
-                # Mask heads corresponding to zeroed units and tokens corresponding to zeroed tokens
-                values[:, zeroed_units_indices, zeroed_token_index] = 0
-                if len(values_size) == 3:
-                    frame.f_locals[varname] = values.view(-1, *values_size[1:])
-                elif len(values_size) == 4:
-                    frame.f_locals[varname] = values
+                # values' dim -> (num_replicas, batch_size, num_heads, seq_len, hidden_size)
+                values = values.view(len(zeroed_token_indices), batch_size, -1, *values_size[-2:])
+                ValueZeroing._zero_values_(values, zeroed_token_indices, zeroed_units_indices)
+                frame.f_locals[varname] = values.view(values_size)
 
         return value_zeroing_forward_mid_hook
 
+    @staticmethod
+    def _zero_values_(
+        values: torch.Tensor,
+        zeroed_token_indices: list[int],
+        zeroed_units_indices: Optional[OneOrMoreIndices] = None,
+    ) -> None:
+        """Zeroes in-place the value vectors of shape ``(num_replicas, batch_size, num_heads, seq_len, hidden_size)``
+        of the given units, for a different token index in every replica.
+        """
+        zeroed_units_indices = validate_indices(values, 2, zeroed_units_indices).to(values.device)
+        units_mask = torch.zeros(values.size(2), dtype=torch.bool, device=values.device)
+        units_mask[zeroed_units_indices] = True
+        tokens_mask = torch.arange(values.size(3), device=values.device) == torch.tensor(
+            zeroed_token_indices, device=values.device
+        ).unsqueeze(-1)
+        # Mask heads corresponding to zeroed units and tokens corresponding to zeroed tokens
+        values.masked_fill_(units_mask[None, None, :, None, None] & tokens_mask[:, None, None, :, None], 0)
+
+    @staticmethod
+    def get_value_projection_zeroing_hook(num_units: int) -> Callable[..., torch.Tensor]:
+        """Returns a hook to zero the value vectors produced by the value projection of the attention mechanism.
+
+        Args:
+            num_units (:obj:`int`): The number of attention heads in which the projected values are split. For
+                grouped-query attention, this corresponds to the number of key-value heads.
+        """
+
+        def value_zeroing_projection_hook(
+            values: torch.Tensor,
+            zeroed_token_index: Union[int, list[int], None] = None,
+            zeroed_units_indices: Optional[OneOrMoreIndices] = None,
+            batch_size: int = 1,
+        ) -> torch.Tensor:
+            if zeroed_token_index is None:
+                return values
+            zeroed_token_indices = [zeroed_token_index] if isinstance(zeroed_token_index, int) else zeroed_token_index
+            values = values.clone()
+            # values' dim: (num_replicas * batch_size, seq_len, num_heads * hidden_size) ->
+            # (num_replicas, batch_size, num_heads, seq_len, hidden_size)
+            values_view = values.view(len(zeroed_token_indices), batch_size, values.size(1), num_units, -1)
+            ValueZeroing._zero_values_(values_view.transpose(2, 3), zeroed_token_indices, zeroed_units_indices)
+            return values
+
+        return value_zeroing_projection_hook
+
+    def get_value_zeroing_hook_handle(
+        self,
+        attention_module: nn.Module,
+        zeroed_token_index: Union[int, list[int], None] = None,
+        zeroed_units_indices: Optional[OneOrMoreIndices] = None,
+        batch_size: int = 1,
+    ) -> RemovableHandle:
+        """Registers a value zeroing hook on the given attention module. If the model configuration specifies a
+        ``value_projection``, values are zeroed by a native forward hook on the projection. Otherwise, the hook is set
+        after the last assignment of ``value_vector`` in the attention forward using
+        :func:`~inseq.utils.get_post_variable_assignment_hook`.
+
+        For grouped-query attention, the value projection produces the values of key-value heads, which are shared by
+        groups of query heads. Since zeroed units refer to query heads, the latter hook is used in this case whenever
+        a subset of heads is zeroed.
+        """
+        config = self.forward_func.config
+        if config.value_projection is not None:
+            # The value projection can be nested in a submodule of the attention module (e.g. attention.v_proj)
+            parent_name, _, projection_name = config.value_projection.rpartition(".")
+            projection_parent = recursive_get_submodule(attention_module, parent_name)
+            value_projection = None
+            if projection_parent is not None:
+                value_projection = recursive_get_submodule(projection_parent, projection_name)
+            if value_projection is None:
+                raise ValueError(f"Value projection {config.value_projection} not found in {attention_module}.")
+            num_heads = next(
+                (
+                    getattr(projection_parent, name)
+                    for name in ("num_heads", "num_attention_heads", "n_heads", "n_head")
+                    if hasattr(projection_parent, name)
+                ),
+                None,
+            )
+            if num_heads is None:
+                raise ValueError(
+                    f"Could not find the number of attention heads in {type(projection_parent).__name__}, which is "
+                    f"needed to zero the outputs of {config.value_projection}. Set value_projection=None in the model "
+                    "configuration to zero the value vectors in the attention forward instead."
+                )
+            num_kv_heads = getattr(projection_parent, "num_key_value_heads", num_heads)
+            if num_kv_heads == num_heads or zeroed_units_indices is None:
+                value_zeroing_hook = get_output_chunk_hook(
+                    hook_fn=self.get_value_projection_zeroing_hook(num_kv_heads),
+                    chunk_idx=config.value_projection_chunks - 1,
+                    num_chunks=config.value_projection_chunks,
+                    zeroed_token_index=zeroed_token_index,
+                    zeroed_units_indices=zeroed_units_indices,
+                    batch_size=batch_size,
+                )
+                return value_projection.register_forward_hook(value_zeroing_hook)
+        value_zeroing_hook = get_post_variable_assignment_hook(
+            module=attention_module,
+            varname=config.value_vector,
+            hook_fn=self.get_value_zeroing_hook(config.value_vector),
+            zeroed_token_index=zeroed_token_index,
+            zeroed_units_indices=zeroed_units_indices,
+            batch_size=batch_size,
+        )
+        return attention_module.register_forward_pre_hook(value_zeroing_hook)
+
     def get_states_extract_and_patch_hook(self, block_idx: int, hidden_state_idx: int = 0) -> Callable[..., None]:
         """Returns a hook to extract the produced hidden states (corrupted by value zeroing)
           and patch them with pre-computed clean states that will be passed onwards in the model forward.
@@ -145,13 +259,14 @@ class ValueZeroing(InseqAttribution):
 
         def states_extract_and_patch_forward_hook(module, args, output) -> None:
             self.corrupted_block_output_states[block_idx] = output[hidden_state_idx].clone().float().detach().cpu()
+            clean_states = self.clean_block_output_states[block_idx].to(output[hidden_state_idx].device)
+            # Clean states are repeated for every replica of the batch when zeroing multiple tokens at once
+            num_replicas = output[hidden_state_idx].size(0) // clean_states.size(0)
+            if num_replicas > 1:
+                clean_states = clean_states.repeat(num_replicas, *([1] * (clean_states.ndim - 1)))
 
             # Rebuild the output tuple patching the clean states at the place of the corrupted ones
-            output = (
-                output[:hidden_state_idx]
-                + (self.clean_block_output_states[block_idx].to(output[hidden_state_idx].device),)
-                + output[hidden_state_idx + 1 :]
-            )
+            output = output[:hidden_state_idx] + (clean_states,) + output[hidden_state_idx + 1 :]
             return output
 
         return states_extract_and_patch_forward_hook
@@ -160,6 +275,205 @@ class ValueZeroing(InseqAttribution):
     def has_convergence_delta() -> bool:
         return False
 
+    @staticmethod
+    def _repeat_batch(args: tuple, num_replicas: int) -> tuple:
+        """Repeats all tensors in ``args`` ``num_replicas`` times along the batch dimension."""
+        if num_replicas == 1:
+            return args
+        return _expand_additional_forward_args(args, num_replicas)
+
+    @classmethod
+    def _repeat_block_args(cls, obj: Any, batch_size: int, num_replicas: int) -> Any:
+        """Repeats all tensors with a leading batch dimension in the (possibly nested) block arguments ``obj``
+        ``num_replicas`` times, leaving unbatched tensors (e.g. cache positions, broadcastable masks) untouched.
+        """
+        if isinstance(obj, torch.Tensor):
+            if num_replicas > 1 and obj.ndim > 1 and obj.size(0) == batch_size:
+                return obj.repeat(num_replicas, *([1] * (obj.ndim - 1)))
+            return obj
+        if isinstance(obj, (tuple, list)):
+            return type(obj)(cls._repeat_block_args(el, batch_size, num_replicas) for el in obj)
+        if isinstance(obj, dict):
+            return {k: cls._repeat_block_args(v, batch_size, num_replicas) for k, v in obj.items()}
+        return obj
+
+    def get_block_inputs(
+        self,
+        modules: nn.ModuleList,
+        root_module: nn.Module,
+        inputs: TensorOrTupleOfTensorsGeneric,
+        additional_forward_args: TensorOrTupleOfTensorsGeneric,
+        last_hidden_state: EmbeddingsTensor,
+    ) -> Optional[tuple[list[tuple[tuple, dict]], list[nn.Module]]]:
+        """Runs a clean forward pass storing the arguments passed to every block of ``modules``, so that blocks can
+        later be re-run in isolation. Modules applied to the output of the last block before it is returned as a
+        hidden state (e.g. a final LayerNorm) are identified as the children of the block stack parent that are
+        called after the last block.
+
+        Args:
+            modules (:obj:`nn.ModuleList`): The stack of transformer blocks.
+            root_module (:obj:`nn.Module`): The module containing the block stack.
+            last_hidden_state (:obj:`torch.Tensor`): The clean last hidden state produced by the model, used to
+                check that post-block modules were identified correctly.
+
+        Returns:
+            :obj:`tuple`: The list of ``(args, kwargs)`` passed to every block and the list of post-block modules, or
+            ``None`` if the outputs of the last block could not be matched to ``last_hidden_state``.
+        """
+        parent = next(module for module in root_module.modules() if any(c is modules for c in module.children()))
+        block_calls: list[tuple[tuple, dict]] = [None] * len(modules)
+        called_children: list[nn.Module] = []
+        last_block_output = []
+
+        def get_block_input_hook(block_idx: int) -> Callable[..., None]:
+            def block_input_forward_pre_hook(module, args, kwargs) -> None:
+                block_calls[block_idx] = (args, kwargs)
+                called_children.append(module)
+
+            return block_input_forward_pre_hook
+
+        def child_forward_hook(module, args, output) -> None:
+            called_children.append(module)
+
+        def last_block_output_hook(module, args, output) -> None:
+            last_block_output.append(output[0] if isinstance(output, tuple) else output)
+
+        handles = [
+            block.register_forward_pre_hook(get_block_input_hook(block_idx), with_kwargs=True)
+            for block_idx, block in enumerate(modules)
+        ]
+        handles.append(modules[-1].register_forward_hook(last_block_output_hook))
+        handles += [
+            child.register_forward_hook(child_forward_hook) for child in parent.children() if child is not modules
+        ]
+        try:
+            with torch.no_grad():
+                self.forward_func.forward_with_output(*inputs, *additional_forward_args, use_cache=False)
+        finally:
+            for handle in handles:
+                handle.remove()
+        last_block_pos = max(idx for idx, module in enumerate(called_children) if module is modules[-1])
+        post_block_modules = called_children[last_block_pos + 1 :]
+        with torch.no_grad():
+            out = last_block_output[-1]
+            for module in post_block_modules:
+                out = module(out)
+        if out.shape != last_hidden_state.shape or not torch.allclose(
+            out.float().cpu(), last_hidden_state.float().cpu(), atol=1e-4
+        ):
+            return None
+        return block_calls, post_block_modules
+
+    def get_auto_zeroing_batch_size(self, batch_size: int, seq_len: int, num_tokens: int) -> int:
+        """Chooses the number of token indices zeroed in a single forward pass from the memory available on the
+        model device, using the same memory estimate used for the ``internal_batch_size`` of integrated gradients.
+
+        Args:
+            batch_size (:obj:`int`): The size of the attributed batch.
+            seq_len (:obj:`int`): The length of model inputs, including the source for encoder-decoder models.
+            num_tokens (:obj:`int`): The number of token indices to be zeroed.
+        """
+        max_sequences = get_auto_internal_batch_size(
+            self.forward_func, num_examples=batch_size, seq_len=seq_len, n_steps=num_tokens
+        )
+        if max_sequences is None:
+            return num_tokens
+        return max_sequences // batch_size
+
+    def _run_zeroed_forward(
+        self,
+        inputs: TensorOrTupleOfTensorsGeneric,
+        additional_forward_args: TensorOrTupleOfTensorsGeneric,
+        mode: str,
+        num_layers: int,
+        num_replicas: int,
+    ) -> None:
+        """Runs a full forward pass with active value zeroing hooks. Fills ``self.corrupted_block_output_states`` with
+        corrupted states across layers when zeroing the specified token indices.
+        """
+        output = self.forward_func.forward_with_output(
+            *self._repeat_batch(inputs, num_replicas),
+            *self._repeat_batch(additional_forward_args, num_replicas),
+            output_hidden_states=True,
+        )
+        # Extract last layer states directly from the model outputs
+        # This allows us to handle the presence of additional transformations (e.g. LayerNorm, Dropout)
+        # in the last layer automatically.
+        corrupted_states_dict = self.forward_func.get_hidden_states_dict(output)
+        corrupted_last_hidden_state = corrupted_states_dict[f"{mode}_hidden_states"][:, -1, ...].clone().detach().cpu()
+        self.corrupted_block_output_states[num_layers - 1] = corrupted_last_hidden_state
+
+    def _run_zeroed_blocks(
+        self,
+        modules: nn.ModuleList,
+        block_calls: list[tuple[tuple, dict]],
+        post_block_modules: list[nn.Module],
+        zeroed_blocks: list[int],
+        batch_size: int,
+        num_replicas: int,
+    ) -> None:
+        """Re-runs every block with active value zeroing hooks in isolation, starting from its clean inputs. Fills
+        ``self.corrupted_block_output_states`` with corrupted states across layers when zeroing the specified token
+        indices. Blocks without zeroed units produce clean states and are skipped.
+        """
+        for block_idx, block in enumerate(modules):
+            if block_idx not in zeroed_blocks:
+                clean_states = self.clean_block_output_states[block_idx]
+                self.corrupted_block_output_states[block_idx] = clean_states.float().repeat(
+                    num_replicas, *([1] * (clean_states.ndim - 1))
+                )
+                continue
+            args, kwargs = self._repeat_block_args(block_calls[block_idx], batch_size, num_replicas)
+            output = block(*args, **kwargs)
+            output = output[0] if isinstance(output, tuple) else output
+            if block_idx == len(modules) - 1:
+                for module in post_block_modules:
+                    output = module(output)
+            self.corrupted_block_output_states[block_idx] = output.float().detach().cpu()
+
+    def _prepare_execution_mode(
+        self,
+        execution_mode: str,
+        modules: nn.ModuleList,
+        root_module: nn.Module,
+        inputs: TensorOrTupleOfTensorsGeneric,
+        additional_forward_args: TensorOrTupleOfTensorsGeneric,
+        last_hidden_state: EmbeddingsTensor,
+    ) -> tuple[Optional[tuple[list[tuple[tuple, dict]], list[nn.Module]]], list[RemovableHandle]]:
+        """Sets up the computation of corrupted states for the given execution mode.
+
+        Returns:
+            :obj:`tuple`: The block inputs returned by :meth:`get_block_inputs` if blocks are re-run in isolation, or
+            ``None`` if the full model is run, and the handles of the hooks registered on the blocks to extract and
+            patch their states in the latter case.
+        """
+        block_inputs = None
+        if execution_mode == ValueZeroingExecutionMode.BLOCK.value:
+            block_inputs = self.get_block_inputs(
+                modules, root_module, inputs, additional_forward_args, last_hidden_state
+            )
+            if block_inputs is None:
+                logger.warning(
+                    "The outputs of the last block could not be matched to the last hidden state of the model. "
+                    f"Falling back to the {ValueZeroingExecutionMode.FORWARD.value} execution mode."
+                )
+        elif execution_mode != ValueZeroingExecutionMode.FORWARD.value:
+            raise ValueError(
+                f"Execution mode {execution_mode} not available. "
+                f"Available modes: {','.join(m.value for m in ValueZeroingExecutionMode)}"
+            )
+        # State extraction hooks can be registered only once since they are token-independent
+        # Skip last block since its states are not used raw, but may have further transformations applied to them
+        # (e.g. LayerNorm, Dropout). These are extracted separately from the model outputs.
+        states_extraction_hook_handles: list[RemovableHandle] = []
+        if block_inputs is None:
+            for block_idx in range(len(modules) - 1):
+                states_extract_and_patch_hook = self.get_states_extract_and_patch_hook(block_idx, hidden_state_idx=0)
+                states_extraction_hook_handles.append(
+                    modules[block_idx].register_forward_hook(states_extract_and_patch_hook)
+                )
+        return block_inputs, states_extraction_hook_handles
+
     def compute_modules_post_zeroing_similarity(
         self,
         inputs: TensorOrTupleOfTensorsGeneric,
@@ -172,6 +486,8 @@ class ValueZeroing(InseqAttribution):
         zeroed_units_indices: Optional[OneOrMoreIndicesDict] = None,
         min_score_threshold: float = 1e-5,
         use_causal_mask: bool = False,
+        zeroing_batch_size: int = 1,
+        execution_mode: str = ValueZeroingExecutionMode.FORWARD.value,
     ) -> MultiLayerScoreTensor:
         """Given a ``nn.ModuleList``, computes the similarity between the clean and corrupted states for each block.
 
@@ -197,17 +513,26 @@ class ValueZeroing(InseqAttribution):
             min_score_threshold (:obj:`float`, optional): The minimum score threshold to consider when computing the
                 similarity. Default: 1e-5.
             use_causal_mask (:obj:`bool`, optional): Whether a causal mask is applied to zeroing scores Default: False.
+            zeroing_batch_size (:obj:`int`, optional): The number of token indices zeroed in a single forward pass.
+                The batch is replicated once per zeroed index along the batch dimension, and every replica zeroes a
+                different index. Default: 1.
+            execution_mode (:obj:`str`, optional): How corrupted states are computed. If ``"forward"``, the full
+                model is run for every group of zeroed tokens, patching block outputs with their clean counterparts.
+                If ``"block"``, the arguments of every block are stored during a single clean forward pass, and every
+                block is then re-run in isolation, skipping embeddings, output projections and blocks without zeroed
+                units. Default: "forward".
 
         Returns:
             :obj:`MultiLayerScoreTensor`: A tensor of shape ``[batch_size, seq_len, num_layer]`` containing distances
                 (1 - similarity score) between original and corrupted states for each layer.
         """
         if mode == ValueZeroingModule.DECODER.value:
-            modules: nn.ModuleList = find_block_stack(self.forward_func.get_decoder())
+            root_module = self.forward_func.get_decoder()
         elif mode == ValueZeroingModule.ENCODER.value:
-            modules: nn.ModuleList = find_block_stack(self.forward_func.get_encoder())
+            root_module = self.forward_func.get_encoder()
         else:
             raise NotImplementedError(f"Mode {mode} not implemented for value zeroing.")
+        modules: nn.ModuleList = find_block_stack(root_module)
         if attributed_seq_len is None:
             attributed_seq_len = hidden_states.size(2)
         batch_size = hidden_states.size(0)
@@ -227,21 +552,19 @@ class ValueZeroing(InseqAttribution):
         # Hooks:
         #   1. states_extract_and_patch_hook on the transformer block stores corrupted states and force clean states
         #      as the output of the block forward pass, i.e. the zeroing is done independently across layers.
+        #      Not needed when blocks are re-run in isolation from their clean inputs.
         #   2. value_zeroing_hook on the attention module performs the value zeroing by replacing the "value" tensor
         #      during the forward (name is config-dependent) with a zeroed version for the specified token index.
-        #
-        # State extraction hooks can be registered only once since they are token-independent
-        # Skip last block since its states are not used raw, but may have further transformations applied to them
-        # (e.g. LayerNorm, Dropout). These are extracted separately from the model outputs.
-        states_extraction_hook_handles: list[RemovableHandle] = []
-        for block_idx in range(len(modules) - 1):
-            states_extract_and_patch_hook = self.get_states_extract_and_patch_hook(block_idx, hidden_state_idx=0)
-            states_extraction_hook_handles.append(
-                modules[block_idx].register_forward_hook(states_extract_and_patch_hook)
-            )
-        # Zeroing is done for every token in the sequence separately (O(n) complexity)
-        for token_idx in range(attributed_seq_len):
+        block_inputs, states_extraction_hook_handles = self._prepare_execution_mode(
+            execution_mode, modules, root_module, inputs, additional_forward_args, hidden_states[:, -1, ...]
+        )
+        # Zeroing is done for every token in the sequence separately (O(n) complexity), zeroing_batch_size tokens at
+        # a time in separate replicas of the batch.
+        for start_idx in range(0, attributed_seq_len, zeroing_batch_size):
+            zeroed_token_indices = list(range(start_idx, min(start_idx + zeroing_batch_size, attributed_seq_len)))
+            num_replicas = len(zeroed_token_indices)
             value_zeroing_hook_handles: list[RemovableHandle] = []
+            zeroed_blocks: list[int] = []
             # Value zeroing hooks are registered for every token separately since they are token-dependent
             for block_idx, block in enumerate(modules):
                 attention_module = recursive_get_submodule(block, attention_module_name)
@@ -253,41 +576,35 @@ class ValueZeroing(InseqAttribution):
                     zeroed_units_indices_block = zeroed_units_indices[block_idx]
                 else:
                     zeroed_units_indices_block = zeroed_units_indices
-                value_zeroing_hook = get_post_variable_assignment_hook(
-                    module=attention_module,
-                    varname=self.forward_func.config.value_vector,
-                    hook_fn=self.get_value_zeroing_hook(self.forward_func.config.value_vector),
-                    zeroed_token_index=token_idx,
+                value_zeroing_hook_handle = self.get_value_zeroing_hook_handle(
+                    attention_module,
+                    zeroed_token_index=zeroed_token_indices,
                     zeroed_units_indices=zeroed_units_indices_block,
                     batch_size=batch_size,
                 )
-                value_zeroing_hook_handle = attention_module.register_forward_pre_hook(value_zeroing_hook)
                 value_zeroing_hook_handles.append(value_zeroing_hook_handle)
+                zeroed_blocks.append(block_idx)
 
-            # Run forward pass with hooks. Fills self.corrupted_hidden_states with corrupted states across layers
-            # when zeroing the specified token index.
             with torch.no_grad():
-                output = self.forward_func.forward_with_output(
-                    *inputs, *additional_forward_args, output_hidden_states=True
-                )
-                # Extract last layer states directly from the model outputs
-                # This allows us to handle the presence of additional transformations (e.g. LayerNorm, Dropout)
-                # in the last layer automatically.
-                corrupted_states_dict = self.forward_func.get_hidden_states_dict(output)
-                corrupted_decoder_last_hidden_state = (
-                    corrupted_states_dict[f"{mode}_hidden_states"][:, -1, ...].clone().detach().cpu()
-                )
-                self.corrupted_block_output_states[len(modules) - 1] = corrupted_decoder_last_hidden_state
+                if block_inputs is None:
+                    self._run_zeroed_forward(inputs, additional_forward_args, mode, num_layers, num_replicas)
+                else:
+                    self._run_zeroed_blocks(modules, *block_inputs, zeroed_blocks, batch_size, num_replicas)
             for handle in value_zeroing_hook_handles:
                 handle.remove()
             for block_idx in range(len(modules)):
-                similarity_scores = self.SIMILARITY_METRICS[similarity_metric](
-                    self.clean_block_output_states[block_idx].float(), self.corrupted_block_output_states[block_idx]
+                # Corrupted states of every replica, in the same order as zeroed_token_indices
+                corrupted_states = self.corrupted_block_output_states[block_idx].view(
+                    num_replicas, batch_size, *self.corrupted_block_output_states[block_idx].shape[1:]
                 )
-                if use_causal_mask:
-                    all_scores[:, block_idx, token_idx:, token_idx] = 1 - similarity_scores[:, token_idx:]
-                else:
-                    all_scores[:, block_idx, :, token_idx] = 1 - similarity_scores
+                for token_idx, corrupted_token_states in zip(zeroed_token_indices, corrupted_states):
+                    similarity_scores = self.SIMILARITY_METRICS[similarity_metric](
+                        self.clean_block_output_states[block_idx].float(), corrupted_token_states
+                    )
+                    if use_causal_mask:
+                        all_scores[:, block_idx, token_idx:, token_idx] = 1 - similarity_scores[:, token_idx:]
+                    else:
+                        all_scores[:, block_idx, :, token_idx] = 1 - similarity_scores
             self.corrupted_block_output_states = {}
         for handle in states_extraction_hook_handles:
             handle.remove()
@@ -313,6 +630,8 @@ class ValueZeroing(InseqAttribution):
         decoder_hidden_states: Optional[MultiLayerEmbeddingsTensor] = None,
         output_decoder_self_scores: bool = True,
         output_encoder_self_scores: bool = True,
+        zeroing_batch_size: Union[int, str] = "auto",
+        execution_mode: str = ValueZeroingExecutionMode.FORWARD.value,
     ) -> TensorOrTupleOfTensorsGeneric:
         """Perform attribution using the Value Zeroing method.
 
@@ -340,6 +659,12 @@ class ValueZeroing(InseqAttribution):
                 if target-side attribution is requested using `attribute_target=True`. Default: True.
             output_encoder_self_scores (:obj:`bool`, optional): Whether to produce scores derived from zeroing the
                 encoder self-attention value vectors in encoder-decoder models. Default: True.
+            zeroing_batch_size (:obj:`int` or :obj:`str`, optional): The number of token indices zeroed in a single
+                forward pass, each one in a separate replica of the batch. If ``"auto"``, it is chosen from the memory
+                available on the model device. Default: "auto".
+            execution_mode (:obj:`str`, optional): If ``"forward"``, corrupted states are computed by running the full
+                model for every group of zeroed tokens. If ``"block"``, every transformer block is re-run in isolation
+                from its clean inputs, stored during a single clean forward pass. Default: "forward".
 
         Returns:
             `TensorOrTupleOfTensorsGeneric`: Attribution outputs for source-only or source + target feature attribution
@@ -349,6 +674,12 @@ class ValueZeroing(InseqAttribution):
                 f"Similarity metric {similarity_metric} not available."
                 f"Available metrics: {','.join(self.SIMILARITY_METRICS.keys())}"
             )
+        if zeroing_batch_size == "auto":
+            hidden_states = (encoder_hidden_states, decoder_hidden_states)
+            seq_lens = [states.size(2) for states in hidden_states if states is not None]
+            zeroing_batch_size = self.get_auto_zeroing_batch_size(
+                batch_size=decoder_hidden_states.size(0), seq_len=sum(seq_lens), num_tokens=max(seq_lens)
+            )
         decoder_scores = None
         if not self.forward_func.is_encoder_decoder or output_decoder_self_scores or len(inputs) > 1:
             decoder_scores = self.compute_modules_post_zeroing_similarity(
@@ -360,6 +691,8 @@ class ValueZeroing(InseqAttribution):
                 mode=ValueZeroingModule.DECODER.value,
                 zeroed_units_indices=decoder_zeroed_units_indices,
                 use_causal_mask=True,
+                zeroing_batch_size=zeroing_batch_size,
+                execution_mode=execution_mode,
             )
         # Encoder-decoder models also perform zeroing on the encoder self-attention and cross-attention values
         # Adapted from https://github.com/hmohebbi/ContextMixingASR/blob/master/scoring/valueZeroing.py
@@ -374,6 +707,8 @@ class ValueZeroing(InseqAttribution):
                     similarity_metric=similarity_metric,
                     mode=ValueZeroingModule.ENCODER.value,
                     zeroed_units_indices=encoder_zeroed_units_indices,
+                    zeroing_batch_size=zeroing_batch_size,
+                    execution_mode=execution_mode,
                 )
             cross_scores = self.compute_modules_post_zeroing_similarity(
                 inputs=inputs,
@@ -384,6 +719,8 @@ class ValueZeroing(InseqAttribution):
                 similarity_metric=similarity_metric,
                 mode=ValueZeroingModule.DECODER.value,
                 zeroed_units_indices=cross_zeroed_units_indices,
+                zeroing_batch_size=zeroing_batch_size,
+                execution_mode=execution_mode,
             )
             return encoder_scores, cross_scores, decoder_scores
         elif encoder_zeroed_units_indices is not None or cross_zeroed_units_indices is not None:
@@ -1,5 +1,5 @@
 import logging
-from typing import Any
+from typing import Any, Union
 
 from captum.attr import Occlusion
 
@@ -103,17 +103,22 @@ class LimeAttribution(PerturbationAttributionRegistry):
         self,
         attribute_fn_main_args: dict[str, Any],
         attribution_args: dict[str, Any] = {},
-    ) -> GranularFeatureAttributionStepOutput:
-        if len(attribute_fn_main_args["inputs"]) > 1:
+    ) -> Union[CoarseFeatureAttributionStepOutput, GranularFeatureAttributionStepOutput]:
+        if len(attribute_fn_main_args["inputs"]) > 1 and not self.method.use_vectorized_sampling:
             # Captum's `_evaluate_batch` function for LIME does not account for multiple inputs when encoder-decoder
             # models and attribute_target=True are used. The model output is of length two and if the inputs are either
             # of length one (list containing a tuple) or of length two (tuple unpacked from the list), an error is
-            # raised. A workaround will be added soon.
+            # raised. Only the default sampling functions support multiple inputs.
             raise NotImplementedError(
-                "LIME attribution with attribute_target=True currently not supported for encoder-decoder models."
+                "LIME attribution with attribute_target=True is not supported for encoder-decoder models when using"
+                " custom sampling functions."
             )
         out = super().attribute_step(attribute_fn_main_args, attribution_args)
-        return GranularFeatureAttributionStepOutput(
+        # Surrogates fitted in the token-level interpretable space produce a single score per token
+        step_output_cls = GranularFeatureAttributionStepOutput
+        if self.method.surrogate is not None and self.method.use_vectorized_sampling:
+            step_output_cls = CoarseFeatureAttributionStepOutput
+        return step_output_cls(
             source_attributions=out.source_attributions,
             target_attributions=out.target_attributions,
             sequence_scores=out.sequence_scores,
@@ -163,6 +168,12 @@ class ValueZeroingAttribution(PerturbationAttributionRegistry):
             if target-side attribution is requested using `attribute_target=True`. Default: True.
         output_encoder_self_scores (:obj:`bool`, optional): Whether to produce scores derived from zeroing the
             encoder self-attention value vectors in encoder-decoder models. Default: True.
+        zeroing_batch_size (:obj:`int` or :obj:`str`, optional): The number of token indices zeroed in a single forward
+            pass, each one in a separate replica of the attributed batch. If ``"auto"``, it is chosen from the memory
+            available on the model device. Default: "auto".
+        execution_mode (:obj:`str`, optional): If ``"forward"``, corrupted states are computed by running the full
+            model for every group of zeroed tokens. If ``"block"``, every transformer block is re-run in isolation
+            from its clean inputs, stored during a single clean forward pass. Default: "forward".
 
     Returns:
         :class:`~inseq.data.MultiDimensionalFeatureAttributionStepOutput`: The final dimension returned by the method
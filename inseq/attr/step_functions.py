@@ -1,5 +1,5 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from inspect import signature
 from typing import TYPE_CHECKING, Any, Optional, Protocol, Union
 
@@ -7,10 +7,15 @@ import torch
 import torch.nn.functional as F
 from transformers.modeling_outputs import ModelOutput
 
-from ..data import FeatureAttributionInput
+from ..data import DecoderOnlyBatch, EncoderDecoderBatch, FeatureAttributionInput, ForwardCache
 from ..data.aggregation_functions import DEFAULT_ATTRIBUTION_AGGREGATE_DICT
-from ..utils import extract_signature_args, filter_logits, top_p_logits_mask
-from ..utils.contrast_utils import _get_contrast_inputs, _setup_contrast_args, contrast_fn_docstring
+from ..utils import extract_signature_args, filter_logits, js_divergence, kl_divergence, top_p_logits_mask
+from ..utils.contrast_utils import (
+    _get_contrast_forward_output,
+    _get_contrast_inputs,
+    _setup_contrast_args,
+    contrast_fn_docstring,
+)
 from ..utils.typing import EmbeddingsTensor, IdsTensor, SingleScorePerStepTensor, TargetIdsTensor
 
 if TYPE_CHECKING:
@@ -47,6 +52,9 @@ class StepFunctionBaseArgs:
             for encoder-decoder models.
         decoder_attention_mask (:obj:`torch.Tensor`): Tensor of attention mask of decoder input tokens of size
             :obj:`(batch_size, target_seq_len)`, used for masking padding tokens in the decoder input.
+        forward_cache (:class:`~inseq.data.ForwardCache`, `optional`): Cache of model states across generation steps,
+            used by contrastive step functions to compute contrastive forward passes incrementally. Available only for
+            step scores computed with ``use_forward_cache=True``.
     """
 
     attribution_model: "AttributionModel"
@@ -63,11 +71,12 @@ class StepFunctionEncoderDecoderArgs(StepFunctionBaseArgs):
     encoder_input_ids: IdsTensor
     encoder_input_embeds: EmbeddingsTensor
     encoder_attention_mask: IdsTensor
+    forward_cache: Optional[ForwardCache] = None
 
 
 @dataclass
 class StepFunctionDecoderOnlyArgs(StepFunctionBaseArgs):
-    pass
+    forward_cache: Optional[ForwardCache] = None
 
 
 StepFunctionArgs = Union[StepFunctionEncoderDecoderArgs, StepFunctionDecoderOnlyArgs]
@@ -113,7 +122,8 @@ def crossentropy_fn(args: StepFunctionArgs) -> SingleScorePerStepTensor:
     See: https://github.com/ZurichNLP/nmtscore/blob/master/src/nmtscore/models/m2m100.py#L99.
     """
     logits = args.attribution_model.output2logits(args.forward_output)
-    return F.cross_entropy(logits, args.target_ids.to(logits.device), reduction="none").squeeze(-1)
+    target_ids = args.target_ids.reshape(logits.shape[0]).to(logits.device)
+    return F.cross_entropy(logits, target_ids, reduction="none")
 
 
 def perplexity_fn(args: StepFunctionArgs) -> SingleScorePerStepTensor:
@@ -196,6 +206,41 @@ def pcxmi_fn(
     return -torch.log2(torch.div(original_probs, contrast_probs))
 
 
+def _get_filtered_contrast_logprobs(
+    args: StepFunctionArgs,
+    contrast_sources: Optional[FeatureAttributionInput] = None,
+    contrast_targets: Optional[FeatureAttributionInput] = None,
+    contrast_targets_alignments: Optional[list[list[tuple[int, int]]]] = None,
+    top_k: int = 0,
+    top_p: float = 1.0,
+    min_tokens_to_keep: int = 1,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Returns the log-probabilities of the original and contrastive next token distributions, filtered with the same
+    top-k and top-p mask computed from both distributions.
+    """
+    original_logits: torch.Tensor = args.attribution_model.output2logits(args.forward_output)
+    contrast_inputs = _get_contrast_inputs(
+        args=args,
+        contrast_sources=contrast_sources,
+        contrast_targets=contrast_targets,
+        contrast_targets_alignments=contrast_targets_alignments,
+        return_contrastive_target_ids=False,
+        return_contrastive_batch=True,
+    )
+    c_forward_output = _get_contrast_forward_output(
+        args, contrast_inputs.batch, contrast_sources, contrast_targets, contrast_targets_alignments
+    )
+    contrast_logits: torch.Tensor = args.attribution_model.output2logits(c_forward_output).to(original_logits.device)
+    filtered_original_logits, filtered_contrast_logits = filter_logits(
+        original_logits=original_logits,
+        contrast_logits=contrast_logits,
+        top_p=top_p,
+        top_k=top_k,
+        min_tokens_to_keep=min_tokens_to_keep,
+    )
+    return F.log_softmax(filtered_original_logits, dim=-1), F.log_softmax(filtered_contrast_logits, dim=-1)
+
+
 @contrast_fn_docstring()
 def kl_divergence_fn(
     args: StepFunctionArgs,
@@ -225,34 +270,44 @@ def kl_divergence_fn(
             "Using KL divergence as attribution target might lead to unexpected results, depending on the attribution"
             "method used. Use --contrast_force_inputs in the model.attribute call to proceed."
         )
-    original_logits: torch.Tensor = args.attribution_model.output2logits(args.forward_output)
-    contrast_inputs = _get_contrast_inputs(
-        args=args,
-        contrast_sources=contrast_sources,
-        contrast_targets=contrast_targets,
-        contrast_targets_alignments=contrast_targets_alignments,
-        return_contrastive_target_ids=False,
-        return_contrastive_batch=True,
-    )
-    c_forward_output = args.attribution_model.get_forward_output(
-        contrast_inputs.batch, use_embeddings=args.attribution_model.is_encoder_decoder
+    original_logprobs, contrast_logprobs = _get_filtered_contrast_logprobs(
+        args, contrast_sources, contrast_targets, contrast_targets_alignments, top_k, top_p, min_tokens_to_keep
     )
-    contrast_logits: torch.Tensor = args.attribution_model.output2logits(c_forward_output).to(original_logits.device)
-    filtered_original_logits, filtered_contrast_logits = filter_logits(
-        original_logits=original_logits,
-        contrast_logits=contrast_logits,
-        top_p=top_p,
-        top_k=top_k,
-        min_tokens_to_keep=min_tokens_to_keep,
-    )
-    filtered_original_logprobs = F.log_softmax(filtered_original_logits, dim=-1)
-    filtered_contrast_logprobs = F.log_softmax(filtered_contrast_logits, dim=-1)
-    kl_divergence = torch.zeros(filtered_original_logprobs.size(0))
-    for i in range(filtered_original_logits.size(0)):
-        kl_divergence[i] = F.kl_div(
-            filtered_contrast_logprobs[i], filtered_original_logprobs[i], reduction="sum", log_target=True
+    return kl_divergence(original_logprobs, contrast_logprobs)
+
+
+@contrast_fn_docstring()
+def js_divergence_fn(
+    args: StepFunctionArgs,
+    contrast_sources: Optional[FeatureAttributionInput] = None,
+    contrast_targets: Optional[FeatureAttributionInput] = None,
+    contrast_targets_alignments: Optional[list[list[tuple[int, int]]]] = None,
+    top_k: int = 0,
+    top_p: float = 1.0,
+    min_tokens_to_keep: int = 1,
+    contrast_force_inputs: bool = False,
+) -> SingleScorePerStepTensor:
+    """Compute the Jensen-Shannon divergence between the next token distributions given original and contrastive
+    input options. Unlike the KL divergence, the JS divergence is symmetric and bounded by :math:`\\log 2`.
+
+    Args:
+        top_k (:obj:`int`): If set to a value > 0, only the top :obj:`top_k` tokens will be considered for
+            computing the JS divergence. Defaults to :obj:`0` (no top-k selection).
+        top_p (:obj:`float`): If set to a value > 0 and < 1, only the tokens with cumulative probability above
+            :obj:`top_p` will be considered for computing the JS divergence. Defaults to :obj:`1.0` (no filtering),
+            applied before :obj:`top_k` filtering.
+        min_tokens_to_keep (:obj:`int`): Minimum number of tokens to keep with :obj:`top_p` filtering. Defaults to
+            :obj:`1`.
+    """
+    if not contrast_force_inputs and args.is_attributed_fn:
+        raise RuntimeError(
+            "Using JS divergence as attribution target might lead to unexpected results, depending on the attribution"
+            " method used. Use --contrast_force_inputs in the model.attribute call to proceed."
         )
-    return kl_divergence
+    original_logprobs, contrast_logprobs = _get_filtered_contrast_logprobs(
+        args, contrast_sources, contrast_targets, contrast_targets_alignments, top_k, top_p, min_tokens_to_keep
+    )
+    return js_divergence(original_logprobs, contrast_logprobs)
 
 
 @contrast_fn_docstring()
@@ -334,10 +389,72 @@ def in_context_pvi_fn(
     return -orig_logprob + contrast_logprob
 
 
+def _add_embeddings_noise(batch: Union[DecoderOnlyBatch, EncoderDecoderBatch], noise_std: float) -> None:
+    """Adds Gaussian noise to the input embeddings of the batch in place, scaled by their standard deviation."""
+    if isinstance(batch, EncoderDecoderBatch):
+        embeddings = [batch.sources.embedding, batch.targets.embedding]
+    else:
+        embeddings = [batch.embedding]
+    for embedding in embeddings:
+        embeds = embedding.input_embeds
+        embedding.input_embeds = embeds + torch.randn_like(embeds) * noise_std * embeds.detach().std()
+
+
+def get_ensemble_probs(
+    args: StepFunctionArgs,
+    n_samples: int,
+    logprob: bool = False,
+    use_dropout: bool = False,
+    noise_std: float = 0.0,
+    max_batch_size: Optional[int] = None,
+) -> torch.Tensor:
+    """Computes the probabilities of target ids for an ensemble of noisy predictions. The batch is repeated
+    :obj:`n_samples` times along the batch dimension, so that all predictions are computed with a single forward pass.
+
+    Args:
+        n_samples (:obj:`int`): The number of noisy predictions in the ensemble.
+        logprob (:obj:`bool`, `optional`): Whether to return log-probabilities instead of probabilities.
+        use_dropout (:obj:`bool`, `optional`): Whether to enable dropout layers (MC Dropout) during the forward pass.
+            The original training mode of all model modules is restored afterwards.
+        noise_std (:obj:`float`, `optional`): If > 0, Gaussian noise with a standard deviation of :obj:`noise_std`
+            times the one of the input embeddings is added to the input embeddings of every prediction.
+        max_batch_size (:obj:`int`, `optional`): Maximum number of sequences per forward pass. If set, the ensemble is
+            computed in multiple forward passes over chunks of repeated sequences to limit memory usage.
+
+    Returns:
+        :obj:`torch.Tensor`: Tensor of size :obj:`(n_samples, batch_size)` containing the scores of every prediction.
+    """
+    attribution_model = args.attribution_model
+    batch = attribution_model.formatter.convert_args_to_batch(args)
+    batch_size = args.decoder_input_ids.size(0)
+    target_ids = args.target_ids.reshape(-1)
+    samples_per_pass = n_samples if max_batch_size is None else max(1, max_batch_size // batch_size)
+    use_embeddings = attribution_model.is_encoder_decoder or noise_std > 0
+    training_modes = {module: module.training for module in attribution_model.modules()}
+    if use_dropout:
+        # Important: must be in train mode to ensure noise for MCD
+        attribution_model.train()
+    probs = []
+    try:
+        for start_idx in range(0, n_samples, samples_per_pass):
+            curr_samples = min(samples_per_pass, n_samples - start_idx)
+            repeated_batch = batch.repeat_batch(curr_samples)
+            if noise_std > 0:
+                _add_embeddings_noise(repeated_batch, noise_std)
+            output = attribution_model.get_forward_output(repeated_batch, use_embeddings=use_embeddings)
+            repeated_args = replace(args, forward_output=output, target_ids=target_ids.repeat(curr_samples))
+            probs.append(probability_fn(repeated_args, logprob=logprob).reshape(curr_samples, batch_size))
+    finally:
+        for module, training in training_modes.items():
+            module.training = training
+    return torch.cat(probs)
+
+
 def mc_dropout_prob_avg_fn(
     args: StepFunctionArgs,
     n_mcd_steps: int = 5,
     logprob: bool = False,
+    max_batch_size: Optional[int] = None,
 ):
     """Returns the average of probability scores using a pool of noisy prediction computed with MC Dropout. Can be
     used as an attribution target to compute more robust attribution scores.
@@ -348,24 +465,40 @@ def mc_dropout_prob_avg_fn(
 
     Args:
         n_mcd_steps (:obj:`int`): The number of prediction steps that should be used to normalize the original output.
+        max_batch_size (:obj:`int`, `optional`): Maximum number of sequences per forward pass. By default, all
+            :obj:`n_mcd_steps` noisy predictions are computed in a single forward pass over the repeated batch.
     """
     # Original probability from the model without noise
     orig_prob = probability_fn(args, logprob=logprob)
-
-    # Compute noisy predictions using the noisy model
-    # Important: must be in train mode to ensure noise for MCD
-    args.attribution_model.train()
-    noisy_probs = []
-    for _ in range(n_mcd_steps):
-        aux_batch = args.attribution_model.formatter.convert_args_to_batch(args)
-        aux_output = args.attribution_model.get_forward_output(
-            aux_batch, use_embeddings=args.attribution_model.is_encoder_decoder
-        )
-        args.forward_output = aux_output
-        noisy_prob = probability_fn(args, logprob=logprob).to(orig_prob.device)
-        noisy_probs.append(noisy_prob)
+    noisy_probs = get_ensemble_probs(
+        args, n_mcd_steps, logprob=logprob, use_dropout=True, max_batch_size=max_batch_size
+    ).to(orig_prob.device)
     # Z-score the original based on the mean and standard deviation of MC dropout predictions
-    return (orig_prob - torch.stack(noisy_probs).mean(0)).div(torch.stack(noisy_probs).std(0))
+    return (orig_prob - noisy_probs.mean(0)).div(noisy_probs.std(0))
+
+
+def noise_ensemble_prob_avg_fn(
+    args: StepFunctionArgs,
+    n_samples: int = 10,
+    noise_std: float = 0.1,
+    logprob: bool = False,
+    max_batch_size: Optional[int] = None,
+):
+    """Returns the average probability of target ids across an ensemble of predictions computed from input embeddings
+    perturbed with Gaussian noise. Can be used as an attribution target to compute attribution scores that are more
+    robust to small input perturbations.
+
+    Args:
+        n_samples (:obj:`int`): The number of noisy predictions in the ensemble.
+        noise_std (:obj:`float`): Standard deviation of the Gaussian noise, relative to the standard deviation of the
+            input embeddings.
+        max_batch_size (:obj:`int`, `optional`): Maximum number of sequences per forward pass. By default, all
+            :obj:`n_samples` noisy predictions are computed in a single forward pass over the repeated batch.
+    """
+    noisy_probs = get_ensemble_probs(
+        args, n_samples, logprob=logprob, noise_std=noise_std, max_batch_size=max_batch_size
+    )
+    return noisy_probs.mean(0)
 
 
 def top_p_size_fn(
@@ -379,8 +512,7 @@ def top_p_size_fn(
     """
     logits: torch.Tensor = args.attribution_model.output2logits(args.forward_output)
     indices_to_remove = top_p_logits_mask(logits, top_p, 1).to(logits.device)
-    logits = logits.masked_select(~indices_to_remove)[None, ...]
-    return torch.tensor(logits.size(-1))[None, ...]
+    return (~indices_to_remove).sum(dim=-1)
 
 
 STEP_SCORES_MAP = {
@@ -395,11 +527,17 @@ STEP_SCORES_MAP = {
     "contrast_prob_diff": contrast_prob_diff_fn,
     "pcxmi": pcxmi_fn,
     "kl_divergence": kl_divergence_fn,
+    "js_divergence": js_divergence_fn,
     "in_context_pvi": in_context_pvi_fn,
     "mc_dropout_prob_avg": mc_dropout_prob_avg_fn,
+    "noise_ensemble_prob_avg": noise_ensemble_prob_avg_fn,
     "top_p_size": top_p_size_fn,
 }
 
+# Step functions whose scores depend only on the output logits and target ids at the current position, and can
+# therefore be computed for all generation steps at once from a single teacher-forced forward pass.
+POSITION_WISE_STEP_FUNCTIONS = {"logit", "probability", "entropy", "crossentropy", "perplexity", "top_p_size"}
+
 
 def check_is_step_function(identifier: str) -> None:
     if identifier not in STEP_SCORES_MAP:
@@ -456,6 +594,7 @@ def register_step_function(
     identifier: str,
     aggregate_map: Optional[dict[str, str]] = None,
     overwrite: bool = False,
+    position_wise: bool = False,
 ) -> None:
     """Registers a function to be used to compute step scores and store them in the
     :class:`~inseq.data.attribution.FeatureAttributionOutput` object. Registered step functions can also be used as
@@ -487,6 +626,10 @@ def register_step_function(
             available using :func:`~inseq.list_aggregation_functions`.
         overwrite (:obj:`bool`, `optional`, defaults to :obj:`False`): Whether to overwrite an existing function
             registered with the same identifier.
+        position_wise (:obj:`bool`, `optional`, defaults to :obj:`False`): Whether the function computes scores
+            for each batch element using only the output logits of the current position and the target ids, without
+            relying on other inputs or additional forward passes. Position-wise step functions can be computed for
+            all generation steps at once using ``teacher_forced_step_scores=True`` in ``model.attribute``.
     """
     if identifier in STEP_SCORES_MAP:
         if not overwrite:
@@ -495,6 +638,10 @@ def register_step_function(
             )
         logger.warning(f"Overwriting {identifier} step function.")
     STEP_SCORES_MAP[identifier] = fn
+    if position_wise:
+        POSITION_WISE_STEP_FUNCTIONS.add(identifier)
+    else:
+        POSITION_WISE_STEP_FUNCTIONS.discard(identifier)
     if isinstance(aggregate_map, dict):
         for agg_name, aggregation_fn_identifier in aggregate_map.items():
             if agg_name not in DEFAULT_ATTRIBUTION_AGGREGATE_DICT["step_scores"]:
@@ -504,3 +651,9 @@ def register_step_function(
 
 def is_contrastive_step_function(step_fn_id: str) -> bool:
     return "contrast_targets" in signature(get_step_function(step_fn_id)).parameters
+
+
+def is_position_wise_step_function(step_fn_id: Union[str, StepFunction]) -> bool:
+    if callable(step_fn_id):
+        return any(step_fn_id is STEP_SCORES_MAP.get(identifier) for identifier in POSITION_WISE_STEP_FUNCTIONS)
+    return step_fn_id in POSITION_WISE_STEP_FUNCTIONS
@@ -1,7 +1,8 @@
 import logging
 from typing import Optional
 
-from ... import FeatureAttributionOutput, load_model
+from ... import AttributionModel, FeatureAttributionOutput, attribute_data_parallel, load_model
+from ...utils import set_forced_bos_token_id
 from ..base import BaseCLICommand
 from .attribute_args import AttributeExtendedArgs, AttributeWithInputsArgs
 
@@ -25,7 +26,26 @@ def aggregate_attribution_scores(
     return out
 
 
-def attribute(input_texts, generated_texts, args: AttributeExtendedArgs):
+def get_devices_from_args(args: AttributeExtendedArgs) -> list[str]:
+    """Returns the list of devices specified as comma-separated values in ``args.device``."""
+    return [device.strip() for device in args.device.split(",")]
+
+
+def load_model_from_args(args: AttributeExtendedArgs) -> AttributionModel:
+    model = load_model(
+        args.model_name_or_path,
+        attribution_method=args.attribution_method,
+        device=args.device,
+        model_kwargs=args.model_kwargs,
+        tokenizer_kwargs=args.tokenizer_kwargs,
+    )
+    set_forced_bos_token_id(model.tokenizer, args.tokenizer_kwargs, args.generation_kwargs)
+    return model
+
+
+def attribute(
+    input_texts, generated_texts, args: AttributeExtendedArgs, model: Optional[AttributionModel] = None
+) -> FeatureAttributionOutput:
     if args.very_verbose:
         log_level = logging.DEBUG
     elif args.verbose:
@@ -37,41 +57,49 @@ def attribute(input_texts, generated_texts, args: AttributeExtendedArgs):
         format="%(asctime)s.%(msecs)03d %(levelname)s %(module)s - %(funcName)s: %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
     )
-    model = load_model(
-        args.model_name_or_path,
-        attribution_method=args.attribution_method,
-        device=args.device,
-        model_kwargs=args.model_kwargs,
-        tokenizer_kwargs=args.tokenizer_kwargs,
-    )
-    # Handle language tag for multilingual models - no need to specify it in generation kwargs
-    if "tgt_lang" in args.tokenizer_kwargs and "forced_bos_token_id" not in args.generation_kwargs:
-        tgt_lang = args.tokenizer_kwargs["tgt_lang"]
-        args.generation_kwargs["forced_bos_token_id"] = model.tokenizer.lang_code_to_id[tgt_lang]
-
-    out = model.attribute(
-        input_texts,
-        generated_texts,
-        batch_size=args.batch_size,
-        attribute_target=args.attribute_target,
-        attributed_fn=args.attributed_fn,
-        step_scores=args.step_scores,
-        output_step_attributions=args.output_step_attributions,
-        include_eos_baseline=args.include_eos_baseline,
-        device=args.device,
-        generation_args=args.generation_kwargs,
-        attr_pos_start=args.start_pos,
-        attr_pos_end=args.end_pos,
-        generate_from_target_prefix=args.generate_from_target_prefix,
+    attribute_kwargs = {
+        "batch_size": args.batch_size,
+        "attribute_target": args.attribute_target,
+        "attributed_fn": args.attributed_fn,
+        "step_scores": args.step_scores,
+        "output_step_attributions": args.output_step_attributions,
+        "include_eos_baseline": args.include_eos_baseline,
+        "generation_args": args.generation_kwargs,
+        "attr_pos_start": args.start_pos,
+        "attr_pos_end": args.end_pos,
+        "generate_from_target_prefix": args.generate_from_target_prefix,
+        "bucket_by_length": args.bucket_by_length,
+        "max_tokens_per_batch": args.max_tokens_per_batch,
+        "use_forward_cache": args.use_forward_cache,
+        "teacher_forced_step_scores": args.teacher_forced_step_scores,
+        "parallel_steps": args.parallel_steps,
+        "result_cache": args.result_cache,
         **args.attribution_kwargs,
-    )
+    }
+    devices = get_devices_from_args(args)
+    if args.num_workers > 1 or len(devices) > 1:
+        # Workers set the language tag of multilingual models after loading their replica
+        out = attribute_data_parallel(
+            args.model_name_or_path,
+            input_texts,
+            generated_texts,
+            attribution_method=args.attribution_method,
+            devices=devices,
+            num_workers=max(args.num_workers, len(devices)),
+            load_model_kwargs={"model_kwargs": args.model_kwargs, "tokenizer_kwargs": args.tokenizer_kwargs},
+            **attribute_kwargs,
+        )
+    else:
+        if model is None:
+            model = load_model_from_args(args)
+        out = model.attribute(input_texts, generated_texts, device=args.device, **attribute_kwargs)
     if args.viz_path:
         print(f"Saving visualization to {args.viz_path}")
         html = out.show(return_html=True, display=not args.hide_attributions)
         with open(args.viz_path, "w") as f:
             f.write(html)
-    else:
-        out.show(display=not args.hide_attributions)
+    elif not args.hide_attributions:
+        out.show()
     if args.save_path:
         if args.attribution_aggregators is not None:
             out = aggregate_attribution_scores(
@@ -82,6 +110,7 @@ def attribute(input_texts, generated_texts, args: AttributeExtendedArgs):
             )
         print(f"Saving {'aggregated ' if args.aggregate_output else ''}attributions to {args.save_path}")
         out.save(args.save_path, overwrite=True)
+    return out
 
 
 class AttributeCommand(BaseCLICommand):
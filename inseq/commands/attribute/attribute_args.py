@@ -26,7 +26,11 @@ class AttributeBaseArgs:
     device: str = cli_arg(
         default=get_default_device(),
         aliases=["--dev"],
-        help="The device used for inference with Pytorch. Multi-GPU is not supported.",
+        help=(
+            "The device used for inference with Pytorch. When attributing with ``attribute`` or"
+            " ``attribute-dataset``, multiple comma-separated devices (e.g. ``cuda:0,cuda:1``) enable data-parallel"
+            " attribution with one model replica per device."
+        ),
     )
     attributed_fn: Optional[str] = cli_arg(
         default=None,
@@ -108,6 +112,46 @@ class AttributeExtendedArgs(AttributeBaseArgs):
     batch_size: int = cli_arg(
         default=8, aliases=["-bs"], help="The batch size used for the attribution computation. Default: no batching."
     )
+    bucket_by_length: bool = cli_arg(
+        default=False,
+        help="If specified, inputs of similar length are grouped in the same batch to reduce padding.",
+    )
+    max_tokens_per_batch: Optional[int] = cli_arg(
+        default=None,
+        help="Maximum number of padded source and target tokens per batch. Enables length-bucketed batching.",
+    )
+    use_forward_cache: bool = cli_arg(
+        default=False,
+        help="If specified, the model key-value cache is reused across generation steps to compute step scores.",
+    )
+    teacher_forced_step_scores: bool = cli_arg(
+        default=False,
+        help=(
+            "If specified, position-wise step scores are computed for all generation steps from a single forward"
+            " pass. Only available for the dummy attribution method."
+        ),
+    )
+    num_workers: int = cli_arg(
+        default=1,
+        help=(
+            "Number of worker processes used for data-parallel attribution, each one loading its own model replica."
+            " On CPU, workers are pinned to separate NUMA nodes or groups of cores."
+        ),
+    )
+    parallel_steps: bool = cli_arg(
+        default=False,
+        help=(
+            "If specified, all generation steps are attributed from a single forward pass. Only available for the"
+            " saliency and input_x_gradient attribution methods."
+        ),
+    )
+    result_cache: Optional[str] = cli_arg(
+        default=None,
+        help=(
+            "Directory of a persistent cache of attribution results. Sequences already attributed with the same model"
+            " and parameters are loaded from the cache instead of being recomputed."
+        ),
+    )
     aggregate_output: bool = cli_arg(
         default=False,
         help="If specified, the attribution output is aggregated using its default aggregator before saving.",
@@ -120,7 +164,10 @@ class AttributeExtendedArgs(AttributeBaseArgs):
     save_path: Optional[str] = cli_arg(
         default=None,
         aliases=["-o"],
-        help="Path where the attribution output should be saved in JSON format.",
+        help=(
+            "Path where the attribution output should be saved in JSON format, or in safetensors format if the path"
+            " ends with .safetensors."
+        ),
     )
     viz_path: Optional[str] = cli_arg(
         default=None,
@@ -1,19 +1,28 @@
-from typing import Optional
+import json
+import logging
+import os
+from collections.abc import Iterator
+from dataclasses import replace
+from typing import Any, Optional
 
 from ...utils import is_datasets_available
 from ..attribute import AttributeExtendedArgs
-from ..attribute.attribute import attribute
+from ..attribute.attribute import attribute, get_devices_from_args, load_model_from_args
 from ..base import BaseCLICommand
 from .attribute_dataset_args import LoadDatasetArgs
 
 if is_datasets_available():
     from datasets import load_dataset
 
+logger = logging.getLogger(__name__)
 
-def load_fields_from_dataset(dataset_args: LoadDatasetArgs) -> tuple[list[str], Optional[list[str]]]:
+MANIFEST_FILENAME = "manifest.json"
+
+
+def _load_dataset(dataset_args: LoadDatasetArgs):
     if not is_datasets_available():
         raise ImportError("The datasets library needs to be installed to use the attribute-dataset client.")
-    dataset = load_dataset(
+    return load_dataset(
         dataset_args.dataset_name,
         dataset_args.dataset_config,
         data_dir=dataset_args.dataset_dir,
@@ -21,20 +30,104 @@ def load_fields_from_dataset(dataset_args: LoadDatasetArgs) -> tuple[list[str],
         split=dataset_args.dataset_split,
         revision=dataset_args.dataset_revision,
         token=dataset_args.dataset_auth_token,
+        streaming=dataset_args.dataset_streaming,
         **dataset_args.dataset_kwargs,
     )
-    df = dataset.to_pandas()
-    if dataset_args.input_text_field in df.columns:
-        input_texts = list(df[dataset_args.input_text_field])
+
+
+def _get_fields(batch: dict[str, list[Any]], dataset_args: LoadDatasetArgs) -> tuple[list[str], Optional[list[str]]]:
+    if dataset_args.input_text_field in batch:
+        input_texts = list(batch[dataset_args.input_text_field])
     else:
         raise ValueError(f"The input text field {dataset_args.input_text_field} does not exist in the dataset.")
     generated_texts = None
     if dataset_args.generated_text_field is not None:
-        if dataset_args.generated_text_field in df.columns:
-            generated_texts = list(df[dataset_args.generated_text_field])
+        if dataset_args.generated_text_field in batch:
+            generated_texts = list(batch[dataset_args.generated_text_field])
     return input_texts, generated_texts
 
 
+def load_fields_from_dataset(dataset_args: LoadDatasetArgs) -> tuple[list[str], Optional[list[str]]]:
+    dataset = _load_dataset(dataset_args)
+    if dataset_args.dataset_streaming:
+        input_texts, generated_texts = [], []
+        for chunk_inputs, chunk_generated in iter_fields_from_dataset(dataset, dataset_args, chunk_size=1000):
+            input_texts += chunk_inputs
+            if chunk_generated is not None:
+                generated_texts += chunk_generated
+        return input_texts, generated_texts if generated_texts else None
+    df = dataset.to_pandas()
+    return _get_fields({col: df[col] for col in df.columns}, dataset_args)
+
+
+def iter_fields_from_dataset(
+    dataset, dataset_args: LoadDatasetArgs, chunk_size: int
+) -> Iterator[tuple[list[str], Optional[list[str]]]]:
+    """Iterates over the dataset in chunks of ``chunk_size`` examples, without materializing it in memory."""
+    for batch in dataset.iter(batch_size=chunk_size):
+        yield _get_fields(batch, dataset_args)
+
+
+def load_manifest(output_dir: str, chunk_size: int) -> dict[str, Any]:
+    """Loads the manifest of completed chunks from ``output_dir``, or creates a new one if absent."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return {"chunk_size": chunk_size, "completed": {}}
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest["chunk_size"] != chunk_size:
+        raise ValueError(
+            f"The output directory {output_dir} contains results computed with chunk size {manifest['chunk_size']}."
+            f" Use the same chunk size to resume the run, or a different output directory."
+        )
+    return manifest
+
+
+def save_manifest(manifest: dict[str, Any], output_dir: str) -> None:
+    """Saves the manifest atomically, so that an interrupted run never leaves a corrupted manifest behind."""
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def attribute_dataset_in_chunks(attribute_args: AttributeExtendedArgs, dataset_args: LoadDatasetArgs) -> None:
+    """Attributes the dataset one chunk at a time, saving every chunk to a separate output shard in the directory
+    specified by ``save_path``. Completed chunks are recorded in a manifest, and are skipped when the command is run
+    again with the same output directory.
+    """
+    if attribute_args.save_path is None:
+        raise ValueError("An output directory must be specified with save_path when attributing in chunks.")
+    output_dir = attribute_args.save_path
+    os.makedirs(output_dir, exist_ok=True)
+    chunk_size = dataset_args.chunk_size
+    manifest = load_manifest(output_dir, chunk_size)
+    if manifest["completed"]:
+        logger.warning(f"Resuming from {output_dir}: skipping {len(manifest['completed'])} completed chunks.")
+    dataset = _load_dataset(dataset_args)
+    model = None
+    devices = get_devices_from_args(attribute_args)
+    if attribute_args.num_workers <= 1 and len(devices) <= 1:
+        model = load_model_from_args(attribute_args)
+    for chunk_idx, (input_texts, generated_texts) in enumerate(
+        iter_fields_from_dataset(dataset, dataset_args, chunk_size)
+    ):
+        if str(chunk_idx) in manifest["completed"]:
+            continue
+        shard_filename = f"chunk_{chunk_idx:06d}.{dataset_args.chunk_format}"
+        chunk_args = replace(
+            attribute_args,
+            save_path=os.path.join(output_dir, shard_filename),
+            viz_path=None,
+            hide_attributions=True,
+        )
+        logger.info(f"Attributing chunk {chunk_idx} ({len(input_texts)} examples)")
+        attribute(input_texts, generated_texts, chunk_args, model=model)
+        manifest["completed"][str(chunk_idx)] = {"path": shard_filename, "num_examples": len(input_texts)}
+        save_manifest(manifest, output_dir)
+
+
 class AttributeDatasetCommand(BaseCLICommand):
     _name = "attribute-dataset"
     _help = "Perform feature attribution on a full dataset and save the results to a file"
@@ -42,5 +135,8 @@ class AttributeDatasetCommand(BaseCLICommand):
 
     def run(args: tuple[AttributeExtendedArgs, LoadDatasetArgs]):
         attribute_args, dataset_args = args
-        input_texts, generated_texts = load_fields_from_dataset(dataset_args)
-        attribute(input_texts, generated_texts, attribute_args)
+        if dataset_args.chunk_size is not None:
+            attribute_dataset_in_chunks(attribute_args, dataset_args)
+        else:
+            input_texts, generated_texts = load_fields_from_dataset(dataset_args)
+            attribute(input_texts, generated_texts, attribute_args)
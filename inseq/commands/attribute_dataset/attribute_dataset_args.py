@@ -38,3 +38,21 @@ class LoadDatasetArgs:
         default_factory=dict,
         help="Additional keyword arguments passed to the dataset constructor in JSON format.",
     )
+    dataset_streaming: bool = cli_arg(
+        default=False,
+        aliases=["--streaming"],
+        help="If specified, the dataset is streamed instead of being fully downloaded and loaded in memory.",
+    )
+    chunk_size: Optional[int] = cli_arg(
+        default=None,
+        help=(
+            "If specified, the dataset is attributed in chunks of the given size, and the output of every chunk is"
+            " saved to a separate shard in the directory specified by ``save_path``. A manifest of completed chunks"
+            " is kept in the same directory, so that an interrupted run resumes from the first incomplete chunk."
+        ),
+    )
+    chunk_format: str = cli_arg(
+        default="json",
+        choices=["json", "safetensors"],
+        help="The format used to save the output shard of every chunk when ``chunk_size`` is specified.",
+    )
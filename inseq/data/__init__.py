@@ -19,6 +19,7 @@ from .attribution import (
     FeatureAttributionSequenceOutput,
     FeatureAttributionStepOutput,
     GranularFeatureAttributionStepOutput,
+    LazyFeatureAttributionOutput,
     MultiDimensionalFeatureAttributionStepOutput,
     get_batch_from_inputs,
     merge_attributions,
@@ -29,14 +30,18 @@ from .batch import (
     BatchEncoding,
     DecoderOnlyBatch,
     EncoderDecoderBatch,
+    ForwardCache,
     slice_batch_from_position,
 )
+from .result_cache import AttributionResultCache, UncacheableComponentError
 from .viz import show_attributions
 
 __all__ = [
     "Aggregator",
     "AggregatorPipeline",
     "AggregationFunction",
+    "AttributionResultCache",
+    "UncacheableComponentError",
     "SequenceAttributionAggregator",
     "ContiguousSpanAggregator",
     "SubwordAggregator",
@@ -53,6 +58,8 @@ __all__ = [
     "CoarseFeatureAttributionStepOutput",
     "FeatureAttributionSequenceOutput",
     "FeatureAttributionOutput",
+    "LazyFeatureAttributionOutput",
+    "ForwardCache",
     "ModelIdentifier",
     "OneOrMoreIdSequences",
     "OneOrMoreTokenSequences",
@@ -88,7 +88,6 @@ class AbsMaxAggregationFunction(AggregationFunction):
 
 class VectorNormAggregationFunction(AggregationFunction):
     aggregation_function_name = "vnorm"
-    print('---------------scores in VectorNormAggregationFunction', scores)
 
     def __call__(self, scores: torch.Tensor, dim: int, vnorm_ord: int = 2) -> ScoreTensor:
         return vector_norm(scores, ord=vnorm_ord, dim=dim)
@@ -107,7 +106,9 @@ DEFAULT_ATTRIBUTION_AGGREGATE_DICT = {
             "contrast_prob": "prod",
             "pcxmi": "sum",
             "kl_divergence": "sum",
+            "js_divergence": "sum",
             "mc_dropout_prob_avg": "prod",
+            "noise_ensemble_prob_avg": "prod",
         }
     },
 }
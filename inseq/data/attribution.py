@@ -1,17 +1,23 @@
+import json
 import logging
-from copy import deepcopy
-from dataclasses import dataclass, field
+import mmap
+import os
+from copy import copy, deepcopy
+from dataclasses import dataclass, field, fields
 from os import PathLike
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import torch
+from safetensors.torch import save_file
 
 from ..utils import (
     drop_padding,
     get_sequences_from_batched_steps,
     json_advanced_dump,
+    json_advanced_dumps,
     json_advanced_load,
+    json_advanced_loads,
     pad_with_nan,
     pretty_dict,
     remap_from_filtered,
@@ -41,6 +47,9 @@ FeatureAttributionInput = Union[TextInput, BatchEncoding, Batch]
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of sequences whose tensors are saved in the same safetensors file
+SAFETENSORS_SHARD_SIZE = 1024
+
 
 def get_batch_from_inputs(
     attribution_model: "AttributionModel",
@@ -73,7 +82,10 @@ def get_batch_from_inputs(
     return batch
 
 
-def merge_attributions(attributions: list["FeatureAttributionOutput"]) -> "FeatureAttributionOutput":
+def merge_attributions(
+    attributions: list["FeatureAttributionOutput"],
+    original_indices: Optional[list[int]] = None,
+) -> "FeatureAttributionOutput":
     """Merges multiple :class:`~inseq.data.FeatureAttributionOutput` objects into a single one.
 
     Merging is allowed only if the two outputs match on the fields specified in ``_merge_match_info_fields``.
@@ -81,6 +93,9 @@ def merge_attributions(attributions: list["FeatureAttributionOutput"]) -> "Featu
     Args:
         attributions (:obj:`list` of :class:`~inseq.data.FeatureAttributionOutput`): The FeatureAttributionOutput
             objects to be merged.
+        original_indices (:obj:`list` of :obj:`int`, `optional`): The original position of every sequence in the
+            concatenation of the merged outputs. If provided, sequences are reordered accordingly, e.g. to restore the
+            input order after length-bucketed batching. Not supported for outputs containing step attributions.
 
     Returns:
         :class:`~inseq.data.FeatureAttributionOutput`: Merged object.
@@ -98,15 +113,28 @@ def merge_attributions(attributions: list["FeatureAttributionOutput"]) -> "Featu
             )
             for attr in attributions
         ), f"Cannot merge: incompatible values for field {match_field}"
+    if original_indices is not None and first.step_attributions is not None:
+        raise ValueError("Cannot reorder merged outputs containing step attributions.")
+
+    def restore_order(seq: list[Any]) -> list[Any]:
+        if original_indices is None:
+            return seq
+        out = [None] * len(seq)
+        for idx, val in zip(original_indices, seq):
+            out[idx] = val
+        return out
+
     out_info = first.info.copy()
     if "attr_pos_end" in first.info:
         out_info.update({"attr_pos_end": max(attr.info["attr_pos_end"] for attr in attributions)})
-    if "generated_texts" in first.info:
-        out_info.update({"generated_texts": [text for attr in attributions for text in attr.info["generated_texts"]]})
-    if "input_texts" in first.info:
-        out_info.update({"input_texts": [text for attr in attributions for text in attr.info["input_texts"]]})
+    for texts_field in ["generated_texts", "input_texts"]:
+        if texts_field in first.info:
+            texts = [text for attr in attributions for text in attr.info[texts_field]]
+            out_info.update({texts_field: restore_order(texts)})
     return FeatureAttributionOutput(
-        sequence_attributions=[seqattr for attr in attributions for seqattr in attr.sequence_attributions],
+        sequence_attributions=restore_order(
+            [seqattr for attr in attributions for seqattr in attr.sequence_attributions]
+        ),
         step_attributions=(
             [stepattr for attr in attributions for stepattr in attr.step_attributions]
             if first.step_attributions is not None
@@ -161,10 +189,22 @@ class FeatureAttributionSequenceOutput(TensorWrapper, AggregableMixin):
 
     @staticmethod
     def get_remove_pad_fn(attr: "FeatureAttributionStepOutput", name: str) -> Callable:
-        if attr.source_attributions is None or name.startswith("decoder"):
+        if attr.source_attributions is None:
             remove_pad_fn = lambda scores, _, targets, seq_id: scores[seq_id][
                 : len(targets[seq_id]), : len(targets[seq_id]), ...
             ]
+        elif name.startswith("decoder"):
+
+            def remove_pad_fn(scores, _, targets, seq_id):
+                # Target-to-target scores of encoder-decoder models are stacked across steps, with the generated
+                # positions of the final step in the third dimension. These exceed the number of steps by the
+                # same offset for all sequences, and are padded for sequences shorter than the longest one.
+                tgt_len = len(targets[seq_id])
+                if scores[seq_id].ndim <= 3:
+                    return scores[seq_id][:tgt_len, :tgt_len, ...]
+                num_generated = tgt_len + scores[seq_id].size(2) - scores[seq_id].size(1)
+                return scores[seq_id][:tgt_len, :tgt_len, :num_generated, ...]
+
         elif name.startswith("encoder"):
             remove_pad_fn = lambda scores, sources, _, seq_id: scores[seq_id][
                 : len(sources[seq_id]), : len(sources[seq_id]), ...
@@ -323,9 +363,9 @@ class FeatureAttributionSequenceOutput(TensorWrapper, AggregableMixin):
             logger.warning(f"Found empty attributions, skipping attribution matching generation: {tokens}")
         else:
             # print("------------------------------------", type(aggregated))
-            print("------------------------------------",  aggregated )
-            print("------------------------------------aggregated.source_attributions",  aggregated.source_attributions)
-            print("------------------------------------aggregated.target_attributions",  aggregated.target_attributions)
+            print("------------------------------------", aggregated)
+            print("------------------------------------aggregated.source_attributions", aggregated.source_attributions)
+            print("------------------------------------aggregated.target_attributions", aggregated.target_attributions)
             return show_attributions(aggregated, min_val, max_val, display, return_html)
 
     @property
@@ -428,21 +468,20 @@ class FeatureAttributionStepOutput(TensorWrapper):
         is_final_step_method: bool = False,
     ) -> None:
         """Remaps the attributions to the original shape of the input sequence."""
-        batch_size = (
-            len(batch.sources.input_tokens) if self.source_attributions is not None else len(batch.target_tokens)
-        )
-        source_len = len(batch.sources.input_tokens[0])
+        batch_size = len(batch.target_tokens)
+        # Decoder-only batches have no source
+        source_len = len(batch.source_tokens[0]) if batch.source_tokens is not None else None
         target_len = len(batch.target_tokens[0])
         # Normal per-step attribution outputs have shape (batch_size, seq_len, ...)
         other_dims_start_idx = 2
         # Final step attribution outputs have shape (batch_size, seq_len, seq_len, ...)
         if is_final_step_method:
             other_dims_start_idx += 1
-        other_dims = (
-            self.source_attributions.shape[other_dims_start_idx:]
-            if self.source_attributions is not None
-            else self.target_attributions.shape[other_dims_start_idx:]
-        )
+        other_dims = ()
+        if self.source_attributions is not None:
+            other_dims = self.source_attributions.shape[other_dims_start_idx:]
+        elif self.target_attributions is not None:
+            other_dims = self.target_attributions.shape[other_dims_start_idx:]
         if self.source_attributions is not None:
             self.source_attributions = remap_from_filtered(
                 original_shape=(batch_size, *self.source_attributions.shape[1:]),
@@ -477,6 +516,98 @@ class FeatureAttributionStepOutput(TensorWrapper):
                 )
 
 
+def _to_contiguous_buffer(tensor: torch.Tensor) -> torch.Tensor:
+    tensor = tensor.detach().cpu()
+    # Views sharing storage with other tensors (e.g. slices of a batched tensor) cannot be stored as separate buffers
+    if not tensor.is_contiguous() or tensor.untyped_storage().nbytes() != tensor.numel() * tensor.element_size():
+        tensor = tensor.clone(memory_format=torch.contiguous_format)
+    return tensor
+
+
+def _extract_tensors(obj: TensorWrapper, prefix: str, tensors: dict[str, torch.Tensor]) -> TensorWrapper:
+    """Returns a shallow copy of ``obj`` in which tensor fields (and tensor values of dictionary fields) are replaced
+    by ``None``, adding the removed tensors to ``tensors`` with keys of the form ``<prefix>.<field>[.<key>]``.
+    """
+    out = copy(obj)
+    for obj_field in fields(obj):
+        val = getattr(obj, obj_field.name)
+        name = f"{prefix}.{obj_field.name}"
+        if isinstance(val, torch.Tensor):
+            tensors[name] = _to_contiguous_buffer(val)
+            setattr(out, obj_field.name, None)
+        elif isinstance(val, dict):
+            out_dict = {}
+            for key, dict_val in val.items():
+                if isinstance(dict_val, torch.Tensor):
+                    tensors[f"{name}.{key}"] = _to_contiguous_buffer(dict_val)
+                    out_dict[key] = None
+                else:
+                    out_dict[key] = dict_val
+            setattr(out, obj_field.name, out_dict)
+    return out
+
+
+def _restore_tensors(obj: TensorWrapper, prefix: str, tensors: dict[str, torch.Tensor]) -> TensorWrapper:
+    """Inverse of :func:`_extract_tensors`, filling fields of ``obj`` in place from ``tensors``."""
+    for obj_field in fields(obj):
+        val = getattr(obj, obj_field.name)
+        name = f"{prefix}.{obj_field.name}"
+        if name in tensors:
+            setattr(obj, obj_field.name, tensors[name])
+        elif isinstance(val, dict):
+            for key in val:
+                if f"{name}.{key}" in tensors:
+                    val[key] = tensors[f"{name}.{key}"]
+    return obj
+
+
+def get_safetensors_index_path(path: PathLike) -> Path:
+    """Returns the path of the JSONL index storing the non-tensor fields of an attribution output saved in
+    safetensors format at ``path``.
+    """
+    path = Path(path)
+    return path.with_name(f"{path.name}.index.jsonl")
+
+
+def get_safetensors_shard_path(path: PathLike, shard_idx: int) -> Path:
+    """Returns the path of the ``shard_idx``-th tensors file of an attribution output saved in safetensors format at
+    ``path``. The first shard is stored at ``path``, and the following ones at ``<stem>-<shard_idx><suffix>``.
+    """
+    path = Path(path)
+    if shard_idx == 0:
+        return path
+    return path.with_name(f"{path.stem}-{shard_idx:05d}{path.suffix}")
+
+
+def _write_safetensors_shard(tensors: dict[str, torch.Tensor], path: Path) -> dict[str, dict[str, Any]]:
+    """Saves ``tensors`` to a safetensors file at ``path``, returning the dtype, shape and absolute byte offset of
+    every tensor in the file.
+    """
+    # Shards are replaced atomically, so that tensors memory-mapped from a previous version of the file stay valid
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    save_file(tensors, tmp_path)
+    os.replace(tmp_path, path)
+    with open(path, "rb") as f:
+        header_size = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_size))
+    return {
+        name: {
+            "dtype": str(tensor.dtype).split(".")[-1],
+            "shape": list(tensor.shape),
+            "offset": 8 + header_size + header[name]["data_offsets"][0],
+        }
+        for name, tensor in tensors.items()
+    }
+
+
+def _infer_file_format(path: PathLike, file_format: Optional[str]) -> str:
+    if file_format is None:
+        file_format = "safetensors" if str(path).endswith(".safetensors") else "json"
+    if file_format not in ("json", "safetensors"):
+        raise ValueError(f"Unknown file format {file_format}. Supported formats: json, safetensors.")
+    return file_format
+
+
 @dataclass
 class FeatureAttributionOutput:
     """Output produced by the `AttributionModel.attribute` method.
@@ -550,8 +681,9 @@ class FeatureAttributionOutput:
         ndarray_compact: bool = True,
         use_primitives: bool = False,
         split_sequences: bool = False,
+        file_format: Optional[str] = None,
     ) -> None:
-        """Save class contents to a JSON file.
+        """Save class contents to a JSON or safetensors file.
 
         Args:
             path (:obj:`os.PathLike`): Path to the folder where the attribution output will be stored
@@ -571,24 +703,45 @@ class FeatureAttributionOutput:
                 If True, the output is split into multiple files, one per sequence. The file names are generated by
                 appending the sequence index to the given path (e.g. ``./out.json`` with two sequences ->
                 ``./out_0.json``, ``./out_1.json``)
+            file_format (:obj:`str`, *optional*):
+                Either ``"json"`` or ``"safetensors"``. If not specified, the format is inferred from the extension of
+                ``path``, defaulting to JSON. The safetensors format stores attribution tensors and scores as raw
+                contiguous buffers in safetensors files of at most ``SAFETENSORS_SHARD_SIZE`` sequences (``path``,
+                then ``<stem>-00001.safetensors``, ...), and the remaining fields in a JSONL index with one record per
+                sequence (``<path>.index.jsonl``). It is much faster and smaller than JSON for granular attributions.
+                ``compress``, ``ndarray_compact`` and ``use_primitives`` only apply to the JSON format.
         """
         if not overwrite and Path(path).exists():
             raise ValueError(f"{path} already exists. Override with overwrite=True.")
+        file_format = _infer_file_format(path, file_format)
+        if file_format == "safetensors" and (compress or use_primitives):
+            logger.warning("compress and use_primitives are not supported by the safetensors format and are ignored.")
         save_outs = []
         paths = []
         if split_sequences:
             for i, seq in enumerate(self.sequence_attributions):
-                attr_out = deepcopy(self)
-                attr_out.sequence_attributions = [seq]
-                attr_out.step_attributions = None
-                attr_out.info["input_texts"] = [attr_out.info["input_texts"][i]]
-                attr_out.info["generated_texts"] = [attr_out.info["generated_texts"][i]]
+                # Outputs are only read when saving, so sequences and info values can be shared without copies
+                attr_out = FeatureAttributionOutput(
+                    sequence_attributions=[seq],
+                    step_attributions=None,
+                    info={
+                        **self.info,
+                        "input_texts": [self.info["input_texts"][i]],
+                        "generated_texts": [self.info["generated_texts"][i]],
+                    },
+                )
                 save_outs.append(attr_out)
-                paths.append(f"{str(path).split('.json')[0]}_{i}.json{'.gz' if compress else ''}")
+                if file_format == "safetensors":
+                    paths.append(f"{str(path).split('.safetensors')[0]}_{i}.safetensors")
+                else:
+                    paths.append(f"{str(path).split('.json')[0]}_{i}.json{'.gz' if compress else ''}")
         else:
             save_outs.append(self)
             paths.append(path)
         for attr_out, path_out in zip(save_outs, paths):
+            if file_format == "safetensors":
+                attr_out._save_safetensors(path_out)
+                continue
             with open(path_out, f"w{'b' if compress else ''}") as f:
                 json_advanced_dump(
                     attr_out,
@@ -601,23 +754,89 @@ class FeatureAttributionOutput:
                     use_primitives=use_primitives,
                 )
 
+    def _save_safetensors(self, path: PathLike) -> None:
+        # Non-tensor fields are stored in a JSONL index with one record per line: the first one contains info and step
+        # attributions, and the following ones the sequences, so that single sequences can be decoded without parsing
+        # the rest. Tensors are saved in shards of SAFETENSORS_SHARD_SIZE sequences, every shard being written before
+        # extracting the tensors of the next one.
+        index_path = get_safetensors_index_path(path)
+        tmp_index_path = index_path.with_name(f"{index_path.name}.tmp")
+        num_shards = max(1, -(-len(self.sequence_attributions) // SAFETENSORS_SHARD_SIZE))
+        with open(tmp_index_path, "w") as f:
+            for shard_idx in range(num_shards):
+                records = []
+                if shard_idx == 0:
+                    step_tensors = {}
+                    skeleton = FeatureAttributionOutput(
+                        sequence_attributions=[],
+                        step_attributions=(
+                            [
+                                _extract_tensors(step, f"step_attributions.{idx}", step_tensors)
+                                for idx, step in enumerate(self.step_attributions)
+                            ]
+                            if self.step_attributions is not None
+                            else None
+                        ),
+                        info=self.info,
+                    )
+                    records.append(({"inseq": json_advanced_dumps(skeleton, use_primitives=False)}, step_tensors))
+                start_idx = shard_idx * SAFETENSORS_SHARD_SIZE
+                shard_sequences = self.sequence_attributions[start_idx : start_idx + SAFETENSORS_SHARD_SIZE]
+                for idx, seq in enumerate(shard_sequences, start=start_idx):
+                    seq_tensors = {}
+                    seq_skeleton = _extract_tensors(seq, f"sequence_attributions.{idx}", seq_tensors)
+                    records.append(
+                        ({"sequence": json_advanced_dumps(seq_skeleton, use_primitives=False)}, seq_tensors)
+                    )
+                tensors_info = _write_safetensors_shard(
+                    {name: tensor for _, record_tensors in records for name, tensor in record_tensors.items()},
+                    get_safetensors_shard_path(path, shard_idx),
+                )
+                for record, record_tensors in records:
+                    record["shard"] = shard_idx
+                    record["tensors"] = {name: tensors_info[name] for name in record_tensors}
+                    f.write(json.dumps(record, sort_keys=True) + "\n")
+        os.replace(tmp_index_path, index_path)
+
+    @staticmethod
+    def _load_safetensors(path: PathLike) -> "FeatureAttributionOutput":
+        with LazyFeatureAttributionOutput(path) as lazy_out:
+            return lazy_out.materialize()
+
     @staticmethod
     def load(
         path: PathLike,
         decompress: bool = False,
-    ) -> "FeatureAttributionOutput":
+        file_format: Optional[str] = None,
+        lazy: bool = False,
+    ) -> Union["FeatureAttributionOutput", "LazyFeatureAttributionOutput"]:
         """Load saved attribution output into a new :class:`~inseq.data.FeatureAttributionOutput` object.
 
         Args:
-            path (:obj:`str`): Path to the JSON file containing the saved attribution output.
+            path (:obj:`str`): Path to the JSON or safetensors file containing the saved attribution output.
                 Note that the file must have been saved with the :meth:`~inseq.data.FeatureAttributionOutput.save`
                 method with ``use_primitives=False`` in order to be loaded correctly.
             decompress (:obj:`bool`, *optional*, defaults to False):
-                If True, the input file is decompressed using gzip.
+                If True, the input file is decompressed using gzip. Only applies to the JSON format.
+            file_format (:obj:`str`, *optional*):
+                Either ``"json"`` or ``"safetensors"``. If not specified, the format is inferred from the extension of
+                ``path``, defaulting to JSON. Tensors of safetensors files are memory-mapped without copies or
+                decoding steps.
+            lazy (:obj:`bool`, *optional*, defaults to False):
+                If True, a :class:`~inseq.data.LazyFeatureAttributionOutput` view is returned instead, decoding
+                sequence attributions only when they are accessed. Only supported for the safetensors format.
 
         Returns:
-            :class:`~inseq.data.FeatureAttributionOutput`: Loaded attribution output
+            :class:`~inseq.data.FeatureAttributionOutput`: Loaded attribution output, or a
+            :class:`~inseq.data.LazyFeatureAttributionOutput` view over the file if ``lazy=True``.
         """
+        file_format = _infer_file_format(path, file_format)
+        if lazy:
+            if file_format != "safetensors":
+                raise ValueError("Lazy loading is only supported for attribution outputs saved in safetensors format.")
+            return LazyFeatureAttributionOutput(path)
+        if file_format == "safetensors":
+            return FeatureAttributionOutput._load_safetensors(path)
         out = json_advanced_load(path, decompression=decompress)
         out.sequence_attributions = [seq.torch() for seq in out.sequence_attributions]
         if out.step_attributions is not None:
@@ -707,6 +926,124 @@ class FeatureAttributionOutput:
         return [attr.get_scores_dicts(aggregator, do_aggregation, **kwargs) for attr in self.sequence_attributions]
 
 
+class LazyFeatureAttributionOutput:
+    """Read-only view over an attribution output saved in safetensors format with
+    :meth:`~inseq.data.FeatureAttributionOutput.save`, decoding a single
+    :class:`~inseq.data.FeatureAttributionSequenceOutput` every time it is accessed. Sequence records are read from
+    the JSONL index of the output, and their tensors are memory-mapped from the safetensors shards at the offsets
+    stored in the index, so that browsing large attribution dumps does not require loading them in memory.
+
+    Can be used as a context manager to release the file handle when done.
+
+    Attributes:
+        path (:obj:`os.PathLike`): Path to the safetensors file.
+        info (dict with str keys and any values): Dictionary including all available parameters used to
+            perform the attribution.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = path
+        index_path = get_safetensors_index_path(path)
+        if Path(path).exists() and not index_path.exists():
+            raise ValueError(f"{path} does not contain an attribution output saved by inseq.")
+        self._index_file = open(index_path, "rb")
+        header = json.loads(self._index_file.readline())
+        if "inseq" not in header:
+            self._index_file.close()
+            raise ValueError(f"{path} does not contain an attribution output saved by inseq.")
+        # Byte offsets of sequence records in the index, read without decoding them
+        self._record_offsets = []
+        offset = self._index_file.tell()
+        for line in self._index_file:
+            self._record_offsets.append(offset)
+            offset += len(line)
+        self._shards: dict[int, mmap.mmap] = {}
+        self._skeleton = json_advanced_loads(header["inseq"])
+        self._step_tensors = self._load_tensors(header)
+        self._step_attributions = None
+        self.info = self._skeleton.info
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(path={self.path}, num_sequences={len(self)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __len__(self) -> int:
+        return len(self._record_offsets)
+
+    def __getitem__(
+        self, item: Union[int, slice]
+    ) -> Union[FeatureAttributionSequenceOutput, list[FeatureAttributionSequenceOutput]]:
+        if isinstance(item, slice):
+            return [self[idx] for idx in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError(f"Sequence index {item} out of range for {len(self)} sequences.")
+        self._index_file.seek(self._record_offsets[item])
+        record = json.loads(self._index_file.readline())
+        return _restore_tensors(
+            json_advanced_loads(record["sequence"]), f"sequence_attributions.{item}", self._load_tensors(record)
+        )
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _load_tensors(self, record: dict[str, Any]) -> dict[str, torch.Tensor]:
+        if record["shard"] not in self._shards:
+            with open(get_safetensors_shard_path(self.path, record["shard"]), "rb") as f:
+                # Copy-on-write mapping, so that loaded tensors can be modified in place without changing the file
+                self._shards[record["shard"]] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        tensors = {}
+        for name, tensor_info in record["tensors"].items():
+            dtype = getattr(torch, tensor_info["dtype"])
+            shape = tensor_info["shape"]
+            numel = torch.Size(shape).numel()
+            if numel == 0:
+                tensors[name] = torch.empty(shape, dtype=dtype)
+            else:
+                tensors[name] = torch.frombuffer(
+                    self._shards[record["shard"]], dtype=dtype, count=numel, offset=tensor_info["offset"]
+                ).view(shape)
+        return tensors
+
+    def close(self) -> None:
+        """Releases the handle to the index file. Sequences decoded before closing remain valid, keeping the shards
+        they were read from mapped in memory until they are deleted.
+        """
+        self._index_file.close()
+        self._shards = {}
+
+    @property
+    def step_attributions(self) -> Optional[list[FeatureAttributionStepOutput]]:
+        if self._step_attributions is None and self._skeleton.step_attributions is not None:
+            self._step_attributions = [
+                _restore_tensors(step, f"step_attributions.{idx}", self._step_tensors)
+                for idx, step in enumerate(self._skeleton.step_attributions)
+            ]
+        return self._step_attributions
+
+    def materialize(self) -> FeatureAttributionOutput:
+        """Decodes all sequences into a :class:`~inseq.data.FeatureAttributionOutput`.
+
+        Returns:
+            :class:`~inseq.data.FeatureAttributionOutput`: The full attribution output.
+        """
+        return FeatureAttributionOutput(
+            sequence_attributions=list(self),
+            step_attributions=self.step_attributions,
+            info=self.info,
+        )
+
+
 @dataclass(eq=False, repr=False)
 class GranularFeatureAttributionSequenceOutput(FeatureAttributionSequenceOutput):
     """Raw output of a single sequence of granular feature attribution.
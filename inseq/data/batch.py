@@ -1,5 +1,7 @@
-from dataclasses import dataclass
-from typing import Optional, Union
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+import torch
 
 from ..utils import get_aligned_idx
 from ..utils.typing import EmbeddingsTensor, ExpandedTargetIdsTensor, IdsTensor, OneOrMoreTokenSequences
@@ -28,6 +30,44 @@ class BatchEncoding(TensorWrapper):
     def __len__(self) -> int:
         return len(self.input_tokens)
 
+    def align_positions(self, positions: list[int], pad_token_id: int, pad_token: str) -> "BatchEncoding":
+        """Re-pads the batch so that the token found at index ``positions[i]`` of the unpadded sequence ``i`` is
+        at the same index for all sequences of the batch. Sequences are padded on the left and on the right as
+        needed, and the token at the aligned index for every sequence is found at ``max(positions)``.
+
+        Args:
+            positions (:obj:`list` of :obj:`int`): The index of the token to be aligned in every unpadded sequence.
+            pad_token_id (:obj:`int`): The id of the padding token.
+            pad_token (:obj:`str`): The padding token.
+
+        Returns:
+            :class:`~inseq.data.BatchEncoding`: The re-padded batch encoding.
+        """
+        lengths = self.attention_mask.sum(dim=-1).tolist()
+        old_front_pads = self.attention_mask.int().argmax(dim=-1).tolist()
+        new_front_pads = [max(positions) - pos for pos in positions]
+        width = max(pad + length for pad, length in zip(new_front_pads, lengths))
+        input_ids = torch.full(
+            (len(lengths), width), pad_token_id, dtype=self.input_ids.dtype, device=self.input_ids.device
+        )
+        attention_mask = torch.zeros_like(input_ids, dtype=self.attention_mask.dtype)
+        baseline_ids = input_ids.clone() if self.baseline_ids is not None else None
+        input_tokens = []
+        for idx, (old_pad, new_pad, length) in enumerate(zip(old_front_pads, new_front_pads, lengths)):
+            input_ids[idx, new_pad : new_pad + length] = self.input_ids[idx, old_pad : old_pad + length]
+            attention_mask[idx, new_pad : new_pad + length] = 1
+            if baseline_ids is not None:
+                baseline_ids[idx, new_pad : new_pad + length] = self.baseline_ids[idx, old_pad : old_pad + length]
+            if self.input_tokens is not None:
+                tokens = self.input_tokens[idx][old_pad : old_pad + length]
+                input_tokens.append([pad_token] * new_pad + tokens + [pad_token] * (width - new_pad - length))
+        return BatchEncoding(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            input_tokens=input_tokens if self.input_tokens is not None else None,
+            baseline_ids=baseline_ids,
+        )
+
 
 @dataclass(eq=False, repr=False)
 class BatchEmbedding(TensorWrapper):
@@ -232,6 +272,78 @@ class DecoderOnlyBatch(Batch):
         )
 
 
+@dataclass
+class ForwardCache:
+    """Model states cached across generation steps, used to compute forward passes incrementally instead of
+    re-running the model over the full prefix at every step.
+
+    Attributes:
+        past_key_values (:obj:`Any`, optional): Key and value states returned by the model for the first
+            ``cached_length`` positions of the generated prefix.
+        cached_length (:obj:`int`): Number of prefix positions covered by ``past_key_values``.
+        batch_size (:obj:`int`, optional): Batch size of the cached states. Used to detect stale caches.
+        encoder_outputs (:obj:`Any`, optional): Encoder outputs for the full batch, computed once per batch for
+            encoder-decoder models since the source does not change across generation steps.
+        last_output (:obj:`Any`, optional): Output of the last incremental forward pass, reused when the same prefix
+            is requested again at the same generation step.
+        contrast_caches (:obj:`dict`): Separate caches for the contrastive forward passes of contrastive step
+            functions, one for every set of contrastive inputs. See
+            :meth:`~inseq.data.ForwardCache.get_contrast_cache`.
+    """
+
+    past_key_values: Optional[Any] = None
+    cached_length: int = 0
+    batch_size: Optional[int] = None
+    encoder_outputs: Optional[Any] = None
+    last_output: Optional[Any] = None
+    contrast_caches: dict[tuple[int, ...], "ForwardCache"] = field(default_factory=dict)
+
+    def is_valid_for(self, batch_size: int, prefix_length: int) -> bool:
+        """Whether the cached states can be extended to compute a prefix of length ``prefix_length``."""
+        return (
+            self.past_key_values is not None
+            and self.batch_size == batch_size
+            and 0 < self.cached_length < prefix_length
+        )
+
+    def get_encoder_outputs(self, mask: Optional[IdsTensor] = None) -> Optional[Any]:
+        """Returns the cached encoder outputs, keeping only sequences marked as active by ``mask`` if provided."""
+        if self.encoder_outputs is None or mask is None:
+            return self.encoder_outputs
+        filtered = {}
+        for key, val in self.encoder_outputs.items():
+            if isinstance(val, tuple):
+                filtered[key] = tuple(TensorWrapper._select_active(v, mask.to(v.device)) for v in val)
+            else:
+                filtered[key] = TensorWrapper._select_active(val, mask.to(val.device))
+        return self.encoder_outputs.__class__(**filtered)
+
+    def get_contrast_cache(self, *contrast_inputs: Any) -> "ForwardCache":
+        """Returns the cache of contrastive model states for the given contrastive inputs, creating it if needed.
+
+        Contrastive inputs are identified by object identity, since they are formatted once per attributed batch by
+        :class:`~inseq.attr.FeatureAttribution` and then passed unchanged to step functions at every step.
+        """
+        key = tuple(id(contrast_input) for contrast_input in contrast_inputs)
+        if key not in self.contrast_caches:
+            self.contrast_caches[key] = ForwardCache()
+        return self.contrast_caches[key]
+
+    def reset(self) -> None:
+        """Drops the cached key and value states, keeping encoder outputs that remain valid for the batch."""
+        self.past_key_values = None
+        self.cached_length = 0
+        self.batch_size = None
+        self.last_output = None
+
+    def clear(self) -> None:
+        self.reset()
+        self.encoder_outputs = None
+        for contrast_cache in self.contrast_caches.values():
+            contrast_cache.clear()
+        self.contrast_caches = {}
+
+
 def slice_batch_from_position(
     batch: DecoderOnlyBatch, curr_idx: int, alignments: Optional[list[tuple[int, int]]] = None
 ) -> tuple[DecoderOnlyBatch, IdsTensor]:
@@ -67,6 +67,21 @@ class TensorWrapper:
         else:
             return attr
 
+    @staticmethod
+    def _repeat_batch(attr, repeats: int):
+        if isinstance(attr, torch.Tensor):
+            if attr.ndim == 0:
+                return attr
+            return attr.repeat(repeats, *([1] * (attr.ndim - 1)))
+        elif isinstance(attr, TensorWrapper):
+            return attr.repeat_batch(repeats)
+        elif isinstance(attr, list):
+            return attr * repeats
+        elif isinstance(attr, dict):
+            return {key: TensorWrapper._repeat_batch(val, repeats) for key, val in attr.items()}
+        else:
+            return attr
+
     @staticmethod
     def _to(attr, device: str):
         if isinstance(attr, (torch.Tensor, TensorWrapper)):
@@ -138,6 +153,14 @@ class TensorWrapper:
             **{field.name: self._select_active(getattr(self, field.name), mask) for field in fields(self.__class__)}
         )
 
+    def repeat_batch(self: TensorClass, repeats: int) -> TensorClass:
+        """Repeats the whole batch ``repeats`` times along the batch dimension, so that the i-th sequence of the j-th
+        copy is found at position ``j * batch_size + i``.
+        """
+        return self.__class__(
+            **{field.name: self._repeat_batch(getattr(self, field.name), repeats) for field in fields(self.__class__)}
+        )
+
     def to(self: TensorClass, device: str) -> TensorClass:
         for field in fields(self.__class__):
             attr = getattr(self, field.name)
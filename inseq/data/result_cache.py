@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+from os import PathLike
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import torch
+
+from ..utils import INSEQ_HOME_CACHE
+from .attribution import FeatureAttributionOutput, get_safetensors_index_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INSEQ_RESULTS_CACHE = os.path.join(INSEQ_HOME_CACHE, "results")
+INSEQ_RESULTS_CACHE = Path(os.getenv("INSEQ_RESULTS_CACHE", DEFAULT_INSEQ_RESULTS_CACHE))
+
+
+class UncacheableComponentError(ValueError):
+    """Raised when a component of a result cache key cannot be identified across runs (e.g. a lambda function)."""
+
+    pass
+
+
+def _encode_key_component(obj: Any) -> Any:
+    if isinstance(obj, torch.Tensor):
+        obj = obj.detach().cpu().contiguous()
+        return {
+            "dtype": str(obj.dtype),
+            "shape": list(obj.shape),
+            "sha256": hashlib.sha256(obj.reshape(-1).view(torch.uint8).numpy().tobytes()).hexdigest(),
+        }
+    if callable(obj):
+        qualname = getattr(obj, "__qualname__", None)
+        # Lambdas and functions defined in other functions share their qualified name with other callables
+        if qualname is None or "<" in qualname:
+            raise UncacheableComponentError(f"{obj} cannot be identified by its qualified name")
+        return f"{getattr(obj, '__module__', '')}.{qualname}"
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    return repr(obj)
+
+
+class AttributionResultCache:
+    """Persistent on-disk cache of attribution results, storing one :class:`~inseq.data.FeatureAttributionOutput` per
+    attributed sequence in safetensors format. Entries are addressed by a hash of everything affecting the result
+    (see :meth:`~inseq.data.AttributionResultCache.get_key`), so that re-attributing the same inputs with the same
+    model and parameters only loads saved results from disk.
+
+    When the cache exceeds ``max_entries`` or ``max_size``, least recently used entries are evicted.
+
+    Args:
+        cache_dir (:obj:`str` or :obj:`os.PathLike`, `optional`): Directory where cached results are stored. Defaults
+            to ``$INSEQ_HOME/results``, or to the ``INSEQ_RESULTS_CACHE`` environment variable if set.
+        max_entries (:obj:`int`, `optional`): Maximum number of cached sequences. Default: no limit.
+        max_size (:obj:`int`, `optional`): Maximum size of the cache in bytes. Default: no limit.
+    """
+
+    file_extension = ".safetensors"
+
+    def __init__(
+        self,
+        cache_dir: Union[str, PathLike, None] = None,
+        max_entries: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ):
+        self.cache_dir = Path(os.path.expanduser(cache_dir)) if cache_dir is not None else INSEQ_RESULTS_CACHE
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(cache_dir={self.cache_dir}, max_entries={self.max_entries},"
+            f" max_size={self.max_size})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    @staticmethod
+    def get_key(**components) -> str:
+        """Computes the content-addressed key of a cache entry as the SHA-256 hash of its JSON-serialized components.
+        Tensors are hashed by content, and callables are identified by their qualified name.
+
+        Args:
+            **components: Values identifying the result, e.g. model info, attribution method and parameters and
+                tokenized inputs.
+
+        Returns:
+            :obj:`str`: The hexadecimal key of the entry.
+
+        Raises:
+            :obj:`UncacheableComponentError`: If a component is a callable without a unique qualified name, e.g. a
+                lambda or a function defined inside another function.
+        """
+        serialized = json.dumps(components, sort_keys=True, default=_encode_key_component)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.file_extension}"
+
+    def _entries(self) -> list[Path]:
+        return list(self.cache_dir.glob(f"*{self.file_extension}"))
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        path.unlink(missing_ok=True)
+        get_safetensors_index_path(path).unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[FeatureAttributionOutput]:
+        """Loads the cached result for ``key``, marking it as recently used.
+
+        Args:
+            key (:obj:`str`): The key of the entry.
+
+        Returns:
+            :class:`~inseq.data.FeatureAttributionOutput`: The cached result, or ``None`` if ``key`` is not cached.
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            out = FeatureAttributionOutput.load(path, file_format="safetensors")
+            # Modification times track the last access for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process in the meantime
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+        return out
+
+    def put(self, key: str, out: FeatureAttributionOutput) -> None:
+        """Saves ``out`` as the cached result for ``key``, evicting least recently used entries if needed.
+
+        Args:
+            key (:obj:`str`): The key of the entry.
+            out (:class:`~inseq.data.FeatureAttributionOutput`): The result to be cached.
+        """
+        path = self._path(key)
+        # Results are written to a temporary file first, so that concurrent readers never see partial entries
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        out.save(tmp_path, overwrite=True, file_format="safetensors")
+        # Single-sequence entries are stored in a single tensors file, moved after the index is in place
+        os.replace(get_safetensors_index_path(tmp_path), get_safetensors_index_path(path))
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits ``max_entries`` and ``max_size``."""
+        if self.max_entries is None and self.max_size is None:
+            return
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+                size = stat.st_size + get_safetensors_index_path(path).stat().st_size
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, size, path))
+        entries.sort(key=lambda entry: entry[0])
+        total_size = sum(size for _, size, _ in entries)
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_size is not None and total_size > self.max_size)
+        ):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        for path in self._entries():
+            self._remove(path)
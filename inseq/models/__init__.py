@@ -6,6 +6,7 @@ from rich.status import Status
 from ..utils import isnotebook, optional
 from ..utils.typing import ModelClass, ModelIdentifier
 from .attribution_model import AttributionModel, InputFormatter
+from .data_parallel import attribute_data_parallel
 from .decoder_only import DecoderOnlyAttributionModel
 from .encoder_decoder import EncoderDecoderAttributionModel
 from .huggingface_model import HuggingfaceDecoderOnlyModel, HuggingfaceEncoderDecoderModel, HuggingfaceModel
@@ -66,4 +67,5 @@ __all__ = [
     "list_supported_frameworks",
     "ModelConfig",
     "register_model_config",
+    "attribute_data_parallel",
 ]
@@ -1,19 +1,24 @@
 import logging
 from abc import ABC, abstractmethod
 from functools import wraps
+from os import PathLike
 from typing import Any, Callable, Optional, Protocol, TypeVar, Union
 
 import torch
 
 from ..attr import STEP_SCORES_MAP, StepFunctionArgs
+from ..attr.attribution_decorators import get_length_bucketed_batches
 from ..attr.feat import FeatureAttribution, extract_args, join_token_ids
 from ..data import (
+    AttributionResultCache,
     BatchEncoding,
     DecoderOnlyBatch,
     EncoderDecoderBatch,
     FeatureAttributionInput,
     FeatureAttributionOutput,
     FeatureAttributionStepOutput,
+    ForwardCache,
+    UncacheableComponentError,
     merge_attributions,
 )
 from ..utils import (
@@ -316,6 +321,12 @@ class AttributionModel(ABC, torch.nn.Module):
         batch_size: Optional[int] = None,
         generate_from_target_prefix: bool = False,
         generation_args: dict[str, Any] = {},
+        use_forward_cache: bool = False,
+        teacher_forced_step_scores: bool = False,
+        parallel_steps: bool = False,
+        bucket_by_length: bool = False,
+        max_tokens_per_batch: Optional[int] = None,
+        result_cache: Union[AttributionResultCache, str, PathLike, None] = None,
         **kwargs,
     ) -> FeatureAttributionOutput:
         """Perform sequential attribution of input texts for every token in generated texts using the specified method.
@@ -364,6 +375,32 @@ class AttributionModel(ABC, torch.nn.Module):
                 target prefixes for the generation process. If False, the ``generated_texts`` will be used as full
                 targets. This option is only available for encoder-decoder models, since the same behavior can be
                 achieved by modifying the input texts for decoder-only models. Default: False.
+            use_forward_cache (:obj:`bool`, `optional`): Whether to reuse the key-value cache of the model across
+                generation steps when computing step scores, feeding only newly added tokens to the model instead of
+                the full prefix at every step. For encoder-decoder models, encoder outputs are also computed once per
+                batch and reused by forward-only computations. Contrastive step scores (e.g. ``kl_divergence``,
+                ``pcxmi``) keep a separate cache for the forward passes over contrastive inputs. Results match the
+                uncached computation up to floating point precision. Not supported for distributed models.
+                Default: False.
+            teacher_forced_step_scores (:obj:`bool`, `optional`): Whether to compute step scores for all generation
+                steps from a single forward pass over the full generated texts, instead of one forward pass per
+                step. Only available for ``method="dummy"`` and for position-wise step functions (e.g.
+                ``probability``, ``entropy``, ``crossentropy``). Default: False.
+            parallel_steps (:obj:`bool`, `optional`): Whether to attribute all generation steps from a single forward
+                pass over the full generated texts, computing gradients for all steps in one batched backward pass.
+                Only available for ``saliency`` and ``input_x_gradient`` with a position-wise attributed function
+                (e.g. ``probability``, ``logit``). Default: False.
+            bucket_by_length (:obj:`bool`, `optional`): Whether to group inputs of similar tokenized source and target
+                length in the same batch to reduce padding. The original order of the inputs is restored in the
+                output. Not supported with ``output_step_attributions=True``. Default: False.
+            max_tokens_per_batch (:obj:`int`, `optional`): The maximum number of padded source and target tokens in a
+                batch. If specified, batches are built with length bucketing and contain at most ``batch_size``
+                sequences if ``batch_size`` is also provided. Default: None.
+            result_cache (:class:`~inseq.data.AttributionResultCache` or :obj:`str`, `optional`): A persistent cache of
+                attribution results, or the path of its directory. Sequences attributed with the same model, method,
+                parameters and tokenized texts as a cached result are loaded from the cache, and only the remaining
+                sequences are attributed and added to it. Not supported with ``output_step_attributions=True`` or
+                contrastive inputs. Default: None.
             **kwargs: Additional keyword arguments. These can include keyword arguments for the attribution method, for
                 the generation process or for the attributed function. Generation arguments can be provided explicitly
                 as a dictionary named ``generation_args``.
@@ -433,45 +470,89 @@ class AttributionModel(ABC, torch.nn.Module):
             assert all(
                 generated_texts[idx].startswith(input_texts[idx]) for idx in range(len(input_texts))
             ), "Forced generations with decoder-only models must start with the input texts."
-            if has_generated_texts and len(input_texts) > 1:
+            if has_generated_texts and len(input_texts) > 1 and attribution_method.is_final_step_method:
                 logger.warning(
-                    "Batched constrained decoding is currently not supported for decoder-only models."
-                    " Using batch size of 1."
+                    "Batched constrained decoding is currently not supported for decoder-only models when using"
+                    " final-step methods. Using batch size of 1."
                 )
                 batch_size = 1
-            if len(input_texts) > 1 and (attr_pos_start is not None or attr_pos_end is not None):
+            if len(input_texts) > 1 and attr_pos_end is not None:
                 logger.warning(
-                    "Custom attribution positions are currently not supported when batching generations for"
+                    "Custom attribution end positions are currently not supported when batching generations for"
                     " decoder-only models. Using batch size of 1."
                 )
                 batch_size = 1
-        elif attribution_method.is_final_step_method and len(input_texts) > 1:
-            logger.warning(
-                "Batched attribution with encoder-decoder models currently not supported for final-step methods."
-                " Using batch size of 1."
-            )
-            batch_size = 1
-        if attribution_method.method_name == "lime":
-            logger.warning("Batched attribution currently not supported for LIME. Using batch size of 1.")
-            batch_size = 1
-        attribution_outputs = attribution_method.prepare_and_attribute(
+        result_cache, cache_keys, cached_outputs = self.load_cached_attributions(
+            result_cache,
             input_texts,
             generated_texts,
-            batch_size=batch_size,
-            attr_pos_start=attr_pos_start,
-            attr_pos_end=attr_pos_end,
-            show_progress=show_progress,
-            pretty_progress=pretty_progress,
             output_step_attributions=output_step_attributions,
-            attribute_target=attribute_target,
-            step_scores=step_scores,
-            include_eos_baseline=include_eos_baseline,
-            attributed_fn=attributed_fn,
+            attribution_method=attribution_method.method_name,
+            attribution_method_kwargs=attribution_method.init_kwargs,
             attribution_args=attribution_args,
+            attributed_fn=attributed_fn,
             attributed_fn_args=attributed_fn_args,
+            step_scores=step_scores,
             step_scores_args=step_scores_args,
+            attribute_target=attribute_target,
+            include_eos_baseline=include_eos_baseline,
+            attr_pos_start=attr_pos_start,
+            attr_pos_end=attr_pos_end,
+        )
+        # Only sequences missing from the result cache are attributed
+        missing_indices = [idx for idx in range(len(input_texts)) if idx not in cached_outputs]
+        missing_input_texts = [input_texts[idx] for idx in missing_indices]
+        missing_generated_texts = [generated_texts[idx] for idx in missing_indices]
+        batch_indices = self.get_bucketed_batch_indices(
+            missing_input_texts,
+            missing_generated_texts,
+            batch_size=batch_size,
+            bucket_by_length=bucket_by_length,
+            max_tokens_per_batch=max_tokens_per_batch,
+            output_step_attributions=output_step_attributions,
+        )
+        if use_forward_cache and self.is_distributed:
+            logger.warning("Forward caching is currently not supported for distributed models. Disabling it.")
+            use_forward_cache = False
+        attribution_outputs = []
+        if missing_indices:
+            attribution_outputs = attribution_method.prepare_and_attribute(
+                missing_input_texts,
+                missing_generated_texts,
+                batch_size=batch_size,
+                batch_indices=batch_indices,
+                attr_pos_start=attr_pos_start,
+                attr_pos_end=attr_pos_end,
+                show_progress=show_progress,
+                pretty_progress=pretty_progress,
+                output_step_attributions=output_step_attributions,
+                attribute_target=attribute_target,
+                step_scores=step_scores,
+                include_eos_baseline=include_eos_baseline,
+                attributed_fn=attributed_fn,
+                attribution_args=attribution_args,
+                attributed_fn_args=attributed_fn_args,
+                step_scores_args=step_scores_args,
+                use_forward_cache=use_forward_cache,
+                teacher_forced_step_scores=teacher_forced_step_scores,
+                parallel_steps=parallel_steps,
+            )
+        if attribution_outputs:
+            attribution_output = merge_attributions(
+                attribution_outputs,
+                original_indices=[idx for batch_idxs in batch_indices for idx in batch_idxs]
+                if batch_indices
+                else None,
+            )
+        attribution_output = self.store_cached_attributions(
+            result_cache,
+            cache_keys,
+            cached_outputs,
+            attribution_output if missing_indices else None,
+            missing_indices,
+            input_texts,
+            generated_texts,
         )
-        attribution_output = merge_attributions(attribution_outputs)
         attribution_output.info["input_texts"] = input_texts
         attribution_output.info["generated_texts"] = (
             [generated_texts] if isinstance(generated_texts, str) else generated_texts
@@ -483,6 +564,135 @@ class AttributionModel(ABC, torch.nn.Module):
             self.device = original_device
         return attribution_output
 
+    def load_cached_attributions(
+        self,
+        result_cache: Union[AttributionResultCache, str, PathLike, None],
+        input_texts: list[str],
+        generated_texts: list[str],
+        output_step_attributions: bool = False,
+        **components,
+    ) -> tuple[Optional[AttributionResultCache], Optional[list[str]], dict[int, FeatureAttributionOutput]]:
+        """Looks up the attributions of ``input_texts`` and ``generated_texts`` in the result cache, if provided.
+
+        Returns:
+            :obj:`tuple`: The result cache, the cache keys of all sequences (None if no cache is used) and a
+            dictionary mapping the indices of sequences found in the cache to their cached attribution output.
+        """
+        if result_cache is None:
+            return None, None, {}
+        contrast_args = ("contrast_sources", "contrast_targets", "contrast_targets_alignments")
+        if output_step_attributions or any(
+            args.get(arg) is not None
+            for args in (components["attributed_fn_args"], components["step_scores_args"])
+            for arg in contrast_args
+        ):
+            logger.warning(
+                "The result cache is not supported with output_step_attributions=True or contrastive inputs."
+                " Disabling it."
+            )
+            return None, None, {}
+        try:
+            cache_keys = self.get_result_cache_keys(input_texts, generated_texts, **components)
+        except UncacheableComponentError as e:
+            logger.warning(f"The result cache is not supported with anonymous callables ({e}). Disabling it.")
+            return None, None, {}
+        if not isinstance(result_cache, AttributionResultCache):
+            result_cache = AttributionResultCache(result_cache)
+        cached_outputs = {}
+        for idx, key in enumerate(cache_keys):
+            cached_out = result_cache.get(key)
+            if cached_out is not None:
+                cached_outputs[idx] = cached_out
+        logger.info(f"Loaded {len(cached_outputs)} of {len(input_texts)} attributions from the result cache.")
+        return result_cache, cache_keys, cached_outputs
+
+    @staticmethod
+    def store_cached_attributions(
+        result_cache: Optional[AttributionResultCache],
+        cache_keys: Optional[list[str]],
+        cached_outputs: dict[int, FeatureAttributionOutput],
+        attribution_output: Optional[FeatureAttributionOutput],
+        missing_indices: list[int],
+        input_texts: list[str],
+        generated_texts: list[str],
+    ) -> FeatureAttributionOutput:
+        """Adds the attributions of sequences missing from the result cache to it, and merges them with the cached
+        ones following the original order of the inputs. ``attribution_output`` is returned unchanged if no result
+        cache is used.
+        """
+        if cache_keys is None:
+            return attribution_output
+        if attribution_output is not None:
+            for idx, seq_attr in zip(missing_indices, attribution_output.sequence_attributions):
+                seq_out = FeatureAttributionOutput(
+                    sequence_attributions=[seq_attr],
+                    info={
+                        **attribution_output.info,
+                        "input_texts": [input_texts[idx]],
+                        "generated_texts": [generated_texts[idx]],
+                    },
+                )
+                result_cache.put(cache_keys[idx], seq_out)
+        return merge_attributions(
+            ([attribution_output] if attribution_output is not None else []) + list(cached_outputs.values()),
+            original_indices=missing_indices + list(cached_outputs.keys()),
+        )
+
+    def get_bucketed_batch_indices(
+        self,
+        input_texts: list[str],
+        generated_texts: list[str],
+        batch_size: Optional[int] = None,
+        bucket_by_length: bool = False,
+        max_tokens_per_batch: Optional[int] = None,
+        output_step_attributions: bool = False,
+    ) -> Optional[list[list[int]]]:
+        """Groups the indices of the attributed sequences into batches of similar tokenized lengths, or returns None
+        if length-bucketed batching is not requested or cannot be used.
+        """
+        if not bucket_by_length and max_tokens_per_batch is None:
+            return None
+        if output_step_attributions:
+            logger.warning(
+                "Length-bucketed batching is not supported with output_step_attributions=True. Disabling it."
+            )
+            return None
+        batch_indices = get_length_bucketed_batches(
+            self.get_sequence_lengths(input_texts, generated_texts),
+            batch_size=batch_size,
+            max_tokens_per_batch=max_tokens_per_batch,
+        )
+        logger.info(f"Grouping input texts into {len(batch_indices)} length-bucketed batches.")
+        return batch_indices
+
+    def get_result_cache_keys(self, input_texts: list[str], generated_texts: list[str], **components) -> list[str]:
+        """Returns the :class:`~inseq.data.AttributionResultCache` key of every attributed sequence, combining the
+        model info and the provided ``components`` with the token ids of the input and generated texts. Input texts
+        are part of the key for decoder-only models too, since the prompt length sets the first attributed position.
+        """
+        texts_ids = [self.encode(input_texts), self.encode(generated_texts, as_targets=self.is_encoder_decoder)]
+        texts_ids = [
+            [ids[mask.bool()].tolist() for ids, mask in zip(encoding.input_ids, encoding.attention_mask)]
+            for encoding in texts_ids
+        ]
+        return [
+            AttributionResultCache.get_key(
+                model_info=self.info,
+                input_ids=[ids[idx] for ids in texts_ids],
+                **components,
+            )
+            for idx in range(len(generated_texts))
+        ]
+
+    def get_sequence_lengths(self, input_texts: list[str], generated_texts: list[str]) -> list[int]:
+        """Returns the number of tokens of every attributed sequence, including both source and target tokens for
+        encoder-decoder models. Used to group sequences of similar length when batching.
+        """
+        lengths = self.encode(generated_texts, as_targets=self.is_encoder_decoder).attention_mask.sum(dim=-1)
+        if self.is_encoder_decoder:
+            lengths += self.encode(input_texts).attention_mask.sum(dim=-1)
+        return lengths.tolist()
+
     def embed(self, inputs: Union[TextInput, IdsTensor], as_targets: bool = False):
         if isinstance(inputs, str) or (
             isinstance(inputs, list) and len(inputs) > 0 and all(isinstance(x, str) for x in inputs)
@@ -628,6 +838,19 @@ class AttributionModel(ABC, torch.nn.Module):
     ) -> ModelOutput:
         pass
 
+    def get_incremental_forward_output(
+        self,
+        batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        forward_cache: ForwardCache,
+        use_embeddings: bool = True,
+        **kwargs,
+    ) -> ModelOutput:
+        """Computes the forward output for the last position of the batch prefix, reusing the states stored in
+        ``forward_cache`` for positions that were already processed at previous generation steps. The cache is
+        updated in place. Models not supporting incremental decoding fall back to a regular forward pass.
+        """
+        return self.get_forward_output(batch, use_embeddings=use_embeddings, **kwargs)
+
     @abstractmethod
     def get_encoder(self) -> torch.nn.Module:
         pass
@@ -671,7 +894,10 @@ class AttributionModel(ABC, torch.nn.Module):
     def _forward_with_output(
         self,
         batch: Union[DecoderOnlyBatch, EncoderDecoderBatch],
+        target_ids: ExpandedTargetIdsTensor,
+        attributed_fn: Callable[..., SingleScorePerStepTensor],
         use_embeddings: bool = True,
+        attributed_fn_argnames: Optional[list[str]] = None,
         *args,
         **kwargs,
     ) -> ModelOutput:
@@ -0,0 +1,197 @@
+"""Data-parallel attribution with one model replica per worker process."""
+
+import glob
+import logging
+import os
+import pickle
+import traceback
+from queue import Empty
+from typing import Any, Optional, Union
+
+import torch
+import torch.multiprocessing as mp
+
+from ..data import FeatureAttributionOutput, merge_attributions
+from ..utils import format_input_texts, get_default_device, set_forced_bos_token_id
+from ..utils.typing import ModelIdentifier, TextInput
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_cpu_list(cpu_list: str) -> set[int]:
+    cpus = set()
+    for cpu_range in cpu_list.strip().split(","):
+        if not cpu_range:
+            continue
+        start, _, end = cpu_range.partition("-")
+        cpus.update(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def get_cpu_affinity_groups(num_groups: Optional[int] = None) -> list[list[int]]:
+    """Groups the CPU cores available to the current process by NUMA node, so that every worker of a data-parallel
+    run can be pinned to a separate socket.
+
+    Args:
+        num_groups (:obj:`int`, `optional`): The number of groups to produce. If it does not match the number of NUMA
+            nodes, available cores are split in ``num_groups`` contiguous groups of similar size. Defaults to one group
+            per NUMA node.
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`int`: The CPU ids of every group. Empty if CPU affinity is not supported
+            by the platform.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return []
+    available = os.sched_getaffinity(0)
+    nodes = []
+    for node_path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+        with open(node_path) as f:
+            node_cpus = sorted(_parse_cpu_list(f.read()) & available)
+        if node_cpus:
+            nodes.append(node_cpus)
+    if nodes and (num_groups is None or num_groups == len(nodes)):
+        return nodes
+    cpus = sorted(available)
+    num_groups = min(num_groups or 1, len(cpus))
+    group_size, remainder = divmod(len(cpus), num_groups)
+    groups, start = [], 0
+    for group_idx in range(num_groups):
+        end = start + group_size + (group_idx < remainder)
+        groups.append(cpus[start:end])
+        start = end
+    return groups
+
+
+def _data_parallel_worker(
+    worker_idx: int,
+    model: ModelIdentifier,
+    attribution_method: Optional[str],
+    device: str,
+    cpu_ids: Optional[list[int]],
+    load_model_kwargs: dict[str, Any],
+    input_texts: list[str],
+    generated_texts: Optional[list[str]],
+    attribute_kwargs: dict[str, Any],
+    queue: mp.Queue,
+) -> None:
+    try:
+        if cpu_ids:
+            os.sched_setaffinity(0, cpu_ids)
+            torch.set_num_threads(len(cpu_ids))
+        from . import load_model
+
+        attribution_model = load_model(model, attribution_method, device=device, **load_model_kwargs)
+        set_forced_bos_token_id(
+            attribution_model.tokenizer,
+            load_model_kwargs.get("tokenizer_kwargs", {}),
+            attribute_kwargs.setdefault("generation_args", {}),
+        )
+        out = attribution_model.attribute(input_texts, generated_texts, device=device, **attribute_kwargs)
+        # Outputs are serialized in the worker to avoid sharing tensor storages with a process that is about to exit
+        queue.put((worker_idx, pickle.dumps(out), None))
+    except Exception:
+        queue.put((worker_idx, None, traceback.format_exc()))
+
+
+def attribute_data_parallel(
+    model: ModelIdentifier,
+    input_texts: TextInput,
+    generated_texts: Optional[TextInput] = None,
+    attribution_method: Optional[str] = None,
+    devices: Union[str, list[str], None] = None,
+    num_workers: Optional[int] = None,
+    load_model_kwargs: dict[str, Any] = {},
+    **attribute_kwargs,
+) -> FeatureAttributionOutput:
+    """Performs attribution on multiple processes, each one loading a replica of the model on its own device and
+    attributing a shard of the inputs with :meth:`~inseq.models.AttributionModel.attribute`. Outputs are merged with
+    :func:`~inseq.merge_attributions`, preserving the order of the inputs.
+
+    Args:
+        model (:obj:`ModelIdentifier`): The identifier or path of the model loaded by every worker.
+        input_texts (:obj:`str` or :obj:`list(str)`): One or more input texts to be attributed.
+        generated_texts (:obj:`str` or :obj:`list(str)`, `optional`): One or more generated texts for constrained
+            decoding. If not provided, every worker generates outputs for its shard of the inputs.
+        attribution_method (:obj:`str`, `optional`): The attribution method used by every worker.
+        devices (:obj:`str` or :obj:`list(str)`, `optional`): The devices used by workers, either as a list or as a
+            comma-separated string (e.g. ``"cuda:0,cuda:1"``). If a single device is provided for multiple workers,
+            it is shared by all of them. Defaults to all available CUDA devices, or to the CPU otherwise.
+        num_workers (:obj:`int`, `optional`): The number of worker processes. Defaults to one worker per device, or
+            to one worker per NUMA node when attributing on CPU. CPU workers are pinned to separate groups of cores.
+        load_model_kwargs (:obj:`dict`, `optional`): Additional arguments passed to :func:`~inseq.load_model` in every
+            worker (e.g. ``model_kwargs``, ``tokenizer_kwargs``). If ``tokenizer_kwargs`` specify a ``tgt_lang``, its
+            language tag is used as ``forced_bos_token_id`` in the generation arguments of every worker.
+        **attribute_kwargs: Additional arguments passed to :meth:`~inseq.models.AttributionModel.attribute` in every
+            worker.
+
+    Returns:
+        :class:`~inseq.data.FeatureAttributionOutput`: The merged attribution output for all inputs.
+    """
+    if not isinstance(model, (str, os.PathLike)):
+        raise TypeError("Data-parallel attribution requires a model identifier or path to load a replica per worker.")
+    if "output_step_attributions" in attribute_kwargs and attribute_kwargs["output_step_attributions"]:
+        raise ValueError("Data-parallel attribution is not supported with output_step_attributions=True.")
+    attribute_kwargs.pop("device", None)
+    input_texts, generated_texts = format_input_texts(input_texts, generated_texts)
+    if isinstance(devices, str):
+        devices = [device.strip() for device in devices.split(",")]
+    if not devices:
+        if torch.cuda.is_available():
+            devices = [f"cuda:{idx}" for idx in range(torch.cuda.device_count())]
+        else:
+            devices = [get_default_device()]
+    if num_workers is None:
+        num_workers = len(devices)
+        if all(device == "cpu" for device in devices):
+            num_workers = max(num_workers, len(get_cpu_affinity_groups()))
+    num_workers = max(1, min(num_workers, len(input_texts)))
+    cpu_groups = []
+    if all(device == "cpu" for device in devices):
+        cpu_groups = get_cpu_affinity_groups(num_workers)
+    # Inputs are interleaved across workers to balance the workload of sorted datasets
+    shards = [list(range(len(input_texts)))[worker_idx::num_workers] for worker_idx in range(num_workers)]
+    logger.info(f"Attributing {len(input_texts)} inputs with {num_workers} workers on devices {devices}.")
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    processes = []
+    for worker_idx, shard in enumerate(shards):
+        process = ctx.Process(
+            target=_data_parallel_worker,
+            args=(
+                worker_idx,
+                model,
+                attribution_method,
+                devices[worker_idx % len(devices)],
+                cpu_groups[worker_idx] if worker_idx < len(cpu_groups) else None,
+                load_model_kwargs,
+                [input_texts[idx] for idx in shard],
+                [generated_texts[idx] for idx in shard] if generated_texts is not None else None,
+                attribute_kwargs,
+                queue,
+            ),
+        )
+        process.start()
+        processes.append(process)
+    outputs, errors = [None] * num_workers, []
+    pending = set(range(num_workers))
+    while pending:
+        try:
+            worker_idx, out, error = queue.get(timeout=1)
+        except Empty:
+            # Workers terminated without reporting (e.g. killed by the OOM killer) would otherwise block forever
+            for worker_idx in list(pending):
+                if not processes[worker_idx].is_alive() and queue.empty():
+                    errors.append(f"Worker {worker_idx} exited with code {processes[worker_idx].exitcode}.")
+                    pending.discard(worker_idx)
+            continue
+        pending.discard(worker_idx)
+        if error is not None:
+            errors.append(f"Worker {worker_idx} failed:\n{error}")
+        else:
+            outputs[worker_idx] = pickle.loads(out)  # nosec
+    for process in processes:
+        process.join()
+    if errors:
+        raise RuntimeError("\n".join(errors))
+    return merge_attributions(outputs, original_indices=[idx for shard in shards for idx in shard])
@@ -12,6 +12,7 @@ from ..data import (
     DecoderOnlyBatch,
     FeatureAttributionInput,
     FeatureAttributionStepOutput,
+    ForwardCache,
     get_batch_from_inputs,
 )
 from ..utils import get_aligned_idx
@@ -206,6 +207,16 @@ class DecoderOnlyAttributionModel(AttributionModel):
     """AttributionModel class for attributing encoder-decoder models."""
 
     formatter = DecoderOnlyInputFormatter
+    # Whether the model forward accepts position_ids, set by subclasses
+    use_position_ids: bool = False
+
+    def get_position_ids(self, attention_mask: Optional[IdsTensor]) -> Optional[IdsTensor]:
+        """Returns the position ids of left-padded sequences, counting positions from the first non-padding token to
+        match the ones used during generation. Returns None if the model does not accept position ids.
+        """
+        if not self.use_position_ids or attention_mask is None or self.is_distributed:
+            return None
+        return (attention_mask.long().cumsum(-1) - 1).clamp(min=0)
 
     def get_forward_output(
         self,
@@ -213,6 +224,9 @@ class DecoderOnlyAttributionModel(AttributionModel):
         use_embeddings: bool = True,
         **kwargs,
     ) -> ModelOutput:
+        position_ids = self.get_position_ids(batch.attention_mask)
+        if position_ids is not None:
+            kwargs["position_ids"] = position_ids
         return self.model(
             input_ids=batch.input_ids if not use_embeddings else None,
             inputs_embeds=batch.input_embeds if use_embeddings else None,
@@ -222,6 +236,35 @@ class DecoderOnlyAttributionModel(AttributionModel):
             **kwargs,
         )
 
+    def get_incremental_forward_output(
+        self,
+        batch: DecoderOnlyBatch,
+        forward_cache: ForwardCache,
+        use_embeddings: bool = True,
+        **kwargs,
+    ) -> ModelOutput:
+        batch_size, prefix_length = batch.input_ids.shape
+        if not forward_cache.is_valid_for(batch_size, prefix_length):
+            forward_cache.reset()
+        # Only positions that are not already covered by the cache are fed to the model
+        new_inputs = batch[forward_cache.cached_length :]
+        position_ids = self.get_position_ids(batch.attention_mask)
+        if position_ids is not None:
+            kwargs["position_ids"] = position_ids[:, forward_cache.cached_length :]
+        output = self.model(
+            input_ids=new_inputs.input_ids if not use_embeddings else None,
+            inputs_embeds=new_inputs.input_embeds if use_embeddings else None,
+            # The attention mask must cover both cached and new positions
+            attention_mask=batch.attention_mask,
+            past_key_values=forward_cache.past_key_values,
+            use_cache=True,
+            **kwargs,
+        )
+        forward_cache.past_key_values = output.past_key_values
+        forward_cache.cached_length = prefix_length
+        forward_cache.batch_size = batch_size
+        return output
+
     @formatter.format_forward_args
     def forward(self, *args, **kwargs) -> LogitsTensor:
         return self._forward(*args, **kwargs)
@@ -12,6 +12,7 @@ from ..data import (
     EncoderDecoderBatch,
     FeatureAttributionInput,
     FeatureAttributionStepOutput,
+    ForwardCache,
     get_batch_from_inputs,
 )
 from ..utils import get_aligned_idx
@@ -284,6 +285,50 @@ class EncoderDecoderAttributionModel(AttributionModel):
             **kwargs,
         )
 
+    def get_encoder_output(
+        self,
+        batch: EncoderDecoderBatch,
+        use_embeddings: bool = True,
+        **kwargs,
+    ) -> ModelOutput:
+        return self.get_encoder()(
+            input_ids=None if use_embeddings else batch.source_ids,
+            inputs_embeds=batch.source_embeds if use_embeddings else None,
+            attention_mask=batch.source_mask,
+            return_dict=True,
+            **kwargs,
+        )
+
+    def get_incremental_forward_output(
+        self,
+        batch: EncoderDecoderBatch,
+        forward_cache: ForwardCache,
+        use_embeddings: bool = True,
+        **kwargs,
+    ) -> ModelOutput:
+        batch_size, prefix_length = batch.target_ids.shape
+        if not forward_cache.is_valid_for(batch_size, prefix_length):
+            forward_cache.reset()
+        # Only decoder positions that are not already covered by the cache are fed to the model
+        new_targets = batch.targets[forward_cache.cached_length :]
+        output = self.model(
+            input_ids=None if use_embeddings else batch.source_ids,
+            inputs_embeds=batch.source_embeds if use_embeddings else None,
+            attention_mask=batch.source_mask,
+            decoder_inputs_embeds=new_targets.input_embeds,
+            # The decoder attention mask must cover both cached and new positions
+            decoder_attention_mask=batch.target_mask,
+            past_key_values=forward_cache.past_key_values,
+            # Encoder inputs are ignored if encoder outputs were precomputed for the batch
+            encoder_outputs=forward_cache.encoder_outputs,
+            use_cache=True,
+            **kwargs,
+        )
+        forward_cache.past_key_values = output.past_key_values
+        forward_cache.cached_length = prefix_length
+        forward_cache.batch_size = batch_size
+        return output
+
     @formatter.format_forward_args
     def forward(self, *args, **kwargs) -> LogitsTensor:
         return self._forward(*args, **kwargs)
@@ -1,6 +1,7 @@
 """HuggingFace Seq2seq model."""
 import logging
 from abc import abstractmethod
+from inspect import signature
 from typing import Any, NoReturn, Optional, Union
 
 import torch
@@ -476,6 +477,7 @@ class HuggingfaceDecoderOnlyModel(HuggingfaceModel, DecoderOnlyAttributionModel)
         super().__init__(model, attribution_method, tokenizer, device, model_kwargs, tokenizer_kwargs, **kwargs)
         self.tokenizer.padding_side = "left"
         self.tokenizer.truncation_side = "left"
+        self.use_position_ids = "position_ids" in signature(self.model.forward).parameters
         if self.pad_token is None:
             self.pad_token = self.tokenizer.bos_token
             self.tokenizer.pad_token = self.tokenizer.bos_token
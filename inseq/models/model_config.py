@@ -1,5 +1,5 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import MISSING, dataclass
 from pathlib import Path
 from typing import Optional
 
@@ -25,11 +25,21 @@ class ModelConfig:
             The name of the variable in the forward pass of the attention module containing the value vector
             (e.g. ``value`` for the GPT-2 model in transformers). Can be identified by looking at the forward pass of
             the attention module (e.g. :obj:`transformers.models.gpt2.modeling_gpt2.GPT2Attention.forward` for GPT-2).
+        value_projection (:obj:`str`, `optional`):
+            The name of the submodule of the attention module producing the value vectors (e.g. ``v_proj`` for Llama
+            models in transformers). If specified, value vectors are accessed with a native forward hook on this
+            module, instead of tracing the attention forward to reach the assignment of ``value_vector``. Projections
+            in nested submodules are specified with dotted names (e.g. ``attention.v_proj`` for GPT-Neo models).
+        value_projection_chunks (:obj:`int`, `optional`):
+            The number of equal chunks in which the output of ``value_projection`` is split, with value vectors in the
+            last one, for fused query-key-value projections (e.g. 3 for the ``c_attn`` module of GPT-2). Default: 1.
     """
 
     self_attention_module: str
     value_vector: str
     cross_attention_module: Optional[str] = None
+    value_projection: Optional[str] = None
+    value_projection_chunks: int = 1
 
 
 MODEL_CONFIGS = {
@@ -81,7 +91,7 @@ def register_model_config(
                 f"{model_type} is already registered in model configurations.Override with overwrite=True."
             )
         logger.warning(f"Overwriting {model_type} config.")
-    all_fields = set(ModelConfig.__dataclass_fields__.keys())
+    all_fields = {name for name, field in ModelConfig.__dataclass_fields__.items() if field.default is MISSING}
     config_fields = set(config.keys())
     diff = all_fields - config_fields
     if diff and not allow_partial:
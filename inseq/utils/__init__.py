@@ -8,7 +8,7 @@ from .errors import (
     MissingAttributionMethodError,
     UnknownAttributionMethodError,
 )
-from .hooks import StackFrame, get_post_variable_assignment_hook
+from .hooks import StackFrame, get_output_chunk_hook, get_post_variable_assignment_hook
 from .import_utils import (
     is_captum_available,
     is_datasets_available,
@@ -42,6 +42,7 @@ from .misc import (
     rgetattr,
     save_to_file,
     scalar_to_numpy,
+    set_forced_bos_token_id,
 )
 from .registry import Registry, available_classes
 from .serialization import json_advanced_dump, json_advanced_dumps, json_advanced_load, json_advanced_loads
@@ -51,9 +52,12 @@ from .torch_utils import (
     euclidean_distance,
     filter_logits,
     find_block_stack,
+    get_available_memory,
     get_default_device,
     get_front_padding,
     get_sequences_from_batched_steps,
+    js_divergence,
+    kl_divergence,
     normalize,
     pad_with_nan,
     recursive_get_submodule,
@@ -76,6 +80,7 @@ __all__ = [
     "aggregate_token_pair",
     "aggregate_token_sequence",
     "format_input_texts",
+    "set_forced_bos_token_id",
     "rgetattr",
     "available_classes",
     "isnotebook",
@@ -101,6 +106,7 @@ __all__ = [
     "is_joblib_available",
     "check_device",
     "get_default_device",
+    "get_available_memory",
     "ndarray_to_bin_str",
     "hashodict",
     "InseqDeprecationWarning",
@@ -122,8 +128,11 @@ __all__ = [
     "get_aligned_idx",
     "top_p_logits_mask",
     "filter_logits",
+    "kl_divergence",
+    "js_divergence",
     "cli_arg",
     "get_post_variable_assignment_hook",
+    "get_output_chunk_hook",
     "StackFrame",
     "validate_indices",
     "pad_with_nan",
@@ -1,11 +1,12 @@
 import logging
 import warnings
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import torch
 
 from ..data import (
+    Batch,
     DecoderOnlyBatch,
     EncoderDecoderBatch,
     FeatureAttributionInput,
@@ -107,13 +108,20 @@ def _get_contrast_inputs(
                 "Contrastive source inputs can only be used with encoder-decoder models. "
                 "Use `contrast_targets` to set a contrastive target containing a prefix for decoder-only models."
             )
-        c_enc_in = args.attribution_model.encode(contrast_sources).to(args.encoder_input_ids.device)
+        # Contrastive sources are pre-encoded once per attributed batch by FeatureAttribution.attribute
+        if isinstance(contrast_sources, Batch):
+            c_enc_in = contrast_sources.to(args.encoder_input_ids.device)
+        else:
+            c_enc_in = args.attribution_model.encode(contrast_sources).to(args.encoder_input_ids.device)
         if (
             args.encoder_input_ids.shape != c_enc_in.input_ids.shape
             or torch.ne(args.encoder_input_ids, c_enc_in.input_ids).any()
         ):
             args.encoder_input_ids = c_enc_in.input_ids
-            args.encoder_input_embeds = args.attribution_model.embed(args.encoder_input_ids, as_targets=False)
+            if isinstance(c_enc_in, Batch) and c_enc_in.input_embeds is not None:
+                args.encoder_input_embeds = c_enc_in.input_embeds
+            else:
+                args.encoder_input_embeds = args.attribution_model.embed(args.encoder_input_ids, as_targets=False)
             args.encoder_attention_mask = c_enc_in.attention_mask
     c_batch = args.attribution_model.formatter.convert_args_to_batch(args)
     return ContrastInputs(
@@ -122,6 +130,40 @@ def _get_contrast_inputs(
     )
 
 
+def _get_contrast_forward_output(
+    args: "StepFunctionArgs",
+    c_batch: Union[EncoderDecoderBatch, DecoderOnlyBatch],
+    *contrast_inputs: Any,
+):
+    """Returns the model output for the contrastive batch. If a forward cache is available in ``args``, the output
+    is computed incrementally from the contrastive states cached at previous generation steps for the same
+    ``contrast_inputs``, and reused as-is if the same contrastive prefix was already processed at the current step.
+    """
+    attribution_model = args.attribution_model
+    is_enc_dec = attribution_model.is_encoder_decoder
+    forward_cache = getattr(args, "forward_cache", None)
+    if forward_cache is None or args.is_attributed_fn:
+        return attribution_model.get_forward_output(c_batch, use_embeddings=is_enc_dec)
+    contrast_cache = forward_cache.get_contrast_cache(*contrast_inputs)
+    batch_size, prefix_length = c_batch.target_ids.shape
+    if (
+        contrast_cache.last_output is not None
+        and contrast_cache.batch_size == batch_size
+        and contrast_cache.cached_length == prefix_length
+    ):
+        return contrast_cache.last_output
+    with torch.no_grad():
+        if is_enc_dec and (
+            contrast_cache.encoder_outputs is None
+            or contrast_cache.encoder_outputs.last_hidden_state.size(0) != batch_size
+        ):
+            # Contrastive sources do not change across generation steps, so the encoder is run once
+            contrast_cache.encoder_outputs = attribution_model.get_encoder_output(c_batch, use_embeddings=True)
+        output = attribution_model.get_incremental_forward_output(c_batch, contrast_cache, use_embeddings=is_enc_dec)
+    contrast_cache.last_output = output
+    return output
+
+
 def _setup_contrast_args(
     args: "StepFunctionArgs",
     contrast_sources: Optional[FeatureAttributionInput] = None,
@@ -157,8 +199,8 @@ def _setup_contrast_args(
     if use_original_output:
         forward_output = args.forward_output
     else:
-        forward_output = args.attribution_model.get_forward_output(
-            c_inputs.batch, use_embeddings=args.attribution_model.is_encoder_decoder
+        forward_output = _get_contrast_forward_output(
+            args, c_inputs.batch, contrast_sources, contrast_targets, contrast_targets_alignments
         )
     c_args = args.attribution_model.formatter.format_step_function_args(
         args.attribution_model,
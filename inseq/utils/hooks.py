@@ -1,8 +1,9 @@
 import re
-from inspect import getsourcelines
+from inspect import getsourcelines, unwrap
 from sys import gettrace, settrace
 from typing import Callable, Optional, TypeVar
 
+import torch
 from torch import nn
 
 from .misc import get_left_padding
@@ -63,8 +64,10 @@ def get_post_variable_assignment_hook(
     """Creates a hook that is called after the last variable assignment in the specified method of a `nn.Module`.
 
     This is a hacky method using the ``sys.settrace()`` function to circumvent the limited hook points of Pytorch hooks
-    and set a custom hook point dynamically. This approach is preferred to ensure a broader compatibility with Hugging
-    Face transformers models that do not provide hook points in their architectures for the moment.
+    and set a custom hook point dynamically. Since the tracer is called on every line executed until the hook point is
+    reached, it slows down the forward pass considerably, and should only be used as a fallback when no native hook
+    point is available (see :func:`~inseq.utils.get_output_chunk_hook`). The tracer is removed when the hooked method
+    returns, even if the hook point was never reached.
 
     Args:
         module (`nn.Module`):
@@ -86,25 +89,60 @@ def get_post_variable_assignment_hook(
     curr_trace_fn = gettrace()
     if hook_line_num is None:
         raise ValueError(f"Could not find assignment to {varname} in {module}'s {fname}() method")
+    hooked_code = unwrap(getattr(module, fname)).__code__
 
     def var_tracer(frame, event, arg=None):
-        curr_line_num = frame.f_lineno
-        curr_func_name = frame.f_code.co_name
-
-        # Matches the first executable line after hook_line_num in the same function of the same module
-        if (
-            event == "line"
-            and curr_line_num >= hook_line_num
-            and curr_func_name == fname
-            and isinstance(frame.f_locals.get("self"), nn.Module)
-            and frame.f_locals.get("self")._get_name() == module._get_name()
-        ):
+        # Only the frames of the hooked method are traced line by line
+        if frame.f_code is not hooked_code:
+            return None
+        # Matches the first executable line after hook_line_num in the hooked method
+        if event == "line" and frame.f_lineno >= hook_line_num:
             # Call the custom hook providing the current frame and any additional arguments as context
             hook_fn(frame, **kwargs)
             settrace(curr_trace_fn)
+            return None
+        # Stop tracing if the method returns without reaching the hook point (e.g. alternative code paths)
+        if event == "return":
+            settrace(curr_trace_fn)
         return var_tracer
 
     def hook(*args, **kwargs):
         settrace(var_tracer)
 
     return hook
+
+
+def get_output_chunk_hook(
+    hook_fn: Callable[..., torch.Tensor],
+    chunk_idx: int = 0,
+    num_chunks: int = 1,
+    **kwargs,
+) -> Callable[[nn.Module, tuple, torch.Tensor], torch.Tensor]:
+    """Creates a forward hook replacing a chunk of the output of a module (e.g. the value vectors produced by a fused
+    query-key-value projection) with the result of ``hook_fn``.
+
+    Contrary to :func:`~inseq.utils.get_post_variable_assignment_hook`, the hook uses Pytorch native hook points, and
+    adds no overhead to the forward pass. It can be used when the variable of interest is produced by a submodule.
+
+    Args:
+        hook_fn (`Callable[..., torch.Tensor]`):
+            A custom hook function taking the output chunk of shape ``(batch_size, seq_len, chunk_size)`` as first
+            parameter, and any additional arguments passed when creating the hook. It returns the chunk replacing
+            the original one.
+        chunk_idx (`int`, *optional*, defaults to 0):
+            The index of the chunk passed to the hook function.
+        num_chunks (`int`, *optional*, defaults to 1):
+            The number of equal chunks in which the last dimension of the module output is split.
+
+    Returns:
+        The hook function that can be registered with :meth:`torch.nn.Module.register_forward_hook`.
+    """
+
+    def output_chunk_hook(module, args, output):
+        if num_chunks == 1:
+            return hook_fn(output, **kwargs)
+        chunks = list(output.chunk(num_chunks, dim=-1))
+        chunks[chunk_idx] = hook_fn(chunks[chunk_idx], **kwargs)
+        return torch.cat(chunks, dim=-1)
+
+    return output_chunk_hook
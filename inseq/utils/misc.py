@@ -214,6 +214,15 @@ def format_input_texts(
     return texts, reference_texts
 
 
+def set_forced_bos_token_id(tokenizer, tokenizer_kwargs: dict[str, Any], generation_kwargs: dict[str, Any]) -> None:
+    """Handles the language tag of multilingual models, so that it does not need to be specified in generation
+    arguments: if the tokenizer was loaded with a ``tgt_lang``, its language code id is set as ``forced_bos_token_id``
+    in ``generation_kwargs``, unless already provided.
+    """
+    if "tgt_lang" in tokenizer_kwargs and "forced_bos_token_id" not in generation_kwargs:
+        generation_kwargs["forced_bos_token_id"] = tokenizer.lang_code_to_id[tokenizer_kwargs["tgt_lang"]]
+
+
 def aggregate_token_sequence(token_sequence, spans):
     if not spans:
         return token_sequence
@@ -1,4 +1,6 @@
 import logging
+import math
+import os
 from collections.abc import Sequence
 from typing import TYPE_CHECKING, Callable, Literal, Optional, Union
 
@@ -30,6 +32,9 @@ def remap_from_filtered(
     mask: Int[torch.Tensor, "batch_size 1"],
     filtered: Num[torch.Tensor, "filtered_batch_size"],
 ) -> Num[torch.Tensor, "batch_size"]:
+    # Integer scores are converted to float to allow NaN padding for filtered positions
+    if not filtered.is_floating_point():
+        filtered = filtered.float()
     index = mask.squeeze(-1).nonzero().reshape(-1, 1)
     while index.ndim < filtered.ndim:
         index = index.unsqueeze(-1)
@@ -84,6 +89,34 @@ def top_k_logits_mask(logits: torch.Tensor, top_k: int, min_tokens_to_keep: int)
     return logits < logits.topk(top_k).values[..., -1, None]
 
 
+def top_k_top_p_logits_mask(
+    logits: torch.Tensor, top_k: int, top_p: float, min_tokens_to_keep: int = 1
+) -> torch.Tensor:
+    """Computes the mask of tokens removed by top-p filtering followed by top-k filtering with a single sort of the
+    vocabulary. Equivalent to masking logits with :func:`top_p_logits_mask` and then applying
+    :func:`top_k_logits_mask` to the masked logits.
+    """
+    if top_p < 0 or top_p > 1.0:
+        raise ValueError(f"`top_p` has to be a float > 0 and < 1, but is {top_p}")
+    if not isinstance(min_tokens_to_keep, int) or (min_tokens_to_keep < 1):
+        raise ValueError(f"`min_tokens_to_keep` has to be a positive integer, but is {min_tokens_to_keep}")
+    sorted_logits, sorted_indices = torch.sort(logits, descending=False)
+    sorted_indices_to_remove = torch.zeros_like(sorted_logits, dtype=torch.bool)
+    if top_p < 1.0:
+        cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+        sorted_indices_to_remove = cumulative_probs <= (1 - top_p)
+        sorted_indices_to_remove[..., -min_tokens_to_keep:] = 0
+    if top_k > 0:
+        kth_idx = logits.size(-1) - min(max(top_k, min_tokens_to_keep), logits.size(-1))
+        # Top-p only removes the lowest logits, so the k-th highest remaining logit is found at the same sorted
+        # position, unless top-p removed it (in which case fewer than k tokens remain and none is removed)
+        kth_logit = sorted_logits[..., kth_idx, None].masked_fill(
+            sorted_indices_to_remove[..., kth_idx, None], float("-inf")
+        )
+        sorted_indices_to_remove = sorted_indices_to_remove | (sorted_logits < kth_logit)
+    return sorted_indices_to_remove.scatter(-1, sorted_indices, sorted_indices_to_remove)
+
+
 def get_logits_from_filter_strategy(
     filter_strategy: Union[Literal["original"], Literal["contrast"], Literal["merged"]],
     original_logits: torch.Tensor,
@@ -115,21 +148,13 @@ def filter_logits(
             filter_strategy = "original"
         else:
             filter_strategy = "merged"
-    if top_p < 1.0:
-        indices_to_remove = top_p_logits_mask(
-            get_logits_from_filter_strategy(filter_strategy, original_logits, contrast_logits),
-            top_p,
-            min_tokens_to_keep,
-        )
-        original_logits = original_logits.masked_fill(indices_to_remove, float("-inf"))
-        if contrast_logits is not None:
-            contrast_logits = contrast_logits.masked_fill(indices_to_remove, float("-inf"))
-    if top_k > 0:
-        indices_to_remove = top_k_logits_mask(
-            get_logits_from_filter_strategy(filter_strategy, original_logits, contrast_logits),
-            top_k,
-            min_tokens_to_keep,
-        )
+    if top_p < 1.0 or top_k > 0:
+        logits_to_filter = get_logits_from_filter_strategy(filter_strategy, original_logits, contrast_logits)
+        if top_p < 1.0:
+            # Top-p and top-k masks are computed together from a single sort of the vocabulary
+            indices_to_remove = top_k_top_p_logits_mask(logits_to_filter, top_k, top_p, min_tokens_to_keep)
+        else:
+            indices_to_remove = top_k_logits_mask(logits_to_filter, top_k, min_tokens_to_keep)
         original_logits = original_logits.masked_fill(indices_to_remove, float("-inf"))
         if contrast_logits is not None:
             contrast_logits = contrast_logits.masked_fill(indices_to_remove, float("-inf"))
@@ -138,6 +163,29 @@ def filter_logits(
     return original_logits
 
 
+def kl_divergence(original_logprobs: torch.Tensor, contrast_logprobs: torch.Tensor) -> torch.Tensor:
+    """Computes the Kullback-Leibler divergence :math:`KL(P \\| Q)` between batches of distributions given as
+    log-probabilities over the last dimension. Tokens with zero probability in :math:`P` (e.g. removed by top-k or
+    top-p filtering) do not contribute to the divergence.
+    """
+    zero_mask = torch.isneginf(original_logprobs)
+    # Masked positions are zeroed before computing pointwise terms to avoid NaN values and gradients
+    original_logprobs = original_logprobs.masked_fill(zero_mask, 0.0)
+    contrast_logprobs = contrast_logprobs.masked_fill(zero_mask, 0.0)
+    pointwise = original_logprobs.exp() * (original_logprobs - contrast_logprobs)
+    return pointwise.masked_fill(zero_mask, 0.0).sum(dim=-1)
+
+
+def js_divergence(original_logprobs: torch.Tensor, contrast_logprobs: torch.Tensor) -> torch.Tensor:
+    """Computes the Jensen-Shannon divergence between batches of distributions given as log-probabilities over the
+    last dimension.
+    """
+    mixture_logprobs = torch.logaddexp(original_logprobs, contrast_logprobs) - math.log(2)
+    return 0.5 * (
+        kl_divergence(original_logprobs, mixture_logprobs) + kl_divergence(contrast_logprobs, mixture_logprobs)
+    )
+
+
 def euclidean_distance(vec_a: torch.Tensor, vec_b: torch.Tensor) -> torch.Tensor:
     """Compute the Euclidean distance between two points."""
     return (vec_a - vec_b).pow(2).sum(-1).sqrt()
@@ -249,6 +297,24 @@ def get_default_device() -> str:
         return "cpu"
 
 
+def get_available_memory(device: Union[str, torch.device]) -> Optional[int]:
+    """Returns the memory available for new allocations on the given device in bytes, using free host memory for
+    CPU devices. Returns ``None`` if the available memory cannot be determined.
+    """
+    device = torch.device(device)
+    if device.type == "cuda":
+        free_memory, _ = torch.cuda.mem_get_info(device)
+        return free_memory
+    if device.type == "mps":
+        if hasattr(torch.mps, "recommended_max_memory"):
+            return torch.mps.recommended_max_memory() - torch.mps.driver_allocated_memory()
+        return None
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
 def find_block_stack(module):
     """Recursively searches for the first instance of a `nn.ModuleList` submodule within a given `torch.nn.Module`.
 
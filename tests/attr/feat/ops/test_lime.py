@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from inseq.attr.feat.ops import Lime
+
+
+class ToyAttributionModel:
+    """Scores sequences of token ids with a fixed non-linear function of their tokens and positions."""
+
+    special_tokens_ids = [0]
+    tokenizer = SimpleNamespace(unk_token_id=1, pad_token_id=0)
+    device = torch.device("cpu")
+
+    def __init__(self, vocab_size: int = 20):
+        self.token_weights = torch.randn(vocab_size, generator=torch.Generator().manual_seed(0))
+
+    def __call__(self, input_ids: torch.Tensor) -> torch.Tensor:
+        positions = torch.arange(1, input_ids.shape[-1] + 1)
+        return (self.token_weights[input_ids] * positions).tanh().sum(-1)
+
+
+@pytest.mark.parametrize("perturbations_per_eval", [4, 30])
+def test_lime_batched_matches_sequential(perturbations_per_eval):
+    pytest.importorskip("sklearn")
+    torch.manual_seed(42)
+    n_samples = 30
+    inputs = torch.randint(2, 20, (3, 6))
+    inputs[:, 0] = 0
+    # Token masks are fixed, so that batched and sequential sampling perturb the inputs in the same way
+    keep_masks = torch.rand(n_samples, *inputs.shape) >= 0.3
+    keep_masks[..., 0] = True
+    lime = Lime(ToyAttributionModel(), surrogate=None)
+    lime.sample_token_masks = lambda *args, **kwargs: [keep_masks]
+    batched_coef = lime.attribute(inputs, n_samples=n_samples, perturbations_per_eval=perturbations_per_eval)
+    assert batched_coef.shape == inputs.shape
+    for seq_idx in range(inputs.shape[0]):
+        seq_inputs = inputs[seq_idx : seq_idx + 1]
+
+        def perturb_func(original_input, seq_idx=seq_idx, **kwargs):
+            for sample_idx in range(n_samples):
+                yield (torch.where(keep_masks[sample_idx, seq_idx], original_input[0], 1),)
+
+        lime.perturb_func = perturb_func
+        seq_coef = lime._attribute_sequential(
+            (seq_inputs,), n_samples=n_samples, perturbations_per_eval=perturbations_per_eval
+        )
+        assert torch.allclose(batched_coef[seq_idx].double(), seq_coef[0].double(), atol=1e-6)
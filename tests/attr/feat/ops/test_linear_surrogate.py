@@ -0,0 +1,44 @@
+import pytest
+import torch
+
+from inseq.attr.feat.ops import BatchedLinearSurrogate
+
+
+@pytest.fixture
+def regression_problems():
+    torch.manual_seed(42)
+    # Binary features, as produced by LIME token masks
+    inputs = (torch.rand(3, 60, 8) > 0.3).float()
+    targets = (inputs @ torch.randn(3, 8, 1)).squeeze(-1) + 0.1 * torch.randn(3, 60)
+    weights = torch.rand(3, 60) * 5
+    return inputs, targets, weights
+
+
+def test_ridge_surrogate_matches_normal_equations(regression_problems):
+    inputs, targets, weights = regression_problems
+    surrogate = BatchedLinearSurrogate("ridge", alpha=0.5)
+    coef = surrogate.fit(inputs, targets, weights)
+    for idx in range(inputs.shape[0]):
+        # Ridge with an unregularized intercept, solved in float64 with an explicit bias column
+        x = torch.cat([inputs[idx], torch.ones(inputs.shape[1], 1)], dim=-1).double()
+        penalty = torch.eye(x.shape[1], dtype=torch.float64) * 0.5
+        penalty[-1, -1] = 0
+        w = weights[idx].double()
+        expected = torch.linalg.solve(x.T @ (w[:, None] * x) + penalty, x.T @ (w * targets[idx].double()))
+        assert torch.allclose(coef[idx].double(), expected[:-1], atol=1e-4)
+        assert torch.allclose(surrogate.intercept_[idx].double(), expected[-1], atol=1e-4)
+
+
+@pytest.mark.parametrize("method", ["ridge", "lasso"])
+def test_surrogate_matches_sklearn(regression_problems, method):
+    linear_model = pytest.importorskip("sklearn.linear_model")
+    inputs, targets, weights = regression_problems
+    alpha = 1.0 if method == "ridge" else 0.02
+    surrogate = BatchedLinearSurrogate(method, alpha=alpha, max_iter=5000, tol=1e-8)
+    coef = surrogate.fit(inputs, targets, weights)
+    sklearn_cls = linear_model.Ridge if method == "ridge" else linear_model.Lasso
+    for idx in range(inputs.shape[0]):
+        model = sklearn_cls(alpha=alpha, tol=1e-10).fit(
+            inputs[idx].double().numpy(), targets[idx].double().numpy(), sample_weight=weights[idx].double().numpy()
+        )
+        assert torch.allclose(coef[idx].double(), torch.from_numpy(model.coef_), atol=1e-4)
@@ -1,15 +1,19 @@
 from itertools import islice
 
-from inseq.utils import is_joblib_available
+from inseq.utils import is_joblib_available, is_scikitlearn_available
 
 if is_joblib_available():
     from joblib import Parallel, delayed
 
+if is_scikitlearn_available():
+    from sklearn.neighbors import kneighbors_graph
+
+import numpy as np
 import pytest
 import torch
 
 import inseq
-from inseq.attr.feat.ops import MonotonicPathBuilder
+from inseq.attr.feat.ops import EmbeddingsKNNIndex, MonotonicPathBuilder
 from inseq.utils import euclidean_distance
 
 
@@ -143,3 +147,71 @@ def test_parallel_find_word(ids: list[list[int]], dig_model) -> None:
     elems = iter(tmp_all)
     pathsb = [list(islice(elems, len(seq))) for seq in ids]
     assert pathsa == pathsb
+
+
+@pytest.mark.skipif(
+    not is_scikitlearn_available(),
+    reason="scikit-learn is not available",
+)
+@pytest.mark.parametrize("strategy", ["greedy", "maxcount"])
+def test_batched_find_paths(strategy: str) -> None:
+    torch.manual_seed(42)
+    vocabulary_embeddings = torch.randn(100, 8)
+    knn_graph = kneighbors_graph(vocabulary_embeddings, n_neighbors=10, mode="distance")
+    path_builder = MonotonicPathBuilder(vocabulary_embeddings, knn_graph, special_tokens=[0])
+    word_ids = torch.tensor([0, 1, 5, 17, 5, 99, 3])
+    baseline_ids = torch.tensor([3, 3, 3, 3, 3, 42, 3])
+    paths = path_builder.find_paths(word_ids, baseline_ids, n_steps=12, strategy=strategy)
+    path_embeds = path_builder.build_monotonic_path_embeddings(paths, baseline_ids, n_steps=12)
+    assert len(path_builder.path_cache) == 6
+    for word_idx, baseline_idx, path, path_embed in zip(word_ids, baseline_ids, paths, path_embeds):
+        orig_path = path_builder.find_path(int(word_idx), int(baseline_idx), n_steps=12, strategy=strategy)
+        assert path.tolist() == orig_path
+        orig_path_embed = path_builder.build_monotonic_path_embedding(orig_path, int(baseline_idx), n_steps=12)
+        assert torch.equal(path_embed, orig_path_embed)
+
+
+@pytest.mark.skipif(
+    not is_scikitlearn_available(),
+    reason="scikit-learn is not available",
+)
+def test_embeddings_knn_index(tmp_path) -> None:
+    torch.manual_seed(42)
+    vocabulary_embeddings = torch.randn(100, 8)
+    knn_graph = kneighbors_graph(vocabulary_embeddings, n_neighbors=10, mode="distance")
+    index = EmbeddingsKNNIndex.build(vocabulary_embeddings, n_neighbors=10, batch_size=16)
+    assert index.neighbor_ids.tolist() == EmbeddingsKNNIndex.from_knn_graph(knn_graph).neighbor_ids.tolist()
+    cached_index = EmbeddingsKNNIndex.load_or_build(tmp_path, vocabulary_embeddings, n_neighbors=10, prefix="test")
+    assert isinstance(cached_index.neighbor_ids, np.memmap)
+    assert np.array_equal(cached_index.neighbor_ids, index.neighbor_ids)
+    assert np.allclose(cached_index.distances, index.distances, atol=1e-5)
+    # Scaled embeddings are stored under a different key
+    EmbeddingsKNNIndex.load_or_build(tmp_path, vocabulary_embeddings * 2, n_neighbors=10, prefix="test")
+    assert len(list(tmp_path.iterdir())) == 2
+    assert index.get_neighbors(torch.tensor([[3, 7]])).shape == (1, 2, 10)
+
+
+def test_embeddings_knn_index_concurrent_build(tmp_path, monkeypatch) -> None:
+    torch.manual_seed(42)
+    vocabulary_embeddings = torch.randn(50, 8)
+    other_index = EmbeddingsKNNIndex.build(vocabulary_embeddings * 3, n_neighbors=5)
+    build_fn = EmbeddingsKNNIndex.build
+
+    def build_with_concurrent_writer(*args, path=None, **kwargs):
+        # Another process saves its index to the target directory while this one is building
+        index_dir = path.with_name(path.name.split(".")[0])
+        if not index_dir.exists():
+            index_dir.mkdir()
+            other_index.save(index_dir)
+        return build_fn(*args, path=path, **kwargs)
+
+    monkeypatch.setattr(EmbeddingsKNNIndex, "build", build_with_concurrent_writer)
+    index = EmbeddingsKNNIndex.load_or_build(tmp_path, vocabulary_embeddings, n_neighbors=5, prefix="test")
+    # The index of the first writer is kept, and the temporary directory is removed
+    assert np.array_equal(index.neighbor_ids, other_index.neighbor_ids)
+    assert len(list(tmp_path.iterdir())) == 1
+    index = EmbeddingsKNNIndex.load_or_build(
+        tmp_path, vocabulary_embeddings, n_neighbors=5, prefix="test", overwrite_cache=True
+    )
+    assert np.array_equal(index.neighbor_ids, build_fn(vocabulary_embeddings, n_neighbors=5).neighbor_ids)
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,49 @@
+import pytest
+import torch
+
+from inseq.attr.feat.ops import SequentialIntegratedGradients
+
+
+def get_toy_forward(weights: torch.Tensor):
+    def toy_forward(embeds: torch.Tensor, scale: float) -> torch.Tensor:
+        """Position-mixing score, so that attributions of every position depend on the rest of the sequence."""
+        mixed = torch.tanh(scale * embeds.cumsum(dim=1) @ weights)
+        return mixed.prod(dim=-1).sum(dim=-1)
+
+    return toy_forward
+
+
+@pytest.mark.parametrize("baselines", [None, "tensor"])
+@pytest.mark.parametrize("internal_batch_size", [None, 16, 40])
+def test_batched_positions_match_sequential(baselines, internal_batch_size):
+    torch.manual_seed(42)
+    inputs = torch.randn(2, 5, 4)
+    weights = torch.randn(4, 3)
+    if baselines == "tensor":
+        baselines = torch.randn(1, 5, 4)
+    sig = SequentialIntegratedGradients(get_toy_forward(weights))
+    kwargs = {"baselines": baselines, "additional_forward_args": (0.5,), "n_steps": 8}
+    # internal_batch_size smaller than #steps * #examples attributes one position at a time
+    sequential = sig.attribute(inputs, internal_batch_size=2, **kwargs)
+    batched = sig.attribute(inputs, internal_batch_size=internal_batch_size, **kwargs)
+    assert batched.shape == inputs.shape
+    assert torch.allclose(batched, sequential.to(batched.dtype), atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    ("internal_batch_size", "expected_rows"), [(None, [16] * 5), (40, [32, 32, 16]), (16, [16] * 5)]
+)
+def test_positions_per_forward(internal_batch_size, expected_rows):
+    torch.manual_seed(42)
+    inputs = torch.randn(2, 5, 4)
+    toy_forward = get_toy_forward(torch.randn(4, 3))
+    forward_rows = []
+
+    def counting_forward(embeds: torch.Tensor, scale: float) -> torch.Tensor:
+        forward_rows.append(embeds.shape[0])
+        return toy_forward(embeds, scale)
+
+    sig = SequentialIntegratedGradients(counting_forward)
+    sig.attribute(inputs, additional_forward_args=(0.5,), n_steps=8, internal_batch_size=internal_batch_size)
+    # Without internal_batch_size, the steps of a single position are forwarded at once
+    assert forward_rows == expected_rows
@@ -1,7 +1,11 @@
+from types import SimpleNamespace
+
 import pytest
 import torch
 
 import inseq
+from inseq.attr.feat import attribution_utils
+from inseq.attr.feat.attribution_utils import estimate_sequence_memory, get_auto_internal_batch_size
 from inseq.attr.step_functions import get_step_scores
 
 from ...inference_commons import get_example_batches
@@ -63,3 +67,19 @@ def test_crossentropy_nlll_equivalence(m2m100_model, encoder_decoder_batches):
             torch.log(torch.softmax(logits, dim=-1)), next_batch.targets.encoding.input_ids[:, -1]
         )
         assert cross_entropy == pytest.approx(nlll, abs=1e-3)
+
+
+def test_get_auto_internal_batch_size(monkeypatch):
+    config = SimpleNamespace(hidden_size=64, num_hidden_layers=2, num_attention_heads=4, vocab_size=100)
+    model = SimpleNamespace(device="cpu", model=SimpleNamespace(config=config, dtype=torch.float32))
+    sequence_memory = estimate_sequence_memory(config, seq_len=10)
+    monkeypatch.setattr(attribution_utils, "get_available_memory", lambda device: 200 * sequence_memory)
+    # All interpolated sequences fit in memory
+    assert get_auto_internal_batch_size(model, num_examples=2, seq_len=10, n_steps=50) is None
+    assert get_auto_internal_batch_size(model, num_examples=2, seq_len=10, n_steps=50, batch_all_if_fits=True) == 100
+    # Chunks are multiples of the number of examples, with at least one step per chunk
+    assert get_auto_internal_batch_size(model, num_examples=3, seq_len=10, n_steps=50) == 99
+    assert get_auto_internal_batch_size(model, num_examples=3, seq_len=10, n_steps=50, memory_fraction=0.01) == 3
+    monkeypatch.setattr(attribution_utils, "get_available_memory", lambda device: None)
+    assert get_auto_internal_batch_size(model, num_examples=4, seq_len=10, n_steps=50) is None
+    assert get_auto_internal_batch_size(model, num_examples=4, seq_len=10, n_steps=50, batch_all_if_fits=True) is None
@@ -1,8 +1,10 @@
+import sys
 from typing import Any, Optional
 
+import pytest
 import torch
 from captum._utils.typing import TensorOrTupleOfTensorsGeneric
-from pytest import fixture
+from pytest import fixture, mark
 
 import inseq
 from inseq.attr.feat.internals_attribution import InternalsAttributionRegistry
@@ -233,9 +235,41 @@ def test_gpt_final_step_per_step_conformity(saliency_gpt_model_larger: Huggingfa
     assert out_per_step[0] == out_final_step[0]
 
 
-# Batching for Seq2Seq models is not supported when using is_final_step methods
-# Passing several sentences will attributed them one by one under the hood
-# def test_seq2seq_multi_step_attention_weights_batched_full_match(saliency_mt_model: HuggingfaceEncoderDecoderModel):
+def test_seq2seq_final_step_attention_batched_full_match(saliency_mt_model: HuggingfaceEncoderDecoderModel):
+    texts = ["Hello world!", "Colorless green ideas sleep furiously."]
+    out_batched = saliency_mt_model.attribute(texts, method="attention", attribute_target=True, show_progress=False)
+    for i, text in enumerate(texts):
+        out_single = saliency_mt_model.attribute(text, method="attention", attribute_target=True, show_progress=False)
+        assert out_batched[i].target == out_single[0].target
+        assert out_batched[i].source_attributions.shape == out_single[0].source_attributions.shape
+        assert torch.allclose(
+            out_batched[i].source_attributions, out_single[0].source_attributions, equal_nan=True, atol=1e-5
+        )
+        assert torch.allclose(
+            out_batched[i].target_attributions, out_single[0].target_attributions, equal_nan=True, atol=1e-5
+        )
+
+
+@mark.parametrize("attribute_target", [False, True])
+def test_seq2seq_final_step_value_zeroing_batched_full_match(
+    saliency_mt_model_larger: HuggingfaceEncoderDecoderModel, attribute_target: bool
+):
+    texts = ["Hello world!", "Colorless green ideas sleep furiously, said the linguist."]
+    out_batched = saliency_mt_model_larger.attribute(
+        texts, method="value_zeroing", attribute_target=attribute_target, show_progress=False
+    )
+    for i, text in enumerate(texts):
+        out_single = saliency_mt_model_larger.attribute(
+            text, method="value_zeroing", attribute_target=attribute_target, show_progress=False
+        )
+        assert out_batched[i].target == out_single[0].target
+        scores_pairs = [
+            (out_batched[i].source_attributions, out_single[0].source_attributions),
+            (out_batched[i].target_attributions, out_single[0].target_attributions),
+        ] + [(out_batched[i].sequence_scores[k], v) for k, v in out_single[0].sequence_scores.items()]
+        for batched_scores, single_scores in scores_pairs:
+            assert batched_scores.shape == single_scores.shape
+            assert torch.allclose(batched_scores, single_scores, equal_nan=True, atol=1e-4)
 
 
 def test_gpt_multi_step_attention_weights_batched_full_match(saliency_gpt_model_larger: HuggingfaceDecoderOnlyModel):
@@ -254,3 +288,147 @@ def test_gpt_multi_step_attention_weights_batched_full_match(saliency_gpt_model_
         assert torch.allclose(
             out_per_step[i].target_attributions, out_final_step[i].target_attributions, equal_nan=True, atol=1e-5
         )
+
+
+def test_forward_cache_step_scores_match(
+    saliency_mt_model: HuggingfaceEncoderDecoderModel, saliency_gpt_model: HuggingfaceDecoderOnlyModel
+):
+    for model in [saliency_mt_model, saliency_gpt_model]:
+        kwargs = {
+            "input_texts": ["Hello world!", "Colorless green ideas sleep furiously."],
+            "step_scores": ["probability", "entropy"],
+            "show_progress": False,
+        }
+        out = model.attribute(**kwargs)
+        out_cached = model.attribute(**kwargs, use_forward_cache=True)
+        for seq, seq_cached in zip(out.sequence_attributions, out_cached.sequence_attributions):
+            for score in ["probability", "entropy"]:
+                assert torch.allclose(seq.step_scores[score], seq_cached.step_scores[score], atol=1e-5)
+
+
+def test_forward_cache_contrastive_step_scores_match(saliency_mt_model: HuggingfaceEncoderDecoderModel):
+    kwargs = {
+        "input_texts": "Hello everyone, hope you're enjoying the tutorial!",
+        "generated_texts": "Buongiorno a tutti, spero che vi stia piacendo il tutorial!",
+        "step_scores": ["kl_divergence", "pcxmi", "contrast_prob"],
+        "contrast_sources": "Hello everyone, hope you're enjoying the lecture!",
+        "show_progress": False,
+    }
+    out = saliency_mt_model.attribute(**kwargs)
+    out_cached = saliency_mt_model.attribute(**kwargs, use_forward_cache=True)
+    for score in ["kl_divergence", "pcxmi", "contrast_prob"]:
+        assert torch.allclose(out[0].step_scores[score], out_cached[0].step_scores[score], atol=1e-5)
+
+
+def test_parallel_steps_attribution_match(
+    saliency_mt_model: HuggingfaceEncoderDecoderModel, saliency_gpt_model: HuggingfaceDecoderOnlyModel
+):
+    for model in [saliency_mt_model, saliency_gpt_model]:
+        for method in ["saliency", "input_x_gradient"]:
+            kwargs = {
+                "input_texts": ["Hello world!", "Colorless green ideas sleep furiously."],
+                "method": method,
+                "step_scores": ["probability"],
+                "attribute_target": model.is_encoder_decoder,
+                "show_progress": False,
+            }
+            out = model.attribute(**kwargs)
+            out_parallel = model.attribute(**kwargs, parallel_steps=True)
+            for seq, seq_parallel in zip(out.sequence_attributions, out_parallel.sequence_attributions):
+                for attr, attr_parallel in [
+                    (seq.source_attributions, seq_parallel.source_attributions),
+                    (seq.target_attributions, seq_parallel.target_attributions),
+                ]:
+                    if attr is not None:
+                        assert torch.allclose(attr, attr_parallel, equal_nan=True, atol=1e-5)
+                assert torch.allclose(
+                    seq.step_scores["probability"], seq_parallel.step_scores["probability"], atol=1e-5
+                )
+
+
+def test_parallel_steps_unbatched_grads_fallback(saliency_gpt_model: HuggingfaceDecoderOnlyModel, monkeypatch):
+    kwargs = {
+        "input_texts": "Hello world!",
+        "generated_texts": "Hello world! How are you?",
+        "method": "saliency",
+        "show_progress": False,
+        "parallel_steps": True,
+    }
+    out = saliency_gpt_model.attribute(**kwargs)
+    autograd_grad = torch.autograd.grad
+
+    def grad_without_vmap(*args, is_grads_batched: bool = False, **grad_kwargs):
+        if is_grads_batched:
+            raise error
+        return autograd_grad(*args, **grad_kwargs)
+
+    monkeypatch.setattr(torch.autograd, "grad", grad_without_vmap)
+    # Operations that cannot be vectorized fall back to a backward pass per step
+    error = RuntimeError("Batching rule not implemented for aten::item. We could not generate a fallback.")
+    out_fallback = saliency_gpt_model.attribute(**kwargs)
+    assert torch.allclose(out[0].target_attributions, out_fallback[0].target_attributions, equal_nan=True)
+    # Other errors are raised
+    error = RuntimeError("Unrelated error")
+    with pytest.raises(RuntimeError, match="Unrelated error"):
+        saliency_gpt_model.attribute(**kwargs)
+
+
+def test_value_zeroing_batched_zeroing_match(saliency_gpt_model: HuggingfaceDecoderOnlyModel):
+    kwargs = {
+        "input_texts": "Hello world!",
+        "generated_texts": "Hello world! How are you?",
+        "method": "value_zeroing",
+        "show_progress": False,
+    }
+    out = saliency_gpt_model.attribute(**kwargs, zeroing_batch_size=1)
+    out_batched = saliency_gpt_model.attribute(**kwargs, zeroing_batch_size=4)
+    assert torch.allclose(out[0].target_attributions, out_batched[0].target_attributions, equal_nan=True, atol=1e-5)
+
+
+def test_value_zeroing_block_execution_match(saliency_gpt_model: HuggingfaceDecoderOnlyModel):
+    kwargs = {
+        "input_texts": "Hello world!",
+        "generated_texts": "Hello world! How are you?",
+        "method": "value_zeroing",
+        "show_progress": False,
+        "decoder_zeroed_units_indices": {0: [0, 1], 3: 2},
+    }
+    out = saliency_gpt_model.attribute(**kwargs, execution_mode="forward")
+    out_block = saliency_gpt_model.attribute(**kwargs, execution_mode="block")
+    assert torch.allclose(out[0].target_attributions, out_block[0].target_attributions, equal_nan=True, atol=1e-5)
+
+
+def test_value_zeroing_native_hooks_match_traced(saliency_gpt_model: HuggingfaceDecoderOnlyModel):
+    kwargs = {
+        "input_texts": "Hello world!",
+        "generated_texts": "Hello world! How are you?",
+        "method": "value_zeroing",
+        "show_progress": False,
+        "decoder_zeroed_units_indices": {0: [0, 1], 3: 2},
+    }
+    trace_fn = sys.gettrace()
+    value_projection = saliency_gpt_model.config.value_projection
+    assert value_projection is not None
+    out = saliency_gpt_model.attribute(**kwargs)
+    try:
+        saliency_gpt_model.config.value_projection = None
+        out_traced = saliency_gpt_model.attribute(**kwargs)
+    finally:
+        saliency_gpt_model.config.value_projection = value_projection
+    assert sys.gettrace() is trace_fn
+    assert torch.allclose(out[0].target_attributions, out_traced[0].target_attributions, equal_nan=True, atol=1e-5)
+
+
+def test_lime_batched_attribution(saliency_gpt_model: HuggingfaceDecoderOnlyModel):
+    kwargs = {
+        "input_texts": ["Hello world!", "The quick brown fox"],
+        "generated_texts": ["Hello world! How are you?", "The quick brown fox jumps"],
+        "method": "lime",
+        "show_progress": False,
+        "n_samples": 20,
+    }
+    out = saliency_gpt_model.attribute(**kwargs, batch_size=1)
+    out_batched = saliency_gpt_model.attribute(**kwargs, batch_size=2, perturbations_per_eval=7)
+    for seq, seq_batched in zip(out.sequence_attributions, out_batched.sequence_attributions):
+        assert seq.target_attributions.shape == seq_batched.target_attributions.shape
+        assert not seq_batched.target_attributions[..., 0].isnan().all()
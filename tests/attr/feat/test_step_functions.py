@@ -55,6 +55,31 @@ def test_contrast_prob_consistency_enc_dec(saliency_mt_model: EncoderDecoderAttr
     assert all(c == r for c, r in zip(contrast_prob, regular_prob[-len(contrast_prob) :]))
 
 
+def test_contrast_inputs_encoded_once_enc_dec(saliency_mt_model: EncoderDecoderAttributionModel, monkeypatch):
+    contrast_source = "After finishing her studies, she started working as a cook in London."
+    contrast_target = "Dopo aver terminato gli studi, ha iniziato a lavorare come cuoca a Londra."
+    encoded_texts = []
+    encode = saliency_mt_model.encode
+
+    def encode_spy(texts, *args, **kwargs):
+        encoded_texts.append(texts)
+        return encode(texts, *args, **kwargs)
+
+    monkeypatch.setattr(saliency_mt_model, "encode", encode_spy)
+    saliency_mt_model.attribute(
+        "she started working as a cook in London.",
+        "ha iniziato a lavorare come cuoca a Londra.",
+        method="dummy",
+        step_scores=["pcxmi", "kl_divergence"],
+        contrast_sources=contrast_source,
+        contrast_targets=contrast_target,
+        contrast_force_inputs=True,
+        show_progress=False,
+    )
+    assert encoded_texts.count([contrast_source]) == 1
+    assert encoded_texts.count([contrast_target]) == 1
+
+
 def attr_prob_diff_fn(
     args: StepFunctionArgs,
     contrast_targets,
@@ -129,3 +154,30 @@ def test_contrast_attribute_target_only_enc_dec(saliency_mt_model: EncoderDecode
         out_explicit_logit_prob_diff[0].step_scores["contrast_prob_diff"],
         out_default_prob_diff[0].step_scores["contrast_prob_diff"],
     )
+
+
+def test_teacher_forced_step_scores_enc_dec(saliency_mt_model: EncoderDecoderAttributionModel):
+    kwargs = {
+        "input_texts": ["Hello world!", "The cat sat on the mat."],
+        "generated_texts": ["Ciao mondo!", "Il gatto era seduto sul tappeto."],
+        "method": "dummy",
+        "step_scores": ["probability", "entropy", "crossentropy"],
+        "show_progress": False,
+    }
+    out = saliency_mt_model.attribute(**kwargs)
+    out_teacher_forced = saliency_mt_model.attribute(**kwargs, teacher_forced_step_scores=True)
+    for seq, seq_tf in zip(out.sequence_attributions, out_teacher_forced.sequence_attributions):
+        for score in kwargs["step_scores"]:
+            assert torch.allclose(seq.step_scores[score], seq_tf.step_scores[score], atol=1e-4, equal_nan=True)
+
+
+def test_mc_dropout_restores_eval_mode(saliency_gpt2: DecoderOnlyAttributionModel):
+    out = saliency_gpt2.attribute(
+        "Hello world!",
+        step_scores=["mc_dropout_prob_avg", "noise_ensemble_prob_avg"],
+        step_scores_args={"n_mcd_steps": 10, "max_batch_size": 4},
+        show_progress=False,
+    )
+    assert not saliency_gpt2.model.training
+    for score in ["mc_dropout_prob_avg", "noise_ensemble_prob_avg"]:
+        assert out[0].step_scores[score].isfinite().all()
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+import inseq.commands.attribute_dataset.attribute_dataset as attribute_dataset_module
+from inseq import FeatureAttributionOutput
+from inseq.commands.attribute import AttributeExtendedArgs
+from inseq.commands.attribute_dataset.attribute_dataset import (
+    MANIFEST_FILENAME,
+    attribute_dataset_in_chunks,
+    load_manifest,
+)
+from inseq.commands.attribute_dataset.attribute_dataset_args import LoadDatasetArgs
+
+INPUT_TEXTS = ["Hello world", "This is a test", "The cat sat", "A short one", "Last example"]
+
+
+def get_args(
+    tmp_path, chunk_size: int = 2, chunk_format: str = "json"
+) -> tuple[AttributeExtendedArgs, LoadDatasetArgs]:
+    data_path = tmp_path / "data.jsonl"
+    with open(data_path, "w") as f:
+        for text in INPUT_TEXTS:
+            f.write(json.dumps({"input": text, "generated": f"{text} and more"}) + "\n")
+    attribute_args = AttributeExtendedArgs(
+        model_name_or_path="hf-internal-testing/tiny-random-GPT2LMHeadModel",
+        device="cpu",
+        save_path=str(tmp_path / "out"),
+        hide_attributions=True,
+    )
+    dataset_args = LoadDatasetArgs(
+        dataset_name="json",
+        input_text_field="input",
+        generated_text_field="generated",
+        dataset_files=[str(data_path)],
+        chunk_size=chunk_size,
+        chunk_format=chunk_format,
+    )
+    return attribute_args, dataset_args
+
+
+@pytest.mark.parametrize("chunk_format", ["json", "safetensors"])
+def test_attribute_dataset_in_chunks_writes_shards(tmp_path, chunk_format):
+    attribute_args, dataset_args = get_args(tmp_path, chunk_format=chunk_format)
+    attribute_dataset_in_chunks(attribute_args, dataset_args)
+    with open(tmp_path / "out" / MANIFEST_FILENAME) as f:
+        manifest = json.load(f)
+    assert manifest["chunk_size"] == 2
+    assert manifest["completed"] == {
+        "0": {"path": f"chunk_000000.{chunk_format}", "num_examples": 2},
+        "1": {"path": f"chunk_000001.{chunk_format}", "num_examples": 2},
+        "2": {"path": f"chunk_000002.{chunk_format}", "num_examples": 1},
+    }
+    out = FeatureAttributionOutput.load(tmp_path / "out" / f"chunk_000001.{chunk_format}")
+    assert out.info["input_texts"] == INPUT_TEXTS[2:4]
+
+
+def test_attribute_dataset_in_chunks_resume(tmp_path, monkeypatch):
+    attribute_args, dataset_args = get_args(tmp_path)
+    attribute_dataset_in_chunks(attribute_args, dataset_args)
+    manifest_path = tmp_path / "out" / MANIFEST_FILENAME
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    del manifest["completed"]["1"]
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    attributed_inputs = []
+    attribute_fn = attribute_dataset_module.attribute
+
+    def attribute_spy(input_texts, generated_texts, args, model=None):
+        attributed_inputs.append(input_texts)
+        return attribute_fn(input_texts, generated_texts, args, model=model)
+
+    monkeypatch.setattr(attribute_dataset_module, "attribute", attribute_spy)
+    attribute_dataset_in_chunks(attribute_args, dataset_args)
+    # Only the chunk missing from the manifest is attributed again
+    assert attributed_inputs == [INPUT_TEXTS[2:4]]
+    with open(manifest_path) as f:
+        assert set(json.load(f)["completed"]) == {"0", "1", "2"}
+
+
+def test_attribute_dataset_in_chunks_chunk_size_mismatch(tmp_path):
+    attribute_args, dataset_args = get_args(tmp_path)
+    (tmp_path / "out").mkdir()
+    with open(tmp_path / "out" / MANIFEST_FILENAME, "w") as f:
+        json.dump({"chunk_size": 3, "completed": {"0": {"path": "chunk_000000.json", "num_examples": 3}}}, f)
+    with pytest.raises(ValueError, match="chunk size 3"):
+        load_manifest(str(tmp_path / "out"), chunk_size=2)
+    with pytest.raises(ValueError, match="chunk size 3"):
+        attribute_dataset_in_chunks(attribute_args, dataset_args)
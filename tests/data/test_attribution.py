@@ -1,7 +1,11 @@
+import pytest
 import torch
 from pytest import fixture
 
+import inseq.data.attribution
 from inseq import FeatureAttributionOutput, load_model
+from inseq.data import AttributionResultCache, CoarseFeatureAttributionSequenceOutput, UncacheableComponentError
+from inseq.utils.typing import TokenWithId
 
 
 @fixture(scope="session")
@@ -41,6 +45,95 @@ def test_save_load_attribution_compressed(tmp_path, saliency_mt_model):
     assert out == loaded_out
 
 
+def test_save_load_attribution_safetensors(tmp_path, saliency_mt_model):
+    out_path = tmp_path / "tmp_attr.safetensors"
+    out = saliency_mt_model.attribute(
+        ["This is a test.", "sequence number two"], step_scores=["probability"], device="cpu", show_progress=False
+    )
+    out.save(out_path)
+    loaded_out = FeatureAttributionOutput.load(out_path)
+    assert out == loaded_out
+    assert torch.allclose(
+        out.sequence_attributions[1].step_scores["probability"],
+        loaded_out.sequence_attributions[1].step_scores["probability"],
+    )
+
+
+def test_save_load_attribution_lazy(tmp_path, saliency_mt_model):
+    out_path = tmp_path / "tmp_attr.safetensors"
+    out = saliency_mt_model.attribute(["This is a test.", "sequence number two"], device="cpu", show_progress=False)
+    out.save(out_path)
+    with FeatureAttributionOutput.load(out_path, lazy=True) as lazy_out:
+        assert len(lazy_out) == 2
+        assert lazy_out[1] == out.sequence_attributions[1]
+        assert lazy_out.materialize() == out
+
+
+def test_save_load_many_sequences_lazy(tmp_path, monkeypatch):
+    monkeypatch.setattr(inseq.data.attribution, "SAFETENSORS_SHARD_SIZE", 100)
+    out_path = tmp_path / "tmp_attr.safetensors"
+    num_sequences = 2500
+    out = FeatureAttributionOutput(
+        sequence_attributions=[
+            CoarseFeatureAttributionSequenceOutput(
+                source=[TokenWithId("Hello", 0), TokenWithId("world", 1)],
+                target=[TokenWithId("Ciao", 2)],
+                source_attributions=torch.full((2, 1), float(idx)),
+                step_scores={"probability": torch.tensor([idx / num_sequences])},
+            )
+            for idx in range(num_sequences)
+        ],
+        info={"input_texts": ["Hello world"] * num_sequences},
+    )
+    out.save(out_path)
+    assert (tmp_path / "tmp_attr-00024.safetensors").exists()
+    with FeatureAttributionOutput.load(out_path, lazy=True) as lazy_out:
+        assert len(lazy_out) == num_sequences
+        for idx in (0, 99, 100, 1234, num_sequences - 1):
+            assert lazy_out[idx] == out.sequence_attributions[idx]
+        assert lazy_out[-1].source_attributions[0, 0].item() == num_sequences - 1
+    assert FeatureAttributionOutput.load(out_path) == out
+
+
+def test_attribute_with_result_cache(tmp_path, saliency_mt_model):
+    cache = AttributionResultCache(tmp_path / "cache", max_entries=2)
+    texts = ["This is a test.", "sequence number two", "Hello world!"]
+    out = saliency_mt_model.attribute(texts[:2], device="cpu", show_progress=False, result_cache=cache)
+    assert len(cache) == 2
+    cached_out = saliency_mt_model.attribute(texts, device="cpu", show_progress=False, result_cache=cache)
+    assert cached_out.info["input_texts"] == texts
+    assert cached_out.sequence_attributions[:2] == out.sequence_attributions
+    # The least recently used entry is evicted
+    assert len(cache) == 2
+
+
+def test_result_cache_decoder_only_prompts(tmp_path, saliency_gpt2_model_tiny):
+    cache = AttributionResultCache(tmp_path / "cache")
+    generated_text = "Hello world how are you"
+    out_short = saliency_gpt2_model_tiny.attribute(
+        "Hello", generated_text, device="cpu", show_progress=False, result_cache=cache
+    )
+    out_long = saliency_gpt2_model_tiny.attribute(
+        "Hello world how", generated_text, device="cpu", show_progress=False, result_cache=cache
+    )
+    # The prompt sets the first attributed position, so the same generation is cached once per prompt
+    assert len(cache) == 2
+    assert out_long[0].attr_pos_start > out_short[0].attr_pos_start
+    assert out_long[0].target_attributions.shape != out_short[0].target_attributions.shape
+
+
+def score_fn(x):
+    return x
+
+
+def test_result_cache_key_callables():
+    assert AttributionResultCache.get_key(attributed_fn=score_fn) == AttributionResultCache.get_key(
+        attributed_fn=score_fn
+    )
+    with pytest.raises(UncacheableComponentError):
+        AttributionResultCache.get_key(attributed_fn=lambda x: x)
+
+
 def test_get_scores_dicts_encoder_decoder(saliency_mt_model):
     out = saliency_mt_model.attribute(["This is a test.", "Hello world!"], device="cpu", show_progress=False)
     dicts = out.get_scores_dicts()
@@ -178,6 +178,59 @@ def test_batched_attribution_consistency_decoder_only(saliency_gpt2_model):
     )
 
 
+def test_batched_constrained_attribution_decoder_only(saliency_gpt2_model_tiny):
+    texts = ["Hello", "The quick brown fox"]
+    generated_texts = ["Hello world, this is a test", "The quick brown fox jumps"]
+    out_batch = saliency_gpt2_model_tiny.attribute(
+        texts, generated_texts, step_scores=["probability"], show_progress=False, device=get_default_device()
+    )
+    for idx in range(len(texts)):
+        out_single = saliency_gpt2_model_tiny.attribute(
+            texts[idx],
+            generated_texts[idx],
+            step_scores=["probability"],
+            show_progress=False,
+            device=get_default_device(),
+        )
+        seq_single, seq_batch = out_single.sequence_attributions[0], out_batch.sequence_attributions[idx]
+        assert [t.token for t in seq_single.source] == [t.token for t in seq_batch.source]
+        assert [t.token for t in seq_single.target] == [t.token for t in seq_batch.target]
+        assert seq_single.target_attributions.shape == seq_batch.target_attributions.shape
+        # Left padding in the batch must not affect positions, and hence attributions and step scores
+        assert torch.allclose(seq_single.target_attributions, seq_batch.target_attributions, atol=1e-5, equal_nan=True)
+        assert torch.allclose(seq_single.step_scores["probability"], seq_batch.step_scores["probability"], atol=1e-5)
+
+
+def test_length_bucketed_attribution_order_seq2seq(saliency_mt_model):
+    texts = ["Hello world!", "This is a much longer sentence to be translated.", "Short one.", "Another sentence."]
+    out = saliency_mt_model.attribute(texts, batch_size=2, show_progress=False, device=get_default_device())
+    out_bucketed = saliency_mt_model.attribute(
+        texts, max_tokens_per_batch=40, show_progress=False, device=get_default_device()
+    )
+    assert out_bucketed.info["input_texts"] == texts
+    for seq, seq_bucketed in zip(out.sequence_attributions, out_bucketed.sequence_attributions):
+        assert [t.token for t in seq.source] == [t.token for t in seq_bucketed.source]
+        assert [t.token for t in seq.target] == [t.token for t in seq_bucketed.target]
+
+
+@mark.slow
+def test_data_parallel_attribution_order_seq2seq(saliency_mt_model):
+    texts = ["Hello world!", "This is a much longer sentence to be translated.", "Short one."]
+    out = saliency_mt_model.attribute(texts, show_progress=False, device="cpu")
+    out_parallel = inseq.attribute_data_parallel(
+        "Helsinki-NLP/opus-mt-en-it",
+        texts,
+        attribution_method="saliency",
+        devices="cpu",
+        num_workers=2,
+        show_progress=False,
+    )
+    assert out_parallel.info["input_texts"] == texts
+    for seq, seq_parallel in zip(out.sequence_attributions, out_parallel.sequence_attributions):
+        assert [t.token for t in seq.target] == [t.token for t in seq_parallel.target]
+        assert torch.allclose(seq.source_attributions, seq_parallel.source_attributions, atol=1e-5, equal_nan=True)
+
+
 @mark.slow
 @mark.parametrize(("texts", "reference_texts"), EXAMPLES["texts"])
 @mark.parametrize("attribution_method", ATTRIBUTION_METHODS)
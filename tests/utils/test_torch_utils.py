@@ -1,8 +1,16 @@
 import pytest
 import torch
+import torch.nn.functional as F
 
 from inseq.utils.misc import pretty_tensor
-from inseq.utils.torch_utils import filter_logits
+from inseq.utils.torch_utils import (
+    filter_logits,
+    js_divergence,
+    kl_divergence,
+    top_k_logits_mask,
+    top_k_top_p_logits_mask,
+    top_p_logits_mask,
+)
 
 
 @pytest.mark.parametrize(
@@ -75,3 +83,29 @@ def test_filter_logits():
     filtered_logits, contrast_logits = filter_logits(original_logits, contrast_logits=contrast_logits, top_k=2)
     top2merged = original_logits.clone().index_fill(1, torch.tensor([2, 3, 4]), float("-inf"))
     assert torch.eq(filtered_logits, top2merged).all()
+
+
+@pytest.mark.parametrize(("top_k", "top_p"), [(0, 0.5), (2, 0.9), (3, 0.3), (10, 0.99)])
+def test_top_k_top_p_logits_mask(top_k: int, top_p: float):
+    logits = torch.randn(4, 10)
+    expected = top_p_logits_mask(logits, top_p, 1)
+    if top_k > 0:
+        expected = expected | top_k_logits_mask(logits.masked_fill(expected, float("-inf")), top_k, 1)
+    assert torch.eq(top_k_top_p_logits_mask(logits, top_k, top_p), expected).all()
+
+
+def test_divergences():
+    original_logprobs = torch.randn(4, 10).log_softmax(dim=-1)
+    contrast_logprobs = torch.randn(4, 10).log_softmax(dim=-1)
+    kl = torch.stack(
+        [F.kl_div(c, o, reduction="sum", log_target=True) for o, c in zip(original_logprobs, contrast_logprobs)]
+    )
+    assert torch.allclose(kl_divergence(original_logprobs, contrast_logprobs), kl, atol=1e-6)
+    js = js_divergence(original_logprobs, contrast_logprobs)
+    assert torch.allclose(js, js_divergence(contrast_logprobs, original_logprobs), atol=1e-6)
+    assert (js >= 0).all() and (js <= torch.log(torch.tensor(2.0))).all()
+    # Tokens removed by filtering do not produce NaN divergences
+    filtered_original, filtered_contrast = filter_logits(
+        original_logprobs, contrast_logits=contrast_logprobs, top_k=3, top_p=0.9
+    )
+    assert not kl_divergence(filtered_original.log_softmax(-1), filtered_contrast.log_softmax(-1)).isnan().any()